@@ -1,6 +1,6 @@
+from typing import Tuple
+
 from src.common.config import MAX_ITERATIONS, THRESHOLD
-from src.common.constraints_validator import get_num_of_violated_hard_constraints, \
-    get_num_of_violated_soft_constraints
 from src.common.timetable import Timetable
 
 
@@ -21,12 +21,23 @@ class MoveAcceptance:
             :param new_solution: Timetable
             :return: bool
         """
-        (
-            cs_hard_constraints_cost,
-            cs_soft_constraints_cost,
-            ns_hard_constraints_cost,
-            ns_soft_constraints_cost
-        ) = MoveAcceptance.get_constraints(current_solution, new_solution)
+        cs_cost, ns_cost = MoveAcceptance.get_costs(current_solution, new_solution)
+        return self.iterated_limited_threshold_acceptance_of_costs(cs_cost, ns_cost)
+
+    def iterated_limited_threshold_acceptance_of_costs(
+            self,
+            current_cost: Tuple[int, int],
+            new_cost: Tuple[int, int]
+    ) -> bool:
+        """
+            Iterated limited threshold acceptance on the (hard, soft) constraint costs of the current and new
+            solutions, for moves that are applied in place.
+            :param current_cost: Tuple[int, int]
+            :param new_cost: Tuple[int, int]
+            :return: bool
+        """
+        cs_hard_constraints_cost, cs_soft_constraints_cost = current_cost
+        ns_hard_constraints_cost, ns_soft_constraints_cost = new_cost
 
         if (
                 ns_hard_constraints_cost < cs_hard_constraints_cost or
@@ -74,30 +85,20 @@ class MoveAcceptance:
         else:
             return False
 
+    @staticmethod
+    def get_costs(current_solution: Timetable, new_solution: Timetable) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """
+            Returns the (hard, soft) constraint costs of the current and new solutions.
+            :param current_solution: Timetable
+            :param new_solution: Timetable
+            :return: Tuple[Tuple[int, int], Tuple[int, int]]
+        """
+        return current_solution.get_constraints_cost(), new_solution.get_constraints_cost()
+
     @staticmethod
     def get_constraints(current_solution, new_solution):
-        cs_hard_constraints_cost = get_num_of_violated_hard_constraints(
-            current_solution.schedule,
-            current_solution.constraints,
-            current_solution.curricula,
-            current_solution.courses
-        )
-        ns_hard_constraints_cost = get_num_of_violated_hard_constraints(
-            new_solution.schedule,
-            new_solution.constraints,
-            new_solution.curricula,
-            new_solution.courses
-        )
-        cs_soft_constraints_cost = get_num_of_violated_soft_constraints(
-            current_solution.schedule,
-            current_solution.curricula,
-            current_solution.courses
-        )
-        ns_soft_constraints_cost = get_num_of_violated_soft_constraints(
-            new_solution.schedule,
-            new_solution.curricula,
-            new_solution.courses
-        )
+        cs_hard_constraints_cost, cs_soft_constraints_cost = current_solution.get_constraints_cost()
+        ns_hard_constraints_cost, ns_soft_constraints_cost = new_solution.get_constraints_cost()
         return cs_hard_constraints_cost, cs_soft_constraints_cost, ns_hard_constraints_cost, ns_soft_constraints_cost
 
     @staticmethod
@@ -0,0 +1,134 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.common.problem import Problem
+from src.common.problem_model import ProblemModel
+from src.common.timetable import Timetable
+from src.common.vectorized_constraints_validator import ROOM, DAY, PERIOD, ModelArrays, \
+    get_model_arrays, get_violated_hard_constraints_breakdown, get_violated_soft_constraints_breakdown
+
+
+class ArrayTimetable:
+    """
+    Array-backed alternative to Timetable.
+
+    The schedule is a single (number_of_lectures, 4) integer array with one (course, room, day, period) row per
+    scheduled lecture, using the ids of the problem's ProblemModel. Unlike a days x periods x rooms tensor, the rows
+    can describe two lectures sharing a room, so every cost kernel gives the same numbers as the object validators.
+    Cloning is a single array copy. Timetable evaluates itself through this representation when VECTORIZED_EVALUATION
+    is enabled.
+    """
+
+    def __init__(self, problem: Problem, lectures: Optional[np.ndarray] = None):
+        self.problem: Problem = problem
+        self.model: ProblemModel = problem.model
+        self.arrays: ModelArrays = get_model_arrays(self.model)
+        self.lectures: np.ndarray = (
+            np.empty((0, 4), dtype=np.int64) if lectures is None else lectures
+        )
+
+    @staticmethod
+    def from_timetable(timetable: Timetable) -> 'ArrayTimetable':
+        """
+            Builds the array representation of a timetable.
+            :param timetable: Timetable
+            :return: ArrayTimetable
+        """
+        rows = [
+            (course.index, room.index, day, period)
+            for day in range(len(timetable.schedule))
+            for period in range(len(timetable.schedule[day]))
+            for course, room in timetable.schedule[day][period].course_room_pairs
+        ]
+
+        return ArrayTimetable(timetable.problem, np.array(rows, dtype=np.int64).reshape(-1, 4))
+
+    def to_timetable(self) -> Timetable:
+        """
+            Builds the object representation of the timetable.
+            :return: Timetable
+        """
+        timetable: Timetable = Timetable(self.problem)
+
+        for course, room, day, period in self.lectures.tolist():
+            timetable.add_course_room_pair(day, period, (self.model.courses[course], self.model.rooms[room]))
+
+        return timetable
+
+    def clone(self) -> 'ArrayTimetable':
+        """
+            Clones the timetable.
+            :return: ArrayTimetable
+        """
+        return ArrayTimetable(self.problem, self.lectures.copy())
+
+    def get_slot_lectures(self, day: int, period: int) -> np.ndarray:
+        """
+            Returns the indices of the rows holding the lectures scheduled in a slot.
+            :param day: int
+            :param period: int
+            :return: np.ndarray
+        """
+        return np.flatnonzero((self.lectures[:, DAY] == day) & (self.lectures[:, PERIOD] == period))
+
+    def move_lecture(self, lecture: int, day: int, period: int, room: Optional[int] = None) -> None:
+        """
+            Moves a lecture to another slot, and optionally to another room.
+            :param lecture: int
+            :param day: int
+            :param period: int
+            :param room: Optional[int]
+            :return: None
+        """
+        self.lectures[lecture, DAY] = day
+        self.lectures[lecture, PERIOD] = period
+        if room is not None:
+            self.lectures[lecture, ROOM] = room
+
+    def swap_lectures(self, first_lecture: int, second_lecture: int) -> None:
+        """
+            Exchanges the slots and rooms of two lectures.
+            :param first_lecture: int
+            :param second_lecture: int
+            :return: None
+        """
+        self.lectures[[first_lecture, second_lecture], ROOM:] = self.lectures[[second_lecture, first_lecture], ROOM:]
+
+    def swap_slots(self, first_day: int, first_period: int, second_day: int, second_period: int) -> None:
+        """
+            Exchanges the contents of two slots.
+            :param first_day: int
+            :param first_period: int
+            :param second_day: int
+            :param second_period: int
+            :return: None
+        """
+        first_lectures: np.ndarray = self.get_slot_lectures(first_day, first_period)
+        second_lectures: np.ndarray = self.get_slot_lectures(second_day, second_period)
+
+        self.lectures[first_lectures, DAY] = second_day
+        self.lectures[first_lectures, PERIOD] = second_period
+        self.lectures[second_lectures, DAY] = first_day
+        self.lectures[second_lectures, PERIOD] = first_period
+
+    def get_hard_constraints_breakdown(self) -> Dict[str, int]:
+        """
+            Returns the number of violations of each hard constraint.
+            :return: Dict[str, int]
+        """
+        return get_violated_hard_constraints_breakdown(self.lectures, self.arrays)
+
+    def get_soft_constraints_breakdown(self) -> Dict[str, int]:
+        """
+            Returns the number of violations of each soft constraint.
+            :return: Dict[str, int]
+        """
+        return get_violated_soft_constraints_breakdown(self.lectures, self.arrays)
+
+    def get_constraints_cost(self) -> Tuple[int, int]:
+        """
+            Returns the number of violated hard and soft constraints.
+            :return: Tuple[int, int]
+        """
+        return sum(self.get_hard_constraints_breakdown().values()), sum(self.get_soft_constraints_breakdown().values())
@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Optional
+
+from src.common.config import TIME_LIMIT, EVALUATION_LIMIT
+
+
+class Budget:
+    """
+    A stopping rule shared by the hyper-heuristics on top of their iteration counts: a wall-clock time limit in
+    seconds, counted from the creation of the budget, a limit on the number of evaluations, and cooperative
+    cancellation, which another thread can request at any time. The loops check the budget between iterations and
+    return the best solution found so far once it is exhausted.
+    """
+
+    def __init__(self, time_limit: Optional[float] = TIME_LIMIT, evaluation_limit: Optional[int] = EVALUATION_LIMIT):
+        self.time_limit: Optional[float] = time_limit
+        self.evaluation_limit: Optional[int] = evaluation_limit
+        self.evaluations: int = 0
+        self._deadline: Optional[float] = None if time_limit is None else time.monotonic() + time_limit
+        self._cancelled: threading.Event = threading.Event()
+
+    def record_evaluations(self, number_of_evaluations: int = 1) -> None:
+        """
+        Counts evaluations against the evaluation limit.
+        :param number_of_evaluations: int
+        :return: None
+        """
+        self.evaluations += number_of_evaluations
+
+    def cancel(self) -> None:
+        """
+        Asks the loops using the budget to stop at their next check. Safe to call from any thread.
+        :return: None
+        """
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        """
+        Returns whether cancellation was requested.
+        :return: bool
+        """
+        return self._cancelled.is_set()
+
+    def get_remaining_time(self) -> Optional[float]:
+        """
+        Returns the seconds left before the time limit, or None if there is none.
+        :return: Optional[float]
+        """
+        return None if self._deadline is None else max(0.0, self._deadline - time.monotonic())
+
+    def is_exhausted(self) -> bool:
+        """
+        Returns whether the budget is used up: it was cancelled, or the evaluation or time limit was reached.
+        :return: bool
+        """
+        return (
+                self._cancelled.is_set() or
+                (self.evaluation_limit is not None and self.evaluations >= self.evaluation_limit) or
+                (self._deadline is not None and time.monotonic() >= self._deadline)
+        )
@@ -0,0 +1,157 @@
+import os
+import pickle
+import tempfile
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.common.config import CHECKPOINT_PATH, CHECKPOINT_INTERVAL
+from src.common.problem import Problem
+from src.common.timetable import Timetable
+
+CHECKPOINT_VERSION: int = 2
+
+CheckpointState = Dict[str, Any]
+EncodedTimetable = Tuple[bytes, List[str]]
+
+
+def encode_timetable(timetable: Timetable) -> EncodedTimetable:
+    """
+    Encodes a timetable for a checkpoint: its schedule, and the first room of every course, which clones and encoded
+    timetables start without but a timetable that is perturbed in place keeps using.
+    :param timetable: Timetable
+    :return: EncodedTimetable
+    """
+    return timetable.encode(), list(timetable.course_and_first_room.values())
+
+
+def decode_timetable(problem: Problem, encoded_timetable: EncodedTimetable) -> Timetable:
+    """
+    Rebuilds a timetable of a problem encoded for a checkpoint.
+    :param problem: Problem
+    :param encoded_timetable: EncodedTimetable
+    :return: Timetable
+    """
+    encoding, first_rooms = encoded_timetable
+
+    timetable: Timetable = Timetable.decode(problem, encoding)
+    timetable.course_and_first_room = dict(zip(timetable.model.course_ids, first_rooms))
+    return timetable
+
+
+class Checkpoint:
+    """
+    A binary file holding a snapshot of a run, from which the run can be resumed.
+
+    A snapshot is the name of the stage it was taken in (the loop that saved it) and the state of that loop, made of
+    plain values only: numbers, strings, bytes and containers of them. It is pickled, compressed and written to a
+    temporary file in the same directory, which then replaces the checkpoint file, so the file always holds a complete
+    snapshot even if the process dies while writing.
+
+    The loops save a snapshot between iterations once the interval, in seconds, has passed since the last one; without
+    an interval, a checkpoint can be resumed from but is never written.
+    """
+
+    def __init__(self, path: str = CHECKPOINT_PATH, interval: Optional[float] = CHECKPOINT_INTERVAL):
+        self.path: str = path
+        self.interval: Optional[float] = interval
+        self.stage: Optional[str] = None
+        self._state: Optional[CheckpointState] = None
+        self._last_save_time: float = time.monotonic()
+
+    def load(self) -> bool:
+        """
+        Reads the snapshot of the checkpoint file, if there is one, to be resumed from.
+        :return: bool, whether a snapshot was read
+        """
+        if not os.path.exists(self.path):
+            return False
+
+        with open(self.path, 'rb') as file:
+            version, stage, state = pickle.loads(zlib.decompress(file.read()))
+
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {version}")
+
+        self.stage = stage
+        self._state = state
+        return True
+
+    def pop_state(self, stage: str) -> Optional[CheckpointState]:
+        """
+        Returns the state read for a stage, so that the stage resumes from it only once.
+        :param stage: str
+        :return: Optional[CheckpointState], None if the snapshot read is not of the stage
+        """
+        if self.stage != stage:
+            return None
+
+        state: Optional[CheckpointState] = self._state
+        self.stage = None
+        self._state = None
+        return state
+
+    def is_due(self) -> bool:
+        """
+        Returns whether the interval has passed since the last snapshot.
+        :return: bool
+        """
+        return self.interval is not None and time.monotonic() - self._last_save_time >= self.interval
+
+    def save(self, stage: str, state: CheckpointState) -> None:
+        """
+        Atomically replaces the checkpoint file with a snapshot of a stage.
+        :param stage: str
+        :param state: CheckpointState
+        :return: None
+        """
+        data: bytes = zlib.compress(pickle.dumps((CHECKPOINT_VERSION, stage, state), pickle.HIGHEST_PROTOCOL), 1)
+        directory: str = os.path.dirname(os.path.abspath(self.path))
+
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        self._last_save_time = time.monotonic()
+
+
+def pop_resume_flag(arguments: List[str]) -> bool:
+    """
+    Removes the --resume flag from the command line arguments of a run, so that the positional arguments keep their
+    positions.
+    :param arguments: List[str], sys.argv
+    :return: bool, whether the run is resumed
+    """
+    resume: bool = '--resume' in arguments
+    if resume:
+        arguments.remove('--resume')
+    return resume
+
+
+def open_checkpoint(
+        resume: bool,
+        path: str = CHECKPOINT_PATH,
+        interval: Optional[float] = CHECKPOINT_INTERVAL
+) -> Optional[Checkpoint]:
+    """
+    Creates the checkpoint of a run started from the command line, if the run is checkpointed or resumed, and reads
+    the snapshot to resume from; a resumed run without a checkpoint file starts anew.
+    :param resume: bool
+    :param path: str
+    :param interval: Optional[float]
+    :return: Optional[Checkpoint]
+    """
+    if interval is None and not resume:
+        return None
+
+    checkpoint: Checkpoint = Checkpoint(path, interval)
+    if resume and not checkpoint.load():
+        print(f"No checkpoint at {checkpoint.path}, starting a new run.", end="\n\n")
+    return checkpoint
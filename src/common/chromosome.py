@@ -1,8 +1,12 @@
 import sys
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from src.common.problem import Problem
+from src.common.program import Program, compile_program
 from src.common.timetable import Timetable
 
+EncodedChromosome = Tuple[List[int], str, int, int, Optional[bytes], Optional[int]]
+
 
 class Chromosome:
     """
@@ -16,7 +20,9 @@ class Chromosome:
             hard_constraints_cost: int = sys.maxsize,
             soft_constraints_cost: int = sys.maxsize,
             phenotype: Optional[str] = None,
-            timetable: Optional[Timetable] = None
+            timetable: Optional[Timetable] = None,
+            program: Optional[Program] = None,
+            effective_codons: Optional[int] = None
     ):
         self.codons: List[int] = codons
         self.reinforcement_learning_score = reinforcement_learning_score
@@ -24,6 +30,17 @@ class Chromosome:
         self.soft_constraints_cost: int = soft_constraints_cost
         self.phenotype: Optional[str] = phenotype
         self.timetable: Optional[Timetable] = timetable
+        self.program: Optional[Program] = program
+        self.effective_codons: Optional[int] = effective_codons
+
+    def get_program(self) -> Program:
+        """
+        Returns the compiled program of the phenotype, compiling it if the phenotype changed since.
+        :return: The compiled program.
+        """
+        if self.program is None or self.program.phenotype != self.phenotype:
+            self.program = compile_program(self.phenotype)
+        return self.program
 
     def __copy__(self):
         """
@@ -35,7 +52,9 @@ class Chromosome:
             self.reinforcement_learning_score,
             self.hard_constraints_cost,
             self.soft_constraints_cost,
-            self.phenotype
+            self.phenotype,
+            program=self.program,
+            effective_codons=self.effective_codons
         )
 
     def clone(self) -> 'Chromosome':
@@ -49,5 +68,42 @@ class Chromosome:
             self.hard_constraints_cost,
             self.soft_constraints_cost,
             self.phenotype,
-            self.timetable.clone() if self.timetable else None
+            self.timetable.clone() if self.timetable else None,
+            self.program,
+            self.effective_codons
         )
+
+
+def encode_chromosome(chromosome: Chromosome) -> EncodedChromosome:
+    """
+    Encodes an evaluated chromosome compactly, to be shipped between processes.
+    :param chromosome: Chromosome
+    :return: its codons, phenotype, hard and soft constraints cost, encoded timetable and effective codons
+    """
+    return (
+        list(chromosome.codons),
+        chromosome.phenotype,
+        chromosome.hard_constraints_cost,
+        chromosome.soft_constraints_cost,
+        chromosome.timetable.encode() if chromosome.timetable else None,
+        chromosome.effective_codons
+    )
+
+
+def decode_chromosome(problem: Problem, encoded_chromosome: EncodedChromosome) -> Chromosome:
+    """
+    Rebuilds an encoded chromosome of a problem.
+    :param problem: Problem
+    :param encoded_chromosome: EncodedChromosome
+    :return: Chromosome
+    """
+    codons, phenotype, hard_constraints_cost, soft_constraints_cost, timetable, effective_codons = encoded_chromosome
+
+    return Chromosome(
+        codons,
+        hard_constraints_cost=hard_constraints_cost,
+        soft_constraints_cost=soft_constraints_cost,
+        phenotype=phenotype,
+        timetable=None if timetable is None else Timetable.decode(problem, timetable),
+        effective_codons=effective_codons
+    )
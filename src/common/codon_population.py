@@ -0,0 +1,280 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.common.chromosome import Chromosome
+
+NO_EFFECTIVE_CODONS: int = -1
+
+
+class CodonPopulation:
+    """
+    Array-backed codons and fitness of a population of chromosomes.
+
+    The codons are a (number_of_chromosomes, width) uint8 matrix, row i holding the lengths[i] codons of chromosome i
+    followed by zero padding. Costs and effective codons (NO_EFFECTIVE_CODONS for none) are parallel int64 vectors.
+    Initialisation, tournament selection, one-point crossover, mutation and survivor selection work on whole batches of
+    rows with a NumPy random generator; Chromosome objects are only built, from single rows, for mapping and evaluation,
+    and the costs they are evaluated to are written back into the vectors.
+    """
+
+    def __init__(
+            self,
+            codons: np.ndarray,
+            lengths: np.ndarray,
+            hard_constraints_costs: np.ndarray,
+            soft_constraints_costs: np.ndarray,
+            effective_codons: np.ndarray
+    ):
+        self.codons: np.ndarray = codons
+        self.lengths: np.ndarray = lengths
+        self.hard_constraints_costs: np.ndarray = hard_constraints_costs
+        self.soft_constraints_costs: np.ndarray = soft_constraints_costs
+        self.effective_codons: np.ndarray = effective_codons
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    @staticmethod
+    def generate(size: int, lower_bound: int, upper_bound: int, rng: np.random.Generator) -> 'CodonPopulation':
+        """
+        Generates a population of unevaluated chromosomes with lower_bound to upper_bound random codons each.
+        :param size: int
+        :param lower_bound: int
+        :param upper_bound: int
+        :param rng: np.random.Generator
+        :return: CodonPopulation
+        """
+        lengths: np.ndarray = rng.integers(lower_bound, upper_bound + 1, size=size, dtype=np.int64)
+        codons: np.ndarray = rng.integers(0, 256, size=(size, upper_bound), dtype=np.uint8)
+        codons[np.arange(upper_bound)[None, :] >= lengths[:, None]] = 0
+
+        return CodonPopulation(
+            codons,
+            lengths,
+            np.full(size, np.iinfo(np.int64).max, dtype=np.int64),
+            np.full(size, np.iinfo(np.int64).max, dtype=np.int64),
+            np.full(size, NO_EFFECTIVE_CODONS, dtype=np.int64)
+        )
+
+    @staticmethod
+    def from_chromosomes(chromosomes: Sequence[Chromosome]) -> 'CodonPopulation':
+        """
+        Builds the array representation of the codons and fitness of chromosomes.
+        :param chromosomes: Sequence[Chromosome]
+        :return: CodonPopulation
+        """
+        lengths: np.ndarray = np.array([len(chromosome.codons) for chromosome in chromosomes], dtype=np.int64)
+        codons: np.ndarray = np.zeros((len(chromosomes), int(lengths.max(initial=0))), dtype=np.uint8)
+
+        for row, chromosome in enumerate(chromosomes):
+            codons[row, :len(chromosome.codons)] = chromosome.codons
+
+        return CodonPopulation(
+            codons,
+            lengths,
+            np.array([chromosome.hard_constraints_cost for chromosome in chromosomes], dtype=np.int64),
+            np.array([chromosome.soft_constraints_cost for chromosome in chromosomes], dtype=np.int64),
+            np.array(
+                [
+                    NO_EFFECTIVE_CODONS if chromosome.effective_codons is None else chromosome.effective_codons
+                    for chromosome in chromosomes
+                ],
+                dtype=np.int64
+            )
+        )
+
+    @staticmethod
+    def concatenate(populations: Sequence['CodonPopulation']) -> 'CodonPopulation':
+        """
+        Joins the rows of populations, in order.
+        :param populations: Sequence[CodonPopulation]
+        :return: CodonPopulation
+        """
+        lengths: np.ndarray = np.concatenate([population.lengths for population in populations])
+        codons: np.ndarray = np.zeros((len(lengths), int(lengths.max(initial=0))), dtype=np.uint8)
+
+        row: int = 0
+        for population in populations:
+            width: int = min(population.codons.shape[1], codons.shape[1])
+            codons[row:row + len(population), :width] = population.codons[:, :width]
+            row += len(population)
+
+        return CodonPopulation(
+            codons,
+            lengths,
+            np.concatenate([population.hard_constraints_costs for population in populations]),
+            np.concatenate([population.soft_constraints_costs for population in populations]),
+            np.concatenate([population.effective_codons for population in populations])
+        )
+
+    def take(self, rows: np.ndarray) -> 'CodonPopulation':
+        """
+        Returns a population of the given rows, in the given order.
+        :param rows: np.ndarray
+        :return: CodonPopulation
+        """
+        lengths: np.ndarray = self.lengths[rows]
+
+        return CodonPopulation(
+            self.codons[rows, :int(lengths.max(initial=0))],
+            lengths,
+            self.hard_constraints_costs[rows],
+            self.soft_constraints_costs[rows],
+            self.effective_codons[rows]
+        )
+
+    def get_best(self, number: int) -> np.ndarray:
+        """
+        Returns the rows of the number chromosomes with the smallest (hard, soft) constraints cost, best first, ties
+        kept in row order, as sorting the chromosomes by cost would.
+        :param number: int
+        :return: np.ndarray
+        """
+        return np.lexsort((self.soft_constraints_costs, self.hard_constraints_costs))[:number]
+
+    def set_chromosome(self, index: int, chromosome: Chromosome) -> None:
+        """
+        Writes the fitness and effective codons of the mapped and evaluated chromosome of a row back into the vectors.
+        :param index: int
+        :param chromosome: Chromosome
+        :return: None
+        """
+        self.hard_constraints_costs[index] = chromosome.hard_constraints_cost
+        self.soft_constraints_costs[index] = chromosome.soft_constraints_cost
+        self.effective_codons[index] = (
+            NO_EFFECTIVE_CODONS if chromosome.effective_codons is None else chromosome.effective_codons
+        )
+
+    def get_codons(self, index: int) -> List[int]:
+        """
+        Returns the codons of a chromosome as a list.
+        :param index: int
+        :return: List[int]
+        """
+        return self.codons[index, :self.lengths[index]].tolist()
+
+    def get_chromosome(self, index: int, parent: Optional[Chromosome] = None) -> Chromosome:
+        """
+        Returns a chromosome with the codons, fitness and effective codons of a row. A chromosome bred from a parent
+        also gets the parent's phenotype, program and timetable; the timetable is shared, not copied, since evaluation
+        starts from a copy of it and replaces it.
+        :param index: int
+        :param parent: Optional[Chromosome], the chromosome the row's leading codons come from
+        :return: Chromosome
+        """
+        effective_codons: int = int(self.effective_codons[index])
+
+        return Chromosome(
+            self.get_codons(index),
+            hard_constraints_cost=int(self.hard_constraints_costs[index]),
+            soft_constraints_cost=int(self.soft_constraints_costs[index]),
+            phenotype=None if parent is None else parent.phenotype,
+            timetable=None if parent is None else parent.timetable,
+            program=None if parent is None else parent.program,
+            effective_codons=None if effective_codons == NO_EFFECTIVE_CODONS else effective_codons
+        )
+
+    def select(self, number: int, tournament_size: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Runs tournaments of randomly drawn chromosomes (with replacement) and returns the winners, i.e. those with the
+        smallest (hard, soft) constraints cost.
+        :param number: int, the number of tournaments
+        :param tournament_size: int
+        :param rng: np.random.Generator
+        :return: np.ndarray, the row of each winner
+        """
+        ranks: np.ndarray = np.empty(len(self), dtype=np.int64)
+        ranks[np.lexsort((self.soft_constraints_costs, self.hard_constraints_costs))] = np.arange(len(self))
+
+        tournaments: np.ndarray = rng.integers(0, len(self), size=(number, tournament_size))
+        return tournaments[np.arange(number), np.argmin(ranks[tournaments], axis=1)]
+
+    def _splice(
+            self,
+            prefix_rows: np.ndarray,
+            prefix_points: np.ndarray,
+            suffix_rows: np.ndarray,
+            suffix_points: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Helper function to join the codons of prefix rows before their points with those of suffix rows from theirs.
+        :param prefix_rows: np.ndarray
+        :param prefix_points: np.ndarray
+        :param suffix_rows: np.ndarray
+        :param suffix_points: np.ndarray
+        :return: the codons and lengths of the joined rows
+        """
+        lengths: np.ndarray = prefix_points + self.lengths[suffix_rows] - suffix_points
+        positions: np.ndarray = np.arange(int(lengths.max(initial=0)))[None, :]
+        last_column: int = max(self.codons.shape[1] - 1, 0)
+
+        prefix: np.ndarray = self.codons[prefix_rows[:, None], np.minimum(positions, last_column)]
+        suffix: np.ndarray = self.codons[
+            suffix_rows[:, None],
+            np.clip(positions - prefix_points[:, None] + suffix_points[:, None], 0, last_column)
+        ]
+
+        codons: np.ndarray = np.where(positions < prefix_points[:, None], prefix, suffix)
+        codons[positions >= lengths[:, None]] = 0
+        return codons, lengths
+
+    def breed(
+            self,
+            first_parents: np.ndarray,
+            second_parents: np.ndarray,
+            crossover_probability: float,
+            mutation_probability: float,
+            rng: np.random.Generator
+    ) -> Tuple['CodonPopulation', np.ndarray]:
+        """
+        Breeds two children from every pair of parents, like the list-based operators do for one pair: with the
+        crossover probability, a one-point crossover of variable-length codons; then, with the mutation probability,
+        one random codon of each child is replaced. The children of pair i are rows 2i and 2i + 1 and start with the
+        codons, fitness and effective codons of the first and second parent respectively; a child keeps the effective
+        codons only if neither operator changed one of them.
+        :param first_parents: np.ndarray
+        :param second_parents: np.ndarray
+        :param crossover_probability: float
+        :param mutation_probability: float
+        :param rng: np.random.Generator
+        :return: the children, and the parent each child's leading codons come from
+        """
+        number_of_pairs: int = len(first_parents)
+        first_lengths: np.ndarray = self.lengths[first_parents]
+        second_lengths: np.ndarray = self.lengths[second_parents]
+
+        crossed: np.ndarray = rng.random(number_of_pairs) < crossover_probability
+        first_points: np.ndarray = np.where(crossed, rng.integers(0, first_lengths), first_lengths)
+        second_points: np.ndarray = np.where(crossed, rng.integers(0, second_lengths), second_lengths)
+
+        first_codons, first_child_lengths = self._splice(first_parents, first_points, second_parents, second_points)
+        second_codons, second_child_lengths = self._splice(second_parents, second_points, first_parents, first_points)
+
+        parents: np.ndarray = np.stack((first_parents, second_parents), axis=1).reshape(-1)
+        points: np.ndarray = np.stack((first_points, second_points), axis=1).reshape(-1)
+        lengths: np.ndarray = np.stack((first_child_lengths, second_child_lengths), axis=1).reshape(-1)
+
+        codons: np.ndarray = np.zeros((2 * number_of_pairs, int(lengths.max(initial=0))), dtype=np.uint8)
+        codons[0::2, :first_codons.shape[1]] = first_codons
+        codons[1::2, :second_codons.shape[1]] = second_codons
+
+        effective_codons: np.ndarray = self.effective_codons[parents].copy()
+        effective_codons[points < effective_codons] = NO_EFFECTIVE_CODONS
+
+        mutated: np.ndarray = np.repeat(rng.random(number_of_pairs) < mutation_probability, 2)
+        mutated_rows: np.ndarray = np.flatnonzero(mutated)
+        mutated_indices: np.ndarray = rng.integers(0, lengths[mutated_rows])
+        codons[mutated_rows, mutated_indices] = rng.integers(0, 256, size=len(mutated_rows), dtype=np.uint8)
+
+        neutral: np.ndarray = mutated_indices >= effective_codons[mutated_rows]
+        effective_codons[mutated_rows[~neutral]] = NO_EFFECTIVE_CODONS
+
+        children: CodonPopulation = CodonPopulation(
+            codons,
+            lengths,
+            self.hard_constraints_costs[parents],
+            self.soft_constraints_costs[parents],
+            effective_codons
+        )
+        return children, parents
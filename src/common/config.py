@@ -8,9 +8,34 @@ PROBLEM_INSTANCE_INDEX = 4
 
 NUMBER_OF_GENERATIONS = 200
 
+MULTI_START_RUNS = 0
+MULTI_START_WORKERS = None
+
+TIME_LIMIT = None
+EVALUATION_LIMIT = None
+
+CHECKPOINT_PATH = 'checkpoint.bin'
+CHECKPOINT_INTERVAL = None
+
+COST_CACHE_SIZE = 4096
+VECTORIZED_EVALUATION = False
+
+REASSIGN_ROOMS = False
+
+MOVE_SAMPLING = False
+MOVE_SAMPLE_SIZE = 8
+MOVE_SCAN_LIMIT = None
+
 MAX_ITERATIONS = 50
 THRESHOLD = 5
 
+HEURISTIC_SELECTION = None
+HARD_CONSTRAINT_WEIGHT = 1000
+EPSILON = 0.1
+UCB_EXPLORATION = 1.4
+SOFTMAX_TEMPERATURE = 0.1
+SLIDING_WINDOW_SIZE = 100
+
 LOWER_BOUND = 8
 UPPER_BOUND = 16
 
@@ -19,3 +44,17 @@ TOURNAMENT_SIZE = 4
 MAX_GENERATIONS = 200
 CROSSOVER_PROBABILITY = 0.7
 MUTATION_PROBABILITY = 0.3
+SURVIVOR_SELECTION = 'steady-state'
+NUMBER_OF_OFFSPRING = 200
+
+NUMBER_OF_FITNESS_WORKERS = 0
+FITNESS_CACHE_SIZE = 0
+REJECT_DUPLICATE_PHENOTYPES = False
+SKIP_NEUTRAL_EVALUATIONS = False
+CODON_MATRIX = False
+HEAP_POPULATION = False
+
+NUMBER_OF_ISLANDS = 0
+MIGRATION_INTERVAL = 10
+NUMBER_OF_MIGRANTS = 2
+MIGRATION_TOPOLOGY = 'ring'
@@ -1,8 +1,17 @@
-class Constraint:
+from src.common.flyweight import Flyweight
 
-    def __init__(self, constraint_content: str):
+
+class Constraint(Flyweight):
+    __slots__ = ('course_id', 'day', 'period')
+
+    course_id: str
+    day: int
+    period: int
+
+    def __init__(self, constraint_content: str, index: int):
+        super().__init__(index)
         constraint_content_list = constraint_content.split()
 
-        self.course_id: str = constraint_content_list[0]
-        self.day: int = int(constraint_content_list[1])
-        self.period: int = int(constraint_content_list[2])
+        self._set('course_id', constraint_content_list[0])
+        self._set('day', int(constraint_content_list[1]))
+        self._set('period', int(constraint_content_list[2]))
@@ -1,25 +1,54 @@
 from collections import defaultdict
 from itertools import combinations
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from src.common.constraint import Constraint
 from src.common.course import Course
 from src.common.curriculum import Curriculum
+from src.common.problem_model import ProblemModel
 from src.common.room import Room
 from src.common.slot import Slot
 
+SlotChanges = Dict[Tuple[int, int], List[Tuple[Course, Room]]]
+
+HARD_CONSTRAINT_COMPONENTS: Tuple[str, ...] = (
+    'lecture_allocations',
+    'conflicts',
+    'room_occupancy',
+    'teacher',
+    'unavailability'
+)
+
+SOFT_CONSTRAINT_COMPONENTS: Tuple[str, ...] = (
+    'room_capacity',
+    'room_stability',
+    'minimum_working_days',
+    'curriculum_compactness'
+)
+
 
 #   For Hard Constraints
-def _get_number_of_conflict_violations(curricula: List[Curriculum], slot: Slot) -> int:
+def _get_number_of_conflict_violations(
+        curricula: List[Curriculum],
+        slot: Slot,
+        model: Optional[ProblemModel] = None
+) -> int:
     """
         Two courses of the same curriculum must not be scheduled at the same time.
         :param curricula: List[Curriculum]
         :param slot: Slot
+        :param model: Optional[ProblemModel]
         :return: number_of_violations
     """
 
     number_of_violations: int = 0
 
+    if model is not None:
+        course_indices: List[int] = [course.index for course, _ in slot.course_room_pairs]
+        for first_index, second_index in combinations(course_indices, 2):
+            number_of_violations += model.shared_curricula[first_index][second_index]
+        return number_of_violations
+
     # get all course ids in the slot
     course_ids: List[str] = [course.course_id for course, _ in slot.course_room_pairs]
     course_combinations: List[List[str]] = list(combinations(course_ids, 2))
@@ -148,17 +177,29 @@ def _get_number_of_room_capacity_violations(schedule: List[List[Slot]]) -> int:
     return number_of_violations
 
 
-def _get_course(course_id: str, courses: List[Course]) -> Course:
+def _get_number_of_minimum_working_days_violations_of_course(
+        min_working_days: int,
+        lectures_per_day: List[int]
+) -> int:
     """
-    Helper function to get a course from a list of courses.
-    :param course_id:
-    :param courses:
-    :return: course object
+    Helper function to get the number of minimum working days violations of a single course from the number of its
+    lectures scheduled on each day.
+    :param min_working_days: int
+    :param lectures_per_day: List[int]
+    :return: number_of_violations
     """
 
-    for course in courses:
-        if course.course_id == course_id:
-            return course
+    number_of_violations: int = 0
+
+    for x in range(0, len(lectures_per_day)):
+        if lectures_per_day[x] == 0:
+            continue
+
+        for a in range(x + 1, len(lectures_per_day)):
+            if abs(a - x) < min_working_days - 1:
+                number_of_violations += lectures_per_day[x] * lectures_per_day[a]
+
+    return number_of_violations
 
 
 def _get_number_of_minimum_working_days_violations(
@@ -166,77 +207,114 @@ def _get_number_of_minimum_working_days_violations(
         schedule: List[List[Slot]]
 ) -> int:
     """
-    Each course must be scheduled at least the number of times specified in the problem.
+    Each course must be scheduled at least the number of times specified in the problem. Every pair of lectures of a
+    course on days closer than its minimum working days minus one counts once.
     :param courses: List[Course]
     :param schedule: List[List[Slot]]
     :return: number_of_violations: int
     """
 
-    number_of_violations: int = 0
+    lectures_per_day: Dict[str, List[int]] = defaultdict(lambda: [0] * len(schedule))
 
-    for x in range(0, len(schedule)):
-        for y in range(0, len(schedule[x])):
-            for course, _ in schedule[x][y].course_room_pairs:
-                for a in range(x + 1, len(schedule)):
-                    for b in range(0, len(schedule[a])):
-                        for course2, _ in schedule[a][b].course_room_pairs:
-                            if course.course_id == course2.course_id:
-                                if (
-                                        abs(a - x)
-                                        < _get_course(course.course_id,
-                                                      courses).min_working_days - 1
-                                ):
-                                    number_of_violations += 1
+    for day in range(0, len(schedule)):
+        for slot in schedule[day]:
+            for course, _ in slot.course_room_pairs:
+                lectures_per_day[course.course_id][day] += 1
 
-    return number_of_violations
+    min_working_days: Dict[str, int] = {course.course_id: course.min_working_days for course in courses}
+
+    return sum(
+        _get_number_of_minimum_working_days_violations_of_course(min_working_days[course_id], course_lectures_per_day)
+        for course_id, course_lectures_per_day in lectures_per_day.items()
+    )
 
 
-def _check_if_course_is_in_curriculum(
-        first_course: str,
-        course_ids: List[str],
-        curricula: List[Curriculum]
-) -> bool:
+def _get_course_curricula(
+        curricula: List[Curriculum],
+        model: Optional[ProblemModel] = None
+) -> Dict[str, List[int]]:
     """
-    Helper function to check if any of the courses in a list of courses and the given course are in the same curriculum.
-    :param first_course: str
-    :param course_ids: List[str]
+    Helper function to get the indices of the curricula each course belongs to.
     :param curricula: List[Curriculum]
-    :return: whether the courses are in the same curriculum
+    :param model: Optional[ProblemModel]
+    :return: dictionary of course id to curriculum indices
     """
 
-    for curriculum in curricula:
+    if model is not None:
+        return dict(zip(model.course_ids, model.course_curricula))
+
+    course_curricula: Dict[str, List[int]] = defaultdict(list)
+    for index, curriculum in enumerate(curricula):
         for course_id in curriculum.course_ids:
-            if first_course in curriculum.course_ids and course_id in course_ids:
-                return True
-    return False
+            course_curricula[course_id].append(index)
+
+    return course_curricula
+
+
+def _get_number_of_curriculum_compactness_violations_of_day(
+        curricula: List[Curriculum],
+        day: List[Slot],
+        model: Optional[ProblemModel] = None,
+        course_curricula: Optional[Dict[str, List[int]]] = None
+) -> int:
+    """
+    Helper function to get the number of curriculum compactness violations within a single day. Every lecture counts
+    once for each later period of the day that holds no course sharing a curriculum with it, which is read off a
+    bitmask of the periods each curriculum occupies.
+    :param curricula: List[Curriculum]
+    :param day: List[Slot]
+    :param model: Optional[ProblemModel]
+    :param course_curricula: Optional[Dict[str, List[int]]], computed from curricula when not given
+    :return: number_of_violations
+    """
+
+    if course_curricula is None:
+        course_curricula = _get_course_curricula(curricula, model)
+
+    curriculum_periods: Dict[int, int] = defaultdict(int)
+    for period in range(0, len(day)):
+        for course, _ in day[period].course_room_pairs:
+            for curriculum in course_curricula.get(course.course_id, ()):
+                curriculum_periods[curriculum] |= 1 << period
+
+    number_of_violations: int = 0
+
+    for period in range(0, len(day)):
+        for course, _ in day[period].course_room_pairs:
+            shared_periods: int = 0
+            for curriculum in course_curricula.get(course.course_id, ()):
+                shared_periods |= curriculum_periods[curriculum]
+
+            later_shared_periods: int = bin(shared_periods >> (period + 1)).count("1")
+            number_of_violations += len(day) - 1 - period - later_shared_periods
+
+    return number_of_violations
 
 
 def _get_number_of_curriculum_compactness_violations(
         curricula: List[Curriculum],
-        schedule: List[List[Slot]]
+        schedule: List[List[Slot]],
+        model: Optional[ProblemModel] = None
 ) -> int:
     """
     Courses of the same curriculum should be adjacent to each other.
     :param curricula:
     :param schedule:
+    :param model:
     :return: number_of_violations
     """
 
     number_of_violations: int = 0
+    course_curricula: Dict[str, List[int]] = _get_course_curricula(curricula, model)
 
-    for x in range(0, len(schedule)):
-        for y in range(0, len(schedule[x])):
-            for course, _ in schedule[x][y].course_room_pairs:
-                for index in range(y + 1, len(schedule[x])):
-                    course_ids: List[str] = [
-                        course.course_id for course, _ in schedule[x][index].course_room_pairs
-                    ]
-                    if not _check_if_course_is_in_curriculum(
-                            course.course_id,
-                            course_ids,
-                            curricula
-                    ):
-                        number_of_violations += 1
+    day: List[Slot]
+    for day in schedule:
+        number_of_violations += _get_number_of_curriculum_compactness_violations_of_day(
+            curricula,
+            day,
+            model,
+            course_curricula
+        )
 
     return number_of_violations
 
@@ -272,62 +350,489 @@ def _get_number_of_room_stability_violations(
     return number_of_violations
 
 
-def get_num_of_violated_soft_constraints(
+def get_violated_soft_constraints_breakdown(
         schedule: List[List[Slot]],
         curricula: List[Curriculum],
-        courses: List[Course]
-) -> int:
-    number_of_constraints_violated: int = 0
+        courses: List[Course],
+        model: Optional[ProblemModel] = None
+) -> Dict[str, int]:
+    """
+    Validates the timetable and returns the number of violations of each soft constraint.
+    :return: dictionary of component name to number_of_violations
+    """
 
-    number_of_constraints_violated += _get_number_of_room_capacity_violations(schedule)
+    return {
+        'room_capacity': _get_number_of_room_capacity_violations(schedule),
+        'room_stability': _get_number_of_room_stability_violations(schedule, courses),
+        'minimum_working_days': _get_number_of_minimum_working_days_violations(courses, schedule),
+        'curriculum_compactness': _get_number_of_curriculum_compactness_violations(curricula, schedule, model)
+    }
 
-    number_of_constraints_violated += _get_number_of_room_stability_violations(
-        schedule,
-        courses
-    )
 
-    number_of_constraints_violated += _get_number_of_minimum_working_days_violations(
+def get_violated_hard_constraints_breakdown(
+        schedule: List[List[Slot]],
+        constraints: List[Constraint],
+        curricula: List[Curriculum],
+        courses: List[Course],
+        model: Optional[ProblemModel] = None
+) -> Dict[str, int]:
+    """
+    Validates the timetable and returns the number of violations of each hard constraint.
+    :return: dictionary of component name to number_of_violations
+    """
+
+    breakdown: Dict[str, int] = dict.fromkeys(HARD_CONSTRAINT_COMPONENTS, 0)
+
+    breakdown['lecture_allocations'] = _get_number_of_lecture_allocations_violations(
         courses,
         schedule
     )
 
-    number_of_constraints_violated += _get_number_of_curriculum_compactness_violations(
-        curricula,
+    day: List[Slot]
+    slot: Slot
+    for day in schedule:
+        for slot in day:
+            breakdown['conflicts'] += _get_number_of_conflict_violations(curricula, slot, model)
+            breakdown['room_occupancy'] += _get_number_of_room_occupancy_violations(slot)
+            breakdown['teacher'] += _get_number_of_teacher_violations(slot)
+
+    breakdown['unavailability'] = _get_number_of_unavailability_violations(
+        constraints,
         schedule
     )
 
-    return number_of_constraints_violated
+    return breakdown
+
+
+def get_num_of_violated_soft_constraints(
+        schedule: List[List[Slot]],
+        curricula: List[Curriculum],
+        courses: List[Course],
+        model: Optional[ProblemModel] = None
+) -> int:
+    return sum(get_violated_soft_constraints_breakdown(schedule, curricula, courses, model).values())
 
 
 def get_num_of_violated_hard_constraints(
         schedule: List[List[Slot]],
         constraints: List[Constraint],
         curricula: List[Curriculum],
-        courses: List[Course]
+        courses: List[Course],
+        model: Optional[ProblemModel] = None
 ) -> int:
     """
     Validates the timetable and returns the number of hard constraints violated.
     :return: number_of_hard_constraints_violated
     """
 
-    number_of_constraints_violated: int = 0
+    return sum(get_violated_hard_constraints_breakdown(schedule, constraints, curricula, courses, model).values())
 
-    number_of_constraints_violated += _get_number_of_lecture_allocations_violations(
-        courses,
-        schedule
-    )
 
-    day: List[Slot]
-    slot: Slot
-    for day in schedule:
-        for slot in day:
-            number_of_constraints_violated += _get_number_of_conflict_violations(curricula, slot)
-            number_of_constraints_violated += _get_number_of_room_occupancy_violations(slot)
-            number_of_constraints_violated += _get_number_of_teacher_violations(slot)
+#  For Delta Evaluation
+def get_insertion_soft_cost_deltas(
+        schedule: List[List[Slot]],
+        curricula: List[Curriculum],
+        course: Course,
+        placements: List[Tuple[int, int, Room]],
+        model: Optional[ProblemModel] = None
+) -> List[int]:
+    """
+    Returns, for each (day, period, room) placement, the change in the number of violated soft constraints caused by
+    inserting one lecture of the course there. The schedule is scanned once for all placements; only the compactness
+    of the placement's day is evaluated per placement.
+    :param schedule: List[List[Slot]]
+    :param curricula: List[Curriculum]
+    :param course: Course
+    :param placements: List[Tuple[int, int, Room]]
+    :param model: Optional[ProblemModel]
+    :return: the soft cost delta of each placement
+    """
 
-    number_of_constraints_violated += _get_number_of_unavailability_violations(
-        constraints,
-        schedule
+    course_curricula: Dict[str, List[int]] = _get_course_curricula(curricula, model)
+
+    room_counts: Dict[str, int] = defaultdict(int)
+    lectures_per_day: List[int] = [0] * len(schedule)
+    for day in range(0, len(schedule)):
+        for slot in schedule[day]:
+            for c, r in slot.course_room_pairs:
+                if c.course_id == course.course_id:
+                    room_counts[r.room_id] += 1
+                    lectures_per_day[day] += 1
+
+    most_common_room_count: int = max(room_counts.values(), default=0)
+    room_stability_violations: int = max(0, course.number_of_lectures - most_common_room_count)
+    minimum_working_days_violations: int = _get_number_of_minimum_working_days_violations_of_course(
+        course.min_working_days,
+        lectures_per_day
     )
 
-    return number_of_constraints_violated
+    minimum_working_days_deltas: Dict[int, int] = {}
+    curriculum_compactness_violations: Dict[int, int] = {}
+    deltas: List[int] = []
+
+    for day, period, room in placements:
+        if day not in minimum_working_days_deltas:
+            lectures_per_day[day] += 1
+            minimum_working_days_deltas[day] = _get_number_of_minimum_working_days_violations_of_course(
+                course.min_working_days,
+                lectures_per_day
+            ) - minimum_working_days_violations
+            lectures_per_day[day] -= 1
+
+            curriculum_compactness_violations[day] = _get_number_of_curriculum_compactness_violations_of_day(
+                curricula,
+                schedule[day],
+                model,
+                course_curricula
+            )
+
+        new_slot: Slot = Slot()
+        new_slot.course_room_pairs = schedule[day][period].course_room_pairs + [(course, room)]
+        new_day: List[Slot] = list(schedule[day])
+        new_day[period] = new_slot
+
+        new_most_common_room_count: int = max(most_common_room_count, room_counts.get(room.room_id, 0) + 1)
+
+        deltas.append(
+            int(course.number_of_students > room.room_capacity) +
+            max(0, course.number_of_lectures - new_most_common_room_count) - room_stability_violations +
+            minimum_working_days_deltas[day] +
+            _get_number_of_curriculum_compactness_violations_of_day(
+                curricula,
+                new_day,
+                model,
+                course_curricula
+            ) - curriculum_compactness_violations[day]
+        )
+
+    return deltas
+
+
+class DeltaEvaluator:
+    """
+    Incremental evaluator of the hard and soft constraint costs of a schedule.
+
+    A move is described by a SlotChanges dictionary that maps every affected (day, period) to the course room pairs
+    the slot holds after the move. The evaluator keeps the number of lectures of each course per room and per day so
+    that the change in every cost component can be computed from the affected slots only.
+    """
+
+    def __init__(
+            self,
+            schedule: List[List[Slot]],
+            constraints: List[Constraint],
+            curricula: List[Curriculum],
+            courses: List[Course],
+            model: Optional[ProblemModel] = None
+    ):
+        self.schedule: List[List[Slot]] = schedule
+        self.curricula: List[Curriculum] = curricula
+        self.model: Optional[ProblemModel] = model
+        self._courses: Dict[str, Course] = {course.course_id: course for course in courses}
+        self._course_curricula: Dict[str, List[int]] = _get_course_curricula(curricula, model)
+
+        self._unavailable_course_ids: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+        for constraint in constraints:
+            self._unavailable_course_ids[(constraint.day, constraint.period)].append(constraint.course_id)
+
+        self._lecture_counts: Dict[str, int] = defaultdict(int)
+        self._room_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._day_counts: Dict[str, List[int]] = defaultdict(lambda: [0] * len(self.schedule))
+
+        for day in range(len(schedule)):
+            for slot in schedule[day]:
+                for course, room in slot.course_room_pairs:
+                    self._lecture_counts[course.course_id] += 1
+                    self._room_counts[course.course_id][room.room_id] += 1
+                    self._day_counts[course.course_id][day] += 1
+
+        self.hard_constraints_breakdown: Dict[str, int] = get_violated_hard_constraints_breakdown(
+            schedule,
+            constraints,
+            curricula,
+            courses,
+            model
+        )
+        self.soft_constraints_breakdown: Dict[str, int] = get_violated_soft_constraints_breakdown(
+            schedule,
+            curricula,
+            courses,
+            model
+        )
+
+    def _get_pending_pairs(self, day: int, period: int, changes: SlotChanges) -> List[Tuple[Course, Room]]:
+        """
+        Helper function to get the course room pairs of a slot with the changes made so far applied.
+        :param day: int
+        :param period: int
+        :param changes: SlotChanges
+        :return: List[Tuple[Course, Room]]
+        """
+        if (day, period) in changes:
+            return list(changes[(day, period)])
+        return list(self.schedule[day][period].course_room_pairs)
+
+    def get_removal_changes(
+            self,
+            day: int,
+            period: int,
+            index: int,
+            changes: Optional[SlotChanges] = None
+    ) -> SlotChanges:
+        """
+        Describes the removal of the course room pair at the given index of a slot.
+        :param day: int
+        :param period: int
+        :param index: int
+        :param changes: SlotChanges of the move built so far, extended in place when given
+        :return: SlotChanges
+        """
+        changes = {} if changes is None else changes
+        course_room_pairs: List[Tuple[Course, Room]] = self._get_pending_pairs(day, period, changes)
+        course_room_pairs.pop(index)
+        changes[(day, period)] = course_room_pairs
+        return changes
+
+    def get_insertion_changes(
+            self,
+            day: int,
+            period: int,
+            course_room_pair: Tuple[Course, Room],
+            changes: Optional[SlotChanges] = None
+    ) -> SlotChanges:
+        """
+        Describes the insertion of a course room pair into a slot.
+        :param day: int
+        :param period: int
+        :param course_room_pair: Tuple[Course, Room]
+        :param changes: SlotChanges of the move built so far, extended in place when given
+        :return: SlotChanges
+        """
+        changes = {} if changes is None else changes
+        course_room_pairs: List[Tuple[Course, Room]] = self._get_pending_pairs(day, period, changes)
+        course_room_pairs.append(course_room_pair)
+        changes[(day, period)] = course_room_pairs
+        return changes
+
+    def get_swap_slots_changes(
+            self,
+            first_day: int,
+            first_period: int,
+            second_day: int,
+            second_period: int,
+            changes: Optional[SlotChanges] = None
+    ) -> SlotChanges:
+        """
+        Describes swapping the contents of two slots.
+        :param first_day: int
+        :param first_period: int
+        :param second_day: int
+        :param second_period: int
+        :param changes: SlotChanges of the move built so far, extended in place when given
+        :return: SlotChanges
+        """
+        changes = {} if changes is None else changes
+        first_course_room_pairs = self._get_pending_pairs(first_day, first_period, changes)
+        second_course_room_pairs = self._get_pending_pairs(second_day, second_period, changes)
+        changes[(first_day, first_period)] = second_course_room_pairs
+        changes[(second_day, second_period)] = first_course_room_pairs
+        return changes
+
+    def _get_course_costs(
+            self,
+            course_id: str,
+            number_of_lectures: int,
+            room_counts: Dict[str, int],
+            lectures_per_day: List[int]
+    ) -> Tuple[int, int, int]:
+        """
+        Helper function to get the lecture allocations, room stability and minimum working days violations of a course.
+        :param course_id: str
+        :param number_of_lectures: int
+        :param room_counts: Dict[str, int]
+        :param lectures_per_day: List[int]
+        :return: Tuple[int, int, int]
+        """
+        course: Optional[Course] = self._courses.get(course_id)
+        if course is None:
+            return 0, 0, 0
+
+        return (
+            int(number_of_lectures != course.number_of_lectures),
+            max(0, course.number_of_lectures - max(room_counts.values(), default=0)),
+            _get_number_of_minimum_working_days_violations_of_course(course.min_working_days, lectures_per_day)
+        )
+
+    def _get_course_count_changes(
+            self,
+            changes: SlotChanges
+    ) -> Tuple[Dict[str, int], Dict[str, Dict[str, int]], Dict[str, Dict[int, int]]]:
+        """
+        Helper function to get the change in the lecture, room and day counts of every course affected by a move.
+        :param changes: SlotChanges
+        :return: Tuple of lecture, room and day count changes per course id
+        """
+        lecture_changes: Dict[str, int] = defaultdict(int)
+        room_changes: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        day_changes: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+        for (day, period), course_room_pairs in changes.items():
+            for sign, pairs in ((-1, self.schedule[day][period].course_room_pairs), (1, course_room_pairs)):
+                for course, room in pairs:
+                    lecture_changes[course.course_id] += sign
+                    room_changes[course.course_id][room.room_id] += sign
+                    day_changes[course.course_id][day] += sign
+
+        return lecture_changes, room_changes, day_changes
+
+    def get_delta(self, changes: SlotChanges) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Returns the change in each hard and soft constraint component caused by a move, without applying it.
+        :param changes: SlotChanges
+        :return: Tuple of hard and soft component deltas
+        """
+        hard_delta: Dict[str, int] = dict.fromkeys(HARD_CONSTRAINT_COMPONENTS, 0)
+        soft_delta: Dict[str, int] = dict.fromkeys(SOFT_CONSTRAINT_COMPONENTS, 0)
+        changed_slots: Dict[Tuple[int, int], Slot] = {}
+
+        for (day, period), course_room_pairs in changes.items():
+            old_slot: Slot = self.schedule[day][period]
+            new_slot: Slot = Slot()
+            new_slot.course_room_pairs = course_room_pairs
+            changed_slots[(day, period)] = new_slot
+
+            hard_delta['conflicts'] += (
+                    _get_number_of_conflict_violations(self.curricula, new_slot, self.model) -
+                    _get_number_of_conflict_violations(self.curricula, old_slot, self.model)
+            )
+            hard_delta['room_occupancy'] += (
+                    _get_number_of_room_occupancy_violations(new_slot) -
+                    _get_number_of_room_occupancy_violations(old_slot)
+            )
+            hard_delta['teacher'] += (
+                    _get_number_of_teacher_violations(new_slot) -
+                    _get_number_of_teacher_violations(old_slot)
+            )
+
+            old_course_ids: List[str] = [course.course_id for course, _ in old_slot.course_room_pairs]
+            new_course_ids: List[str] = [course.course_id for course, _ in new_slot.course_room_pairs]
+            for course_id in self._unavailable_course_ids.get((day, period), []):
+                hard_delta['unavailability'] += int(course_id in new_course_ids) - int(course_id in old_course_ids)
+
+            soft_delta['room_capacity'] += (
+                    sum(course.number_of_students > room.room_capacity for course, room in new_slot.course_room_pairs) -
+                    sum(course.number_of_students > room.room_capacity for course, room in old_slot.course_room_pairs)
+            )
+
+        lecture_changes, room_changes, day_changes = self._get_course_count_changes(changes)
+        for course_id in lecture_changes:
+            old_room_counts: Dict[str, int] = self._room_counts[course_id]
+            new_room_counts: Dict[str, int] = dict(old_room_counts)
+            for room_id, count in room_changes[course_id].items():
+                new_room_counts[room_id] = new_room_counts.get(room_id, 0) + count
+
+            old_lectures_per_day: List[int] = self._day_counts[course_id]
+            new_lectures_per_day: List[int] = list(old_lectures_per_day)
+            for day, count in day_changes[course_id].items():
+                new_lectures_per_day[day] += count
+
+            old_costs = self._get_course_costs(
+                course_id,
+                self._lecture_counts[course_id],
+                old_room_counts,
+                old_lectures_per_day
+            )
+            new_costs = self._get_course_costs(
+                course_id,
+                self._lecture_counts[course_id] + lecture_changes[course_id],
+                new_room_counts,
+                new_lectures_per_day
+            )
+
+            hard_delta['lecture_allocations'] += new_costs[0] - old_costs[0]
+            soft_delta['room_stability'] += new_costs[1] - old_costs[1]
+            soft_delta['minimum_working_days'] += new_costs[2] - old_costs[2]
+
+        for day in {day for day, _ in changes}:
+            new_day: List[Slot] = [
+                changed_slots.get((day, period), slot) for period, slot in enumerate(self.schedule[day])
+            ]
+            soft_delta['curriculum_compactness'] += (
+                    _get_number_of_curriculum_compactness_violations_of_day(
+                        self.curricula,
+                        new_day,
+                        self.model,
+                        self._course_curricula
+                    ) -
+                    _get_number_of_curriculum_compactness_violations_of_day(
+                        self.curricula,
+                        self.schedule[day],
+                        self.model,
+                        self._course_curricula
+                    )
+            )
+
+        return hard_delta, soft_delta
+
+    def get_cost_delta(self, changes: SlotChanges) -> Tuple[int, int]:
+        """
+        Returns the change in the number of violated hard and soft constraints caused by a move.
+        :param changes: SlotChanges
+        :return: Tuple[int, int]
+        """
+        hard_delta, soft_delta = self.get_delta(changes)
+        return sum(hard_delta.values()), sum(soft_delta.values())
+
+    def update(self, changes: SlotChanges) -> None:
+        """
+        Updates the costs and counts kept by the evaluator for a move that is about to be written to the schedule.
+        Must be called before the schedule changes, e.g. before Timetable.set_course_room_pairs for each slot.
+        :param changes: SlotChanges
+        :return: None
+        """
+        hard_delta, soft_delta = self.get_delta(changes)
+
+        for component, delta in hard_delta.items():
+            self.hard_constraints_breakdown[component] += delta
+        for component, delta in soft_delta.items():
+            self.soft_constraints_breakdown[component] += delta
+
+        lecture_changes, room_changes, day_changes = self._get_course_count_changes(changes)
+        for course_id, count in lecture_changes.items():
+            self._lecture_counts[course_id] += count
+            for room_id, room_count in room_changes[course_id].items():
+                self._room_counts[course_id][room_id] += room_count
+                if self._room_counts[course_id][room_id] == 0:
+                    del self._room_counts[course_id][room_id]
+            for day, day_count in day_changes[course_id].items():
+                self._day_counts[course_id][day] += day_count
+
+    def apply(self, changes: SlotChanges) -> None:
+        """
+        Applies a move to a schedule that is not owned by a Timetable and updates the costs and counts kept by the
+        evaluator.
+        :param changes: SlotChanges
+        :return: None
+        """
+        self.update(changes)
+
+        for (day, period), course_room_pairs in changes.items():
+            self.schedule[day][period].course_room_pairs = list(course_room_pairs)
+
+    def synchronize(self, schedule: List[List[Slot]]) -> None:
+        """
+        Brings a schedule that is not owned by a Timetable up to date with another schedule of the same problem, e.g.
+        the schedule of a Timetable that changed since the evaluator last saw it, applying the slots that differ as one
+        move. This costs a comparison of every slot plus the delta of the slots that changed.
+        :param schedule: List[List[Slot]]
+        :return: None
+        """
+        changes: SlotChanges = {
+            (day, period): slot.course_room_pairs
+            for day, slots in enumerate(schedule)
+            for period, slot in enumerate(slots)
+            if slot.course_room_pairs != self.schedule[day][period].course_room_pairs
+        }
+
+        if len(changes) > 0:
+            self.apply(changes)
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from typing import Callable, Dict
+
+from src.common.config import COST_CACHE_SIZE
+
+
+class CostCache:
+    """
+    Bounded least-recently-used cache of constraint cost breakdowns keyed by timetable hash.
+
+    Each entry holds the hard and/or soft breakdown of one timetable; the two kinds are computed and counted
+    separately so that callers needing only one of them do not pay for the other.
+    """
+
+    def __init__(self, max_size: int = COST_CACHE_SIZE):
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: 'OrderedDict[int, Dict[str, Dict[str, int]]]' = OrderedDict()
+
+    def get_breakdown(self, key: int, kind: str, compute: Callable[[], Dict[str, int]]) -> Dict[str, int]:
+        """
+        Returns the cached breakdown of the given kind ('hard' or 'soft') for a key, computing and storing it on a miss.
+        :param key: int
+        :param kind: str
+        :param compute: Callable[[], Dict[str, int]]
+        :return: Dict[str, int]
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None and kind in entry:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return dict(entry[kind])
+
+        self.misses += 1
+        breakdown: Dict[str, int] = compute()
+
+        if entry is None:
+            entry = {}
+            self._entries[key] = entry
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+
+        entry[kind] = dict(breakdown)
+        return breakdown
+
+    def get_hit_rate(self) -> float:
+        """
+        Returns the fraction of lookups that were answered from the cache.
+        :return: float
+        """
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets the counters.
+        :return: None
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
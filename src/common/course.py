@@ -1,14 +1,21 @@
-class Course:
+from src.common.flyweight import Flyweight
 
-    def __init__(self, course_content: str):
-        self.course_content = course_content
-        course_content_list = course_content.split()
 
-        self.course_id = course_content_list[0]
-        self.teacher_id = course_content_list[1]
-        self.number_of_lectures = int(course_content_list[2])
-        self.min_working_days = int(course_content_list[3])
-        self.number_of_students = int(course_content_list[4])
+class Course(Flyweight):
+    __slots__ = ('course_id', 'teacher_id', 'number_of_lectures', 'min_working_days', 'number_of_students')
+
+    course_id: str
+    teacher_id: str
+    number_of_lectures: int
+    min_working_days: int
+    number_of_students: int
+
+    def __init__(self, course_content: str, index: int):
+        super().__init__(index)
+        course_content_list = course_content.split()
 
-    def clone(self):
-        return Course(self.course_content)
+        self._set('course_id', course_content_list[0])
+        self._set('teacher_id', course_content_list[1])
+        self._set('number_of_lectures', int(course_content_list[2]))
+        self._set('min_working_days', int(course_content_list[3]))
+        self._set('number_of_students', int(course_content_list[4]))
@@ -1,11 +1,19 @@
-from typing import List
+from typing import Tuple
 
+from src.common.flyweight import Flyweight
 
-class Curriculum:
 
-    def __init__(self, curricula_content: str):
+class Curriculum(Flyweight):
+    __slots__ = ('curricula_id', 'number_of_courses', 'course_ids')
+
+    curricula_id: str
+    number_of_courses: int
+    course_ids: Tuple[str, ...]
+
+    def __init__(self, curricula_content: str, index: int, course_ids: Tuple[str, ...]):
+        super().__init__(index)
         curricula_content_list = curricula_content.split()
 
-        self.curricula_id: str = curricula_content_list[0]
-        self.number_of_courses: int = int(curricula_content_list[1])
-        self.course_ids: List[str] = []
+        self._set('curricula_id', curricula_content_list[0])
+        self._set('number_of_courses', int(curricula_content_list[1]))
+        self._set('course_ids', course_ids)
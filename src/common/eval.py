@@ -1,7 +1,7 @@
 from src.common.acceptance import MoveAcceptance
 from src.common.chromosome import Chromosome
-from src.common.constraints_validator import get_num_of_violated_hard_constraints, get_num_of_violated_soft_constraints
-from src.common.generation_perturbative import *
+from src.common.program import Program
+from src.common.timetable import Timetable
 
 
 def _perform_perturbation(chromosome: Chromosome, timetable: Timetable) -> Timetable:
@@ -15,28 +15,11 @@ def _perform_perturbation(chromosome: Chromosome, timetable: Timetable) -> Timet
     current_timetable: Timetable = previous_timetable.clone()
     best_timetable: Timetable = previous_timetable.clone()
 
-    expression: str = chromosome.phenotype
-    expression_tokens: List[str] = expression.split()
+    program: Program = chromosome.get_program()
+    current_timetable = program.run(current_timetable)
 
-    for index in range(1, len(expression_tokens)):
-        if expression_tokens[index] == "single_move()":
-            current_timetable = single_move(current_timetable)
-        elif expression_tokens[index] == 'swap_slots()':
-            current_timetable = swap_slots(current_timetable)
-        elif expression_tokens[index] == 'swap_lectures()':
-            current_timetable = swap_lectures(current_timetable)
-        else:
-            continue
-
-    if expression_tokens[0] == "ILTA":
-        if move_acceptance.iterated_limited_threshold_acceptance(previous_timetable, current_timetable):
-            best_timetable = current_timetable.clone()
-    elif expression_tokens[0] == "AEI":
-        if move_acceptance.accept_equal_and_improving(previous_timetable, current_timetable):
-            best_timetable = current_timetable.clone()
-    else:
-        if move_acceptance.accept_improving(previous_timetable, current_timetable):
-            best_timetable = current_timetable.clone()
+    if program.accept(move_acceptance, previous_timetable, current_timetable):
+        best_timetable = current_timetable.clone()
 
     return best_timetable
 
@@ -50,18 +33,7 @@ def calculate_fitness(chromosome: Chromosome, timetable: Timetable) -> None:
     """
     perturbed_timetable: Timetable = _perform_perturbation(chromosome, timetable)
 
-    num_of_violated_soft_constraints = get_num_of_violated_soft_constraints(
-        perturbed_timetable.schedule,
-        perturbed_timetable.curricula,
-        perturbed_timetable.courses
-    )
-
-    num_of_violated_hard_constraints = get_num_of_violated_hard_constraints(
-        perturbed_timetable.schedule,
-        perturbed_timetable.constraints,
-        perturbed_timetable.curricula,
-        perturbed_timetable.courses
-    )
+    num_of_violated_hard_constraints, num_of_violated_soft_constraints = perturbed_timetable.get_constraints_cost()
 
     chromosome.timetable = perturbed_timetable.clone()
     chromosome.hard_constraints_cost = num_of_violated_hard_constraints
@@ -0,0 +1,173 @@
+from typing import Dict, List
+
+from src.common.problem_model import ProblemModel
+
+
+class FeasibilityIndex:
+    """
+    Incrementally maintained index of the periods in which each course can be placed without a hard conflict.
+
+    For every course it keeps a bitmask (bit day * number_of_periods_per_day + period) of the periods blocked by a
+    lecture of a conflicting course (the course itself, a course of a shared curriculum or a course of the same
+    teacher). For every period it keeps the room occupancy, also as a bitmask of the occupied rooms, and, per distinct
+    number of students, a bitmask of the periods that still have a free room large enough. For every course it keeps
+    the number of its lectures per room, for room stability. Placing or removing a lecture costs O(conflicting courses
+    + distinct student numbers), and the feasible periods of a course are a few bitwise operations.
+    """
+
+    def __init__(self, model: ProblemModel):
+        self.model: ProblemModel = model
+        self._all_periods: int = (1 << model.number_of_periods) - 1
+
+        self._available_periods: List[int] = [
+            sum(1 << period for period in range(model.number_of_periods) if not unavailable[period])
+            for unavailable in model.unavailable
+        ]
+        self._student_thresholds: List[int] = sorted(set(model.students))
+
+        self._conflict_counts: List[List[int]] = [[0] * model.number_of_periods for _ in model.courses]
+        self._blocked_periods: List[int] = [0] * len(model.courses)
+
+        self._slot_sizes: List[int] = [0] * model.number_of_periods
+        self._room_counts: List[List[int]] = [[0] * len(model.rooms) for _ in range(model.number_of_periods)]
+        self._occupancy: List[int] = [0] * model.number_of_periods
+        self._course_room_counts: List[List[int]] = [[0] * len(model.rooms) for _ in model.courses]
+        largest_capacity: int = max(model.capacities, default=-1)
+        self._roomy_periods: Dict[int, int] = {
+            students: self._all_periods if students <= largest_capacity else 0
+            for students in self._student_thresholds
+        }
+
+    def copy(self) -> 'FeasibilityIndex':
+        """
+        Returns an independent copy of the index.
+        :return: FeasibilityIndex
+        """
+        index: FeasibilityIndex = FeasibilityIndex.__new__(FeasibilityIndex)
+        index.model = self.model
+        index._all_periods = self._all_periods
+        index._available_periods = self._available_periods
+        index._student_thresholds = self._student_thresholds
+        index._conflict_counts = [list(counts) for counts in self._conflict_counts]
+        index._blocked_periods = list(self._blocked_periods)
+        index._slot_sizes = list(self._slot_sizes)
+        index._room_counts = [list(counts) for counts in self._room_counts]
+        index._occupancy = list(self._occupancy)
+        index._course_room_counts = [list(counts) for counts in self._course_room_counts]
+        index._roomy_periods = dict(self._roomy_periods)
+        return index
+
+    def _update_roomy_periods(self, period: int) -> None:
+        """
+        Helper function to refresh, for every student threshold, whether a period still has a large enough free room.
+        :param period: int
+        :return: None
+        """
+        room_counts: List[int] = self._room_counts[period]
+        largest_free_capacity: int = -1
+
+        if self._slot_sizes[period] != len(self.model.rooms):
+            largest_free_capacity = max(
+                (capacity for capacity, count in zip(self.model.capacities, room_counts) if count == 0),
+                default=-1
+            )
+
+        bit: int = 1 << period
+        for students in self._student_thresholds:
+            if students <= largest_free_capacity:
+                self._roomy_periods[students] |= bit
+            else:
+                self._roomy_periods[students] &= ~bit
+
+    def _update(self, course: int, room: int, period: int, change: int) -> None:
+        """
+        Helper function to add (change = 1) or remove (change = -1) a lecture.
+        :param course: int
+        :param room: int
+        :param period: int
+        :param change: int
+        :return: None
+        """
+        bit: int = 1 << period
+
+        for other in self.model.conflicting_courses[course]:
+            counts: List[int] = self._conflict_counts[other]
+            counts[period] += change
+            if counts[period] == 0:
+                self._blocked_periods[other] &= ~bit
+            else:
+                self._blocked_periods[other] |= bit
+
+        self._slot_sizes[period] += change
+        self._room_counts[period][room] += change
+        if self._room_counts[period][room] == 0:
+            self._occupancy[period] &= ~(1 << room)
+        else:
+            self._occupancy[period] |= 1 << room
+        self._course_room_counts[course][room] += change
+        self._update_roomy_periods(period)
+
+    def add(self, course: int, room: int, day: int, period: int) -> None:
+        """
+        Records a lecture placed in a slot.
+        :param course: int
+        :param room: int
+        :param day: int
+        :param period: int
+        :return: None
+        """
+        self._update(
+            course,
+            room,
+            self.model.get_period(day % self.model.number_of_days, period % self.model.number_of_periods_per_day),
+            1
+        )
+
+    def remove(self, course: int, room: int, day: int, period: int) -> None:
+        """
+        Records a lecture removed from a slot.
+        :param course: int
+        :param room: int
+        :param day: int
+        :param period: int
+        :return: None
+        """
+        self._update(
+            course,
+            room,
+            self.model.get_period(day % self.model.number_of_days, period % self.model.number_of_periods_per_day),
+            -1
+        )
+
+    def get_feasible_periods(self, course: int) -> int:
+        """
+        Returns the bitmask of the periods where the course is not already scheduled, is available, conflicts with no
+        scheduled course and finds a free room with enough capacity.
+        :param course: int
+        :return: int
+        """
+        return (
+                self._all_periods
+                & ~self._blocked_periods[course]
+                & self._available_periods[course]
+                & self._roomy_periods[self.model.students[course]]
+        )
+
+    def get_occupancy(self, day: int, period: int) -> int:
+        """
+        Returns the bitmask of the rooms occupied in a slot.
+        :param day: int
+        :param period: int
+        :return: int
+        """
+        return self._occupancy[
+            self.model.get_period(day % self.model.number_of_days, period % self.model.number_of_periods_per_day)
+        ]
+
+    def get_room_counts(self, course: int) -> List[int]:
+        """
+        Returns the number of lectures of a course in each room. The list must not be changed.
+        :param course: int
+        :return: List[int]
+        """
+        return self._course_room_counts[course]
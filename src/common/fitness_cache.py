@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from src.common.config import FITNESS_CACHE_SIZE
+from src.common.timetable import Timetable
+
+FitnessKey = Tuple[str, int, int]
+Fitness = Tuple[int, int, Timetable]
+
+
+class FitnessCache:
+    """
+    Bounded least-recently-used cache of seeded fitness evaluations.
+
+    A key is a phenotype, the hash of the timetable its evaluation starts from and the seed of the evaluation; the
+    entry is the hard and soft constraints cost and the perturbed timetable it produced. Entries are only valid while
+    evaluations are deterministic given their key, i.e. when every evaluation is run with its own derived seed.
+    """
+
+    def __init__(self, max_size: int = FITNESS_CACHE_SIZE):
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: 'OrderedDict[FitnessKey, Fitness]' = OrderedDict()
+
+    def get(self, key: FitnessKey) -> Optional[Fitness]:
+        """
+        Returns the cached fitness of a key, counting the lookup as a hit or a miss.
+        :param key: FitnessKey
+        :return: Optional[Fitness], None on a miss
+        """
+        fitness: Optional[Fitness] = self._entries.get(key)
+
+        if fitness is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return fitness
+
+    def put(self, key: FitnessKey, fitness: Fitness) -> None:
+        """
+        Stores the fitness of a key, evicting the least recently used entry when the cache is full.
+        :param key: FitnessKey
+        :param fitness: Fitness
+        :return: None
+        """
+        self._entries[key] = fitness
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_hit_rate(self) -> float:
+        """
+        Returns the fraction of lookups that were answered from the cache.
+        :return: float
+        """
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets the counters.
+        :return: None
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,75 @@
+from typing import Any, Iterator, Tuple
+
+
+class Flyweight:
+    """
+    Base class of the immutable problem entities (courses, rooms, curricula and constraints).
+
+    A Problem creates exactly one object per entity and numbers them with a dense index, so objects are shared by all
+    timetables instead of being copied, and compare and hash by that index.
+    """
+
+    __slots__ = ('index',)
+
+    index: int
+
+    def __init__(self, index: int):
+        object.__setattr__(self, 'index', index)
+
+    def _set(self, name: str, value: Any) -> None:
+        """
+        Helper function used by the constructors of subclasses to set an attribute of the otherwise immutable object.
+        :param name: str
+        :param value: Any
+        :return: None
+        """
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def _get_slot_names(cls) -> Iterator[str]:
+        """
+        Helper function to get the names of the attributes of the class and its bases.
+        :return: Iterator[str]
+        """
+        for klass in reversed(cls.__mro__):
+            yield from getattr(klass, '__slots__', ())
+
+    @classmethod
+    def _restore(cls, state: Tuple[Any, ...]) -> 'Flyweight':
+        """
+        Helper function to rebuild an object from its attribute values when unpickling.
+        :param state: Tuple[Any, ...]
+        :return: Flyweight
+        """
+        flyweight = object.__new__(cls)
+        for name, value in zip(cls._get_slot_names(), state):
+            object.__setattr__(flyweight, name, value)
+        return flyweight
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash(self.index)
+
+    def __reduce__(self):
+        return type(self)._restore, (tuple(getattr(self, name) for name in self._get_slot_names()),)
+
+    def __copy__(self) -> 'Flyweight':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'Flyweight':
+        return self
+
+    def clone(self) -> 'Flyweight':
+        """
+        Returns the object itself, as flyweights are never copied.
+        :return: Flyweight
+        """
+        return self
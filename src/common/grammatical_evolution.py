@@ -1,29 +1,63 @@
+import heapq
 import random
-from typing import List, Union
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple, Union
 
-from src.common.chromosome import Chromosome
+from src.common.budget import Budget
+from src.common.checkpoint import Checkpoint, CheckpointState
+from src.common.chromosome import Chromosome, EncodedChromosome, decode_chromosome, encode_chromosome
 from src.common.chromosome_generator import ChromosomeGenerator
 from src.common.config import POPULATION_SIZE, TOURNAMENT_SIZE, MAX_GENERATIONS, CROSSOVER_PROBABILITY, \
-    MUTATION_PROBABILITY
-from src.common.eval import calculate_fitness
+    MUTATION_PROBABILITY, NUMBER_OF_FITNESS_WORKERS, SURVIVOR_SELECTION, NUMBER_OF_OFFSPRING, FITNESS_CACHE_SIZE, \
+    REJECT_DUPLICATE_PHENOTYPES, SKIP_NEUTRAL_EVALUATIONS, CODON_MATRIX, HEAP_POPULATION
+from src.common.fitness_cache import FitnessCache
 from src.common.grammar import GrammarGenerator
+from src.common.parallel_evaluation import ParallelEvaluator
+from src.common.population import Population
+from src.common.problem import Problem
+from src.common.program import compile_program
 from src.common.timetable import Timetable
 
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.common.codon_population import CodonPopulation
+
+STEADY_STATE: str = 'steady-state'
+PLUS_SELECTION: str = 'mu+lambda'
+COMMA_SELECTION: str = 'mu,lambda'
+
+CHECKPOINT_STAGE: str = 'grammatical_evolution'
+
+
+def _get_cost(chromosome: Chromosome) -> Tuple[int, int]:
+    """
+    Returns the (hard, soft) constraints cost of a chromosome, the key chromosomes are ranked by.
+    :param chromosome: The chromosome.
+    :return: The cost of the chromosome.
+    """
+    return chromosome.hard_constraints_cost, chromosome.soft_constraints_cost
+
 
 def _mutation(chromosome: Chromosome) -> Chromosome:
     """
-    Mutates a chromosome.
+    Mutates a chromosome. The phenotype is kept valid if the mutated codon lies beyond the effective codons.
     :param chromosome: The chromosome to mutate.
     :return: The mutated chromosome.
     """
     index = random.randint(0, len(chromosome.codons) - 1)
     chromosome.codons[index] = random.randrange(256)
+
+    if chromosome.effective_codons is not None and index < chromosome.effective_codons:
+        chromosome.effective_codons = None
+
     return chromosome
 
 
 def _crossover(first_chromosome: Chromosome, second_chromosome: Chromosome) -> None:
     """
-    Performs single point crossover between two chromosomes.
+    Performs single point crossover between two chromosomes. The phenotype of a child is kept valid if its crossover
+    point lies beyond its effective codons, since the codons before the point are the only ones it keeps.
     :param first_chromosome: The first parent.
     :param second_chromosome: The second parent.
     :return: None.
@@ -37,10 +71,48 @@ def _crossover(first_chromosome: Chromosome, second_chromosome: Chromosome) -> N
     first_chromosome.codons = first_chromosome_codons[:first_index] + second_chromosome_codons[second_index:]
     second_chromosome.codons = second_chromosome_codons[:second_index] + first_chromosome_codons[first_index:]
 
+    if first_chromosome.effective_codons is not None and first_index < first_chromosome.effective_codons:
+        first_chromosome.effective_codons = None
+    if second_chromosome.effective_codons is not None and second_index < second_chromosome.effective_codons:
+        second_chromosome.effective_codons = None
+
+
+def _create_rng(seed: Optional[int] = None) -> 'np.random.Generator':
+    """
+    Creates the numpy generator of the codon matrix. numpy is imported here, so that it is only needed when
+    CODON_MATRIX is enabled.
+    :param seed: The seed of the generator, or None to seed it from the operating system.
+    :return: The generator.
+    """
+    import numpy as np
+
+    return np.random.default_rng(seed)
+
 
 class GrammaticalEvolution:
 
-    def __init__(self, chromosome_generator: ChromosomeGenerator, grammar_generator: GrammarGenerator):
+    def __init__(
+            self,
+            chromosome_generator: ChromosomeGenerator,
+            grammar_generator: GrammarGenerator,
+            number_of_workers: int = NUMBER_OF_FITNESS_WORKERS,
+            survivor_selection: str = SURVIVOR_SELECTION,
+            number_of_offspring: int = NUMBER_OF_OFFSPRING,
+            fitness_cache_size: int = FITNESS_CACHE_SIZE,
+            reject_duplicates: bool = REJECT_DUPLICATE_PHENOTYPES,
+            skip_neutral_evaluations: bool = SKIP_NEUTRAL_EVALUATIONS,
+            codon_matrix: bool = CODON_MATRIX,
+            heap_population: bool = HEAP_POPULATION
+    ):
+        if survivor_selection not in (STEADY_STATE, PLUS_SELECTION, COMMA_SELECTION):
+            raise ValueError(f"Unknown survivor selection: {survivor_selection}")
+        if reject_duplicates and survivor_selection == STEADY_STATE:
+            raise ValueError("Steady-state offspring are population members changed in place and cannot be rejected")
+        if codon_matrix and survivor_selection == STEADY_STATE:
+            raise ValueError("Batch breeding on the codon matrix needs a generational survivor selection")
+        if heap_population and survivor_selection != STEADY_STATE:
+            raise ValueError("The heap population replaces the steady-state sort and needs steady-state selection")
+
         self.best_solution = None
         self._chromosome_generator = chromosome_generator
         self._grammar = grammar_generator.get_grammar()
@@ -50,12 +122,41 @@ class GrammaticalEvolution:
         self._max_num_of_generations = MAX_GENERATIONS
         self._crossover_probability = CROSSOVER_PROBABILITY
         self._mutation_probability = MUTATION_PROBABILITY
+        self._number_of_workers = number_of_workers
+        self._survivor_selection = survivor_selection
+        self._number_of_offspring = number_of_offspring
+        self._reject_duplicates = reject_duplicates
+        self._skip_neutral_evaluations = skip_neutral_evaluations
+        self.neutral_offspring: int = 0
+        self._codon_matrix = codon_matrix
+        self._rng: Optional['np.random.Generator'] = None
+        self._codon_population: Optional['CodonPopulation'] = None
+        self._codon_population_of: Optional[List[Chromosome]] = None
+        self._heap_population = heap_population
+        self.fitness_cache: Optional[FitnessCache] = (
+            FitnessCache(fitness_cache_size) if fitness_cache_size > 0 else None
+        )
+        self._evaluator: Optional[ParallelEvaluator] = None
+        self._budget: Optional[Budget] = None
+        self._checkpoint: Optional[Checkpoint] = None
+        self._base_seed: Optional[int] = None
 
     def __generate_initial_population(self) -> List[Chromosome]:
         """
-        Generates the initial population of chromosomes.
+        Generates the initial population of chromosomes, and with the codon matrix, the codon population of its rows.
         :return: The initial population of chromosomes.
         """
+        if self._rng is not None:
+            from src.common.codon_population import CodonPopulation
+
+            self._codon_population = CodonPopulation.generate(
+                self._population_size,
+                self._chromosome_generator.lower_bound,
+                self._chromosome_generator.upper_bound,
+                self._rng
+            )
+            return [self._codon_population.get_chromosome(index) for index in range(len(self._codon_population))]
+
         return [self._chromosome_generator.generate_chromosome() for _ in range(self._population_size)]
 
     def __selection(self, population: List[Chromosome]) -> Chromosome:
@@ -72,12 +173,14 @@ class GrammaticalEvolution:
 
     def __map(self, chromosome: Chromosome) -> None:
         """
-        Maps a chromosome to a phenotype.
+        Maps a chromosome to a phenotype. If the derivation did not wrap around the codons, the number of codons it
+        consumed is recorded as the chromosome's effective codons: no other codon can change the phenotype.
         :param chromosome: The chromosome to map.
         :return: None.
         """
         codons: List[int] = chromosome.codons
         self.current_codon: int = 0
+        wrapped: bool = False
 
         starting_symbol: str = next(iter(self._grammar.keys()))
         stack: List[str] = [starting_symbol]
@@ -88,6 +191,7 @@ class GrammaticalEvolution:
 
             if self.current_codon >= len(codons):
                 self.current_codon = 0
+                wrapped = True
                 del codons
                 codons: List[int] = self._chromosome_generator.generate_codons()
 
@@ -107,30 +211,51 @@ class GrammaticalEvolution:
         del codons
         del stack
         chromosome.phenotype = phenotype
+        chromosome.program = compile_program(phenotype)
+        chromosome.effective_codons = None if wrapped else self.current_codon
 
-    def run(self, initial_timetable: Timetable, number_of_perturbatives_to_select=1) -> Union[
-        List[Chromosome],
-        Chromosome
-    ]:
-        population: List[Chromosome] = self.__generate_initial_population()
+    def __map_changed(self, chromosomes: List[Chromosome]) -> List[Chromosome]:
+        """
+        Maps the chromosomes whose phenotype may have changed since they were last mapped. Remapping any other would
+        give the same phenotype without drawing random numbers, so it is skipped.
+        :param chromosomes: The chromosomes to map.
+        :return: The chromosomes that were mapped.
+        """
+        changed: List[Chromosome] = []
 
         chromosome: Chromosome
-        for chromosome in population:
-            self.__map(chromosome)
-            calculate_fitness(chromosome, initial_timetable)
+        for chromosome in chromosomes:
+            if chromosome.effective_codons is None:
+                self.__map(chromosome)
+                changed.append(chromosome)
+            else:
+                self.neutral_offspring += 1
 
-        population.sort(key=lambda individual: (individual.hard_constraints_cost, individual.soft_constraints_cost))
+        return changed
 
-        best_solution: Chromosome = population[0]
-        chromosome: Chromosome
-        num_of_generation: int = 0
+    def __evaluate(self, chromosomes: List[Chromosome]) -> None:
+        """
+        Calculates the fitness of mapped chromosomes with the evaluator of the current evaluation context.
+        :param chromosomes: The chromosomes to evaluate.
+        :return: None.
+        """
+        if self._evaluator is None:
+            raise RuntimeError("Chromosomes can only be evaluated within GrammaticalEvolution.evaluation")
 
-        while (
-                num_of_generation < self._max_num_of_generations and
-                (not (best_solution.hard_constraints_cost == 0 and best_solution.soft_constraints_cost == 0))
-        ):
-            first_chromosome: Chromosome = self.__selection(population)
-            second_chromosome: Chromosome = self.__selection(population)
+        if self._budget is not None:
+            self._budget.record_evaluations(len(chromosomes))
+
+        self._evaluator.evaluate(chromosomes)
+
+    def __breed(self, population: List[Chromosome]) -> Iterator[Tuple[Chromosome, Chromosome]]:
+        """
+        Yields pairs of children of tournament winners, bred from copies of the parents.
+        :param population: The population to select parents from.
+        :return: The pairs of children.
+        """
+        while True:
+            first_chromosome: Chromosome = self.__selection(population).clone()
+            second_chromosome: Chromosome = self.__selection(population).clone()
 
             if random.random() < self._crossover_probability:
                 _crossover(first_chromosome, second_chromosome)
@@ -139,17 +264,410 @@ class GrammaticalEvolution:
                 _mutation(first_chromosome)
                 _mutation(second_chromosome)
 
-            self.__map(first_chromosome)
-            self.__map(second_chromosome)
+            yield first_chromosome, second_chromosome
+
+    def __reproduce(self, population: List[Chromosome]) -> List[Chromosome]:
+        """
+        Produces one generation of offspring. Parents are selected by tournament and copied, so unlike in the
+        steady-state loop the population itself is never changed by crossover and mutation. The offspring are mapped
+        and then evaluated as one batch.
+
+        When duplicates are rejected, every offspring is mapped as soon as it is bred and dropped before evaluation if
+        its phenotype is already in the population or in the generation; once ten times the number of offspring have
+        been bred, duplicates are accepted so that the generation is always complete.
+        :param population: The population to select parents from.
+        :return: The evaluated offspring.
+        """
+        offspring: List[Chromosome] = []
+        changed_offspring: List[bool] = []
+        phenotypes: Set[str] = {chromosome.phenotype for chromosome in population}
+        number_of_bred: int = 0
+        breeding: Iterator[Tuple[Chromosome, Chromosome]] = self.__breed(population)
+
+        while len(offspring) < self._number_of_offspring:
+            first_chromosome, second_chromosome = next(breeding)
+
+            if not self._reject_duplicates:
+                offspring.append(first_chromosome)
+                offspring.append(second_chromosome)
+                continue
+
+            for chromosome in (first_chromosome, second_chromosome):
+                is_changed: bool = len(self.__map_changed([chromosome])) > 0
+                number_of_bred += 1
+
+                if chromosome.phenotype not in phenotypes or number_of_bred > 10 * self._number_of_offspring:
+                    phenotypes.add(chromosome.phenotype)
+                    offspring.append(chromosome)
+                    changed_offspring.append(is_changed)
+
+        offspring = offspring[:self._number_of_offspring]
+
+        changed: List[Chromosome]
+        if self._reject_duplicates:
+            changed = [
+                chromosome for chromosome, is_changed in zip(offspring, changed_offspring) if is_changed
+            ]
+        else:
+            changed = self.__map_changed(offspring)
+        self.__evaluate(changed if self._skip_neutral_evaluations else offspring)
+
+        return offspring
+
+    def __steady_state_step(self, population: List[Chromosome]) -> List[Chromosome]:
+        """
+        Replaces the population by the best of it and two offspring bred in place from tournament winners.
+        :param population: The population.
+        :return: The next population, sorted.
+        """
+        first_chromosome: Chromosome = self.__selection(population)
+        second_chromosome: Chromosome = self.__selection(population)
+
+        if random.random() < self._crossover_probability:
+            _crossover(first_chromosome, second_chromosome)
+
+        if random.random() < self._mutation_probability:
+            _mutation(first_chromosome)
+            _mutation(second_chromosome)
+
+        changed: List[Chromosome] = self.__map_changed([first_chromosome, second_chromosome])
+
+        self.__evaluate(changed if self._skip_neutral_evaluations else [first_chromosome, second_chromosome])
+
+        population.append(first_chromosome)
+        population.append(second_chromosome)
+
+        population.sort(key=lambda individual: (individual.hard_constraints_cost, individual.soft_constraints_cost))
+        return population[:self._population_size]
+
+    def __is_budget_exhausted(self) -> bool:
+        """
+        Returns whether the budget of the current run, if it has one, is used up.
+        :return: Whether the run has to stop.
+        """
+        return self._budget is not None and self._budget.is_exhausted()
+
+    def __heap_steady_state_step(self, population: Population) -> None:
+        """
+        Inserts into a heap population two offspring bred from copies of tournament winners, evicting the worst.
+        :param population: The population.
+        :return: None.
+        """
+        first_chromosome: Chromosome = population.select(self._tournament_size).clone()
+        second_chromosome: Chromosome = population.select(self._tournament_size).clone()
+
+        if random.random() < self._crossover_probability:
+            _crossover(first_chromosome, second_chromosome)
+
+        if random.random() < self._mutation_probability:
+            _mutation(first_chromosome)
+            _mutation(second_chromosome)
+
+        changed: List[Chromosome] = self.__map_changed([first_chromosome, second_chromosome])
+
+        self.__evaluate(changed if self._skip_neutral_evaluations else [first_chromosome, second_chromosome])
+
+        population.push(first_chromosome)
+        population.push(second_chromosome)
+
+    def __evolve_heap_population(
+            self,
+            population: Population,
+            initial_timetable: Timetable,
+            number_of_perturbatives_to_select: int,
+            first_generation: int = 0
+    ) -> Union[List[Chromosome], Chromosome]:
+        """
+        Runs the steady-state generations on a heap population. Its members never change, so its best chromosome is
+        returned without being cloned.
+        :param population: The evaluated initial population.
+        :param initial_timetable: The timetable to evaluate.
+        :param number_of_perturbatives_to_select: The number of chromosomes to return.
+        :param first_generation: The number of generations already run, when resuming from a checkpoint.
+        :return: The best chromosome, or the best chromosomes if more than one is selected.
+        """
+        num_of_generation: int = first_generation
+
+        while (
+                num_of_generation < self._max_num_of_generations and
+                (not (population.best.hard_constraints_cost == 0 and population.best.soft_constraints_cost == 0)) and
+                not self.__is_budget_exhausted()
+        ):
+            if self._checkpoint is not None and self._checkpoint.is_due():
+                self.__save_heap_population(population, initial_timetable, num_of_generation)
+
+            self.__heap_steady_state_step(population)
+            num_of_generation += 1
+
+        if number_of_perturbatives_to_select == 1:
+            return population.best
+        else:
+            return population.get_sorted()[:number_of_perturbatives_to_select]
+
+    def __generational_step(self, population: List[Chromosome]) -> List[Chromosome]:
+        """
+        Replaces the population by the best of a generation of offspring, together with the population itself in
+        (mu + lambda) mode. The survivors are found by partial selection rather than by sorting every candidate.
+        :param population: The population.
+        :return: The next population, sorted.
+        """
+        if self._rng is not None:
+            return self.__codon_generational_step(population)
+
+        offspring: List[Chromosome] = self.__reproduce(population)
+
+        return heapq.nsmallest(
+            self._population_size,
+            population + offspring if self._survivor_selection == PLUS_SELECTION else offspring,
+            key=_get_cost
+        )
 
-            calculate_fitness(first_chromosome, initial_timetable)
-            calculate_fitness(second_chromosome, initial_timetable)
+    def __reproduce_codons(
+            self,
+            population: List[Chromosome]
+    ) -> Tuple['CodonPopulation', List[Optional[Chromosome]], List[Chromosome]]:
+        """
+        Produces one generation of offspring on the codon population, as __reproduce does on chromosomes, breeding the
+        pairs a generation at a time. A Chromosome is only built for an offspring that has to be mapped, because a
+        changed codon may change its phenotype, or evaluated; any other offspring keeps the phenotype and costs of its
+        parent and stays a row.
+        :param population: The population, whose rows are the codon population.
+        :return: The evaluated offspring rows, the chromosome of each row if one was built, and the parent of each row.
+        """
+        import numpy as np
+
+        from src.common.codon_population import NO_EFFECTIVE_CODONS, CodonPopulation
+
+        batches: List[CodonPopulation] = []
+        offspring: List[Optional[Chromosome]] = []
+        parents: List[Chromosome] = []
+        phenotypes: Set[str] = {chromosome.phenotype for chromosome in population}
+        number_of_pairs: int = (self._number_of_offspring + 1) // 2
+        number_of_bred: int = 0
+
+        while len(offspring) < self._number_of_offspring:
+            children, children_parents = self._codon_population.breed(
+                self._codon_population.select(number_of_pairs, self._tournament_size, self._rng),
+                self._codon_population.select(number_of_pairs, self._tournament_size, self._rng),
+                self._crossover_probability,
+                self._mutation_probability,
+                self._rng
+            )
+            rows: List[int] = []
+
+            for row in range(len(children)):
+                if len(offspring) >= self._number_of_offspring and (not self._reject_duplicates or row % 2 == 0):
+                    break
+
+                parent: Chromosome = population[children_parents[row]]
+                is_changed: bool = children.effective_codons[row] == NO_EFFECTIVE_CODONS
+                chromosome: Optional[Chromosome] = None
+
+                if is_changed or not self._skip_neutral_evaluations:
+                    chromosome = children.get_chromosome(row, parent)
+                if is_changed:
+                    self.__map(chromosome)
+                else:
+                    self.neutral_offspring += 1
+
+                if self._reject_duplicates:
+                    phenotype: str = parent.phenotype if chromosome is None else chromosome.phenotype
+                    number_of_bred += 1
+
+                    if phenotype in phenotypes and number_of_bred <= 10 * self._number_of_offspring:
+                        continue
+                    phenotypes.add(phenotype)
+
+                rows.append(row)
+                offspring.append(chromosome)
+                parents.append(parent)
+
+            batches.append(children.take(np.array(rows, dtype=np.int64)))
+
+        offspring_rows: CodonPopulation = CodonPopulation.concatenate(batches).take(
+            np.arange(self._number_of_offspring)
+        )
+        offspring = offspring[:self._number_of_offspring]
+
+        self.__evaluate([chromosome for chromosome in offspring if chromosome is not None])
+
+        row: int
+        for row, chromosome in enumerate(offspring):
+            if chromosome is not None:
+                offspring_rows.set_chromosome(row, chromosome)
 
-            population.append(first_chromosome)
-            population.append(second_chromosome)
+        return offspring_rows, offspring, parents[:self._number_of_offspring]
 
+    def __codon_generational_step(self, population: List[Chromosome]) -> List[Chromosome]:
+        """
+        The generational step on the codon matrix. The codon population is kept in the order of the population from
+        one generation to the next, and only rebuilt from the chromosomes if the population was replaced in between,
+        e.g. by immigrants. The survivors are selected on the cost vectors; a surviving offspring without a chromosome
+        gets one built from its row, with the phenotype and a clone of the timetable of its parent.
+        :param population: The population, sorted.
+        :return: The next population, sorted.
+        """
+        from src.common.codon_population import CodonPopulation
+
+        if self._codon_population_of is not population:
+            self._codon_population = CodonPopulation.from_chromosomes(population)
+
+        offspring_rows, offspring, parents = self.__reproduce_codons(population)
+
+        candidates: CodonPopulation = offspring_rows
+        number_of_parents: int = 0
+        if self._survivor_selection == PLUS_SELECTION:
+            candidates = CodonPopulation.concatenate([self._codon_population, offspring_rows])
+            number_of_parents = len(population)
+
+        survivors: 'np.ndarray' = candidates.get_best(self._population_size)
+        next_population: List[Chromosome] = []
+
+        row: int
+        for row in survivors.tolist():
+            if row < number_of_parents:
+                next_population.append(population[row])
+                continue
+
+            chromosome: Optional[Chromosome] = offspring[row - number_of_parents]
+            if chromosome is None:
+                chromosome = candidates.get_chromosome(row, parents[row - number_of_parents])
+                chromosome.timetable = chromosome.timetable.clone() if chromosome.timetable else None
+            next_population.append(chromosome)
+
+        self._codon_population = candidates.take(survivors)
+        self._codon_population_of = next_population
+        return next_population
+
+    def run(
+            self,
+            initial_timetable: Timetable,
+            number_of_perturbatives_to_select=1,
+            budget: Optional[Budget] = None,
+            checkpoint: Optional[Checkpoint] = None
+    ) -> Union[List[Chromosome], Chromosome]:
+        """
+        Evolves a population of perturbative heuristics. With a budget, the generations stop as soon as it is exhausted
+        and the best chromosomes found so far are returned; the initial population is always evaluated in full. With a
+        checkpoint, the run resumes from the snapshot it read, if any, and saves snapshots between generations.
+        :param initial_timetable: The timetable to evaluate.
+        :param number_of_perturbatives_to_select: The number of chromosomes to return.
+        :param budget: The time and evaluation budget of the run, if any.
+        :param checkpoint: The checkpoint of the run, if any.
+        :return: The best chromosome, or the best chromosomes if more than one is selected.
+        """
+        if self._survivor_selection == COMMA_SELECTION and self._number_of_offspring < self._population_size:
+            raise ValueError("(mu, lambda) survivor selection needs at least as many offspring as the population size")
+
+        self._checkpoint = checkpoint
+        state: Optional[CheckpointState] = checkpoint.pop_state(CHECKPOINT_STAGE) if checkpoint is not None else None
+        try:
+            with self.evaluation(
+                    initial_timetable,
+                    state['base_seed'] if state is not None and state['base_seed'] is not None else None,
+                    budget=budget
+            ):
+                return self.__run(initial_timetable, number_of_perturbatives_to_select, state)
+        finally:
+            self._checkpoint = None
+
+    @contextmanager
+    def evaluation(
+            self,
+            initial_timetable: Timetable,
+            base_seed: Optional[int] = None,
+            number_of_workers: Optional[int] = None,
+            budget: Optional[Budget] = None
+    ) -> Iterator[ParallelEvaluator]:
+        """
+        Opens the context chromosomes are evaluated in: a ParallelEvaluator, which seeds every evaluation from the base
+        seed, so the results are the same for any number of workers, none included. initialize_population and evolve
+        can only be called within it, and count their evaluations against the budget, if any, which evolve stops at.
+        :param initial_timetable: The timetable to evaluate.
+        :param base_seed: The base seed of the evaluations, or None to draw it from the random generator.
+        :param number_of_workers: The number of worker processes, or None for the number of the instance.
+        :param budget: The time and evaluation budget of the context, if any.
+        :return: The evaluator.
+        """
+        self._base_seed = random.getrandbits(64) if base_seed is None else base_seed
+        self._budget = budget
+        try:
+            with ParallelEvaluator(
+                    initial_timetable,
+                    self._number_of_workers if number_of_workers is None else number_of_workers,
+                    self._base_seed,
+                    self.fitness_cache
+            ) as evaluator:
+                self._evaluator = evaluator
+                yield evaluator
+        finally:
+            self._evaluator = None
+            self._base_seed = None
+            self._budget = None
+
+    def initialize_population(self) -> List[Chromosome]:
+        """
+        Generates, maps and evaluates the initial population, within an evaluation context.
+        :return: The initial population, sorted.
+        """
+        self._rng = _create_rng(random.getrandbits(64)) if self._codon_matrix else None
+        population: List[Chromosome] = self.__generate_initial_population()
+
+        chromosome: Chromosome
+        for chromosome in population:
+            self.__map(chromosome)
+        self.__evaluate(population)
+
+        if self._rng is None:
             population.sort(key=lambda individual: (individual.hard_constraints_cost, individual.soft_constraints_cost))
-            population = population[:self._population_size]
+            return population
+
+        index: int
+        for index, chromosome in enumerate(population):
+            self._codon_population.set_chromosome(index, chromosome)
+
+        order: 'np.ndarray' = self._codon_population.get_best(len(population))
+        self._codon_population = self._codon_population.take(order)
+        self._codon_population_of = [population[index] for index in order.tolist()]
+        return self._codon_population_of
+
+    def evolve(
+            self,
+            population: List[Chromosome],
+            best_solution: Chromosome,
+            initial_timetable: Timetable,
+            number_of_generations: int,
+            first_generation: int = 0
+    ) -> Tuple[List[Chromosome], Chromosome]:
+        """
+        Evolves a sorted population for a number of generations, within an evaluation context, until a solution
+        without violations is found or until the budget of the run is exhausted.
+        :param population: The population, sorted.
+        :param best_solution: The best solution found so far.
+        :param initial_timetable: The timetable to evaluate.
+        :param number_of_generations: The number of generations.
+        :param first_generation: The number of generations already run, recorded in checkpoints.
+        :return: The population, sorted, and the best solution found so far.
+        """
+        num_of_generation: int = 0
+
+        while (
+                num_of_generation < number_of_generations and
+                (not (best_solution.hard_constraints_cost == 0 and best_solution.soft_constraints_cost == 0)) and
+                not self.__is_budget_exhausted()
+        ):
+            if self._checkpoint is not None and self._checkpoint.is_due():
+                self.__save_population(
+                    population,
+                    best_solution,
+                    initial_timetable,
+                    first_generation + num_of_generation
+                )
+
+            if self._survivor_selection == STEADY_STATE:
+                population = self.__steady_state_step(population)
+            else:
+                population = self.__generational_step(population)
 
             if population[0].hard_constraints_cost < best_solution.hard_constraints_cost:
                 best_solution = population[0].clone()
@@ -161,6 +679,161 @@ class GrammaticalEvolution:
 
             num_of_generation += 1
 
+        return population, best_solution
+
+    def add_immigrants(self, population: List[Chromosome], immigrants: List[Chromosome]) -> List[Chromosome]:
+        """
+        Adds chromosomes from another population, which replace the worst ones.
+        :param population: The population, sorted.
+        :param immigrants: The evaluated chromosomes to add.
+        :return: The population, sorted.
+        """
+        population = population + immigrants
+        population.sort(key=lambda individual: (individual.hard_constraints_cost, individual.soft_constraints_cost))
+        return population[:self._population_size]
+
+    def __get_checkpoint_state(self, initial_timetable: Timetable, generation: int) -> CheckpointState:
+        """
+        Returns the part of a checkpoint state that does not depend on the kind of population.
+        :param initial_timetable: The timetable to evaluate.
+        :param generation: The number of generations run.
+        :return: The state.
+        """
+        return {
+            'problem_instance_index': initial_timetable.problem.problem_instance_index,
+            'initial_timetable_hash': initial_timetable.hash,
+            'generation': generation,
+            'random_state': random.getstate(),
+            'numpy_state': self._rng.bit_generator.state if self._rng is not None else None,
+            'base_seed': self._base_seed,
+            'neutral_offspring': self.neutral_offspring
+        }
+
+    def __save_population(
+            self,
+            population: List[Chromosome],
+            best_solution: Chromosome,
+            initial_timetable: Timetable,
+            generation: int
+    ) -> None:
+        """
+        Saves a checkpoint of a sorted population. Steady-state breeding changes population members in place, so a
+        chromosome may appear in the population more than once and be the best solution too; every chromosome is
+        encoded once, with the positions it appears at, so that a resumed run shares them in the same way.
+        :param population: The population, sorted.
+        :param best_solution: The best solution found so far.
+        :param initial_timetable: The timetable to evaluate.
+        :param generation: The number of generations run.
+        :return: None.
+        """
+        indices: Dict[int, int] = {}
+        chromosomes: List[EncodedChromosome] = []
+
+        chromosome: Chromosome
+        for chromosome in population:
+            if id(chromosome) not in indices:
+                indices[id(chromosome)] = len(chromosomes)
+                chromosomes.append(encode_chromosome(chromosome))
+
+        state: CheckpointState = self.__get_checkpoint_state(initial_timetable, generation)
+        state['population'] = chromosomes
+        state['population_indices'] = [indices[id(chromosome)] for chromosome in population]
+        state['best_solution'] = encode_chromosome(best_solution) if id(best_solution) not in indices else None
+        state['best_solution_index'] = indices.get(id(best_solution))
+        self._checkpoint.save(CHECKPOINT_STAGE, state)
+
+    def __save_heap_population(self, population: Population, initial_timetable: Timetable, generation: int) -> None:
+        """
+        Saves a checkpoint of a heap population.
+        :param population: The population.
+        :param initial_timetable: The timetable to evaluate.
+        :param generation: The number of generations run.
+        :return: None.
+        """
+        entries, number_of_insertions = population.get_entries()
+
+        state: CheckpointState = self.__get_checkpoint_state(initial_timetable, generation)
+        state['population'] = [encode_chromosome(chromosome) for _, chromosome in entries]
+        state['insertions'] = [insertion for insertion, _ in entries]
+        state['number_of_insertions'] = number_of_insertions
+        self._checkpoint.save(CHECKPOINT_STAGE, state)
+
+    def __restore_checkpoint_state(self, state: CheckpointState, initial_timetable: Timetable) -> List[Chromosome]:
+        """
+        Restores the random streams and counters of a checkpoint state and decodes its chromosomes.
+        :param state: The state.
+        :param initial_timetable: The timetable to evaluate.
+        :return: The chromosomes of the state.
+        """
+        problem: Problem = initial_timetable.problem
+
+        if state['problem_instance_index'] != problem.problem_instance_index:
+            raise ValueError(f"The checkpoint is of problem instance {state['problem_instance_index']}")
+        if state['initial_timetable_hash'] != initial_timetable.hash:
+            raise ValueError("The checkpoint was taken in a run from another initial timetable")
+
+        random.setstate(state['random_state'])
+        self._rng = None
+        if state['numpy_state'] is not None:
+            self._rng = _create_rng()
+            self._rng.bit_generator.state = state['numpy_state']
+        self.neutral_offspring = state['neutral_offspring']
+
+        return [decode_chromosome(problem, chromosome) for chromosome in state['population']]
+
+    def __run(
+            self,
+            initial_timetable: Timetable,
+            number_of_perturbatives_to_select: int = 1,
+            state: Optional[CheckpointState] = None
+    ) -> Union[List[Chromosome], Chromosome]:
+        problem: Problem = initial_timetable.problem
+        chromosomes: List[Chromosome]
+
+        if self._heap_population:
+            if state is None:
+                return self.__evolve_heap_population(
+                    Population(self._population_size, self.initialize_population()),
+                    initial_timetable,
+                    number_of_perturbatives_to_select
+                )
+
+            chromosomes = self.__restore_checkpoint_state(state, initial_timetable)
+            return self.__evolve_heap_population(
+                Population.restore(
+                    self._population_size,
+                    list(zip(state['insertions'], chromosomes)),
+                    state['number_of_insertions']
+                ),
+                initial_timetable,
+                number_of_perturbatives_to_select,
+                state['generation']
+            )
+
+        population: List[Chromosome]
+        best_solution: Chromosome
+        first_generation: int = 0
+
+        if state is None:
+            population = self.initialize_population()
+            best_solution = population[0]
+        else:
+            chromosomes = self.__restore_checkpoint_state(state, initial_timetable)
+            population = [chromosomes[index] for index in state['population_indices']]
+            best_solution = (
+                decode_chromosome(problem, state['best_solution'])
+                if state['best_solution_index'] is None else chromosomes[state['best_solution_index']]
+            )
+            first_generation = state['generation']
+
+        population, best_solution = self.evolve(
+            population,
+            best_solution,
+            initial_timetable,
+            self._max_num_of_generations - first_generation,
+            first_generation
+        )
+
         if number_of_perturbatives_to_select == 1:
             return best_solution
         else:
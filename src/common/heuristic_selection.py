@@ -0,0 +1,279 @@
+import math
+import random
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from src.common.config import HEURISTIC_SELECTION, HARD_CONSTRAINT_WEIGHT, EPSILON, UCB_EXPLORATION, \
+    SOFTMAX_TEMPERATURE, SLIDING_WINDOW_SIZE
+
+EPSILON_GREEDY: str = 'epsilon-greedy'
+UCB1: str = 'ucb1'
+SOFTMAX: str = 'softmax'
+SLIDING_WINDOW: str = 'sliding-window'
+
+
+def get_reward(current_cost: Tuple[int, int], new_cost: Tuple[int, int], elapsed_time: float) -> float:
+    """
+    Returns the credit of a low-level heuristic for one application: the decrease of the constraints cost, a hard
+    constraint weighing HARD_CONSTRAINT_WEIGHT soft ones, per millisecond of CPU time spent applying and evaluating it.
+    Applications that do not improve the cost earn nothing, however long they took.
+    :param current_cost: Tuple[int, int], the (hard, soft) constraints cost before the application
+    :param new_cost: Tuple[int, int], the (hard, soft) constraints cost after it
+    :param elapsed_time: float, the CPU time of the application in seconds
+    :return: float
+    """
+    improvement: int = (
+            HARD_CONSTRAINT_WEIGHT * (current_cost[0] - new_cost[0]) +
+            current_cost[1] - new_cost[1]
+    )
+    return max(improvement, 0) / max(1000 * elapsed_time, 1e-3)
+
+
+def _get_best(values: List[float]) -> int:
+    """
+    Helper function returning the index of a largest value, chosen at random among ties.
+    :param values: List[float]
+    :return: int
+    """
+    best_value: float = max(values)
+    return random.choice([index for index, value in enumerate(values) if value == best_value])
+
+
+class HeuristicSelector(ABC):
+    """
+    A multi-armed bandit choosing which of a fixed list of low-level heuristics to apply next, from the rewards earned
+    by its previous choices. Rewards are only compared relative to the largest one seen so far, so their scale does not
+    matter. Recording a reward takes O(1); choosing a heuristic takes O(number of heuristics), and heuristics that were
+    never tried are chosen first.
+    """
+
+    def __init__(self, number_of_heuristics: int):
+        self.number_of_heuristics: int = number_of_heuristics
+        self.counts: List[int] = [0] * number_of_heuristics
+        self.values: List[float] = [0.0] * number_of_heuristics
+        self.number_of_updates: int = 0
+        self.max_reward: float = 0.0
+
+    def _get_untried(self) -> Optional[int]:
+        """
+        Helper function returning a heuristic that has no rewards yet, if any.
+        :return: Optional[int]
+        """
+        untried: List[int] = [heuristic for heuristic, count in enumerate(self.counts) if count == 0]
+        return random.choice(untried) if untried else None
+
+    def _get_normalized_value(self, heuristic: int) -> float:
+        """
+        Helper function returning the mean reward of a heuristic relative to the largest reward seen.
+        :param heuristic: int
+        :return: float
+        """
+        return self.values[heuristic] / self.max_reward if self.max_reward > 0 else 0.0
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Returns what the selector learned, for a checkpoint.
+        :return: Dict[str, Any]
+        """
+        return {
+            'selector': type(self).__name__,
+            'counts': list(self.counts),
+            'values': list(self.values),
+            'number_of_updates': self.number_of_updates,
+            'max_reward': self.max_reward
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restores what the selector learned from a state get_state returned, so that it makes the choices it would have
+        made had it never been interrupted.
+        :param state: Dict[str, Any]
+        :return: None
+        """
+        if state['selector'] != type(self).__name__ or len(state['counts']) != self.number_of_heuristics:
+            raise ValueError(
+                f"The state is of a {state['selector']} with {len(state['counts'])} heuristics, not of a "
+                f"{type(self).__name__} with {self.number_of_heuristics}"
+            )
+
+        self.counts = list(state['counts'])
+        self.values = list(state['values'])
+        self.number_of_updates = state['number_of_updates']
+        self.max_reward = state['max_reward']
+
+    @abstractmethod
+    def select(self) -> int:
+        """
+        Chooses the heuristic to apply next.
+        :return: int, its index
+        """
+
+    @abstractmethod
+    def update(self, heuristic: int, reward: float) -> None:
+        """
+        Records the reward a heuristic earned.
+        :param heuristic: int
+        :param reward: float
+        :return: None
+        """
+
+
+class MeanRewardSelector(HeuristicSelector, ABC):
+    """
+    A heuristic selector whose value of a heuristic is the mean of all the rewards it earned, kept incrementally.
+    """
+
+    def update(self, heuristic: int, reward: float) -> None:
+        self.counts[heuristic] += 1
+        self.values[heuristic] += (reward - self.values[heuristic]) / self.counts[heuristic]
+        self.number_of_updates += 1
+        self.max_reward = max(self.max_reward, reward)
+
+
+class EpsilonGreedySelector(MeanRewardSelector):
+    """
+    Chooses a random heuristic with probability epsilon and the one of largest mean reward otherwise.
+    """
+
+    def __init__(self, number_of_heuristics: int, epsilon: float = EPSILON):
+        super().__init__(number_of_heuristics)
+        self.epsilon: float = epsilon
+
+    def select(self) -> int:
+        untried: Optional[int] = self._get_untried()
+        if untried is not None:
+            return untried
+
+        if random.random() < self.epsilon:
+            return random.randrange(self.number_of_heuristics)
+
+        return _get_best(self.values)
+
+
+class UCB1Selector(MeanRewardSelector):
+    """
+    Chooses the heuristic of largest upper confidence bound: its normalized mean reward plus an exploration bonus that
+    grows with the number of choices and shrinks with the number of times it was chosen.
+    """
+
+    def __init__(self, number_of_heuristics: int, exploration: float = UCB_EXPLORATION):
+        super().__init__(number_of_heuristics)
+        self.exploration: float = exploration
+
+    def select(self) -> int:
+        untried: Optional[int] = self._get_untried()
+        if untried is not None:
+            return untried
+
+        logarithm: float = math.log(self.number_of_updates)
+        return _get_best([
+            self._get_normalized_value(heuristic) + self.exploration * math.sqrt(logarithm / self.counts[heuristic])
+            for heuristic in range(self.number_of_heuristics)
+        ])
+
+
+class SoftmaxSelector(MeanRewardSelector):
+    """
+    Chooses a heuristic with probability proportional to the exponential of its normalized mean reward divided by the
+    temperature: the lower the temperature, the greedier the choice.
+    """
+
+    def __init__(self, number_of_heuristics: int, temperature: float = SOFTMAX_TEMPERATURE):
+        super().__init__(number_of_heuristics)
+        self.temperature: float = temperature
+
+    def select(self) -> int:
+        untried: Optional[int] = self._get_untried()
+        if untried is not None:
+            return untried
+
+        weights: List[float] = [
+            math.exp((self._get_normalized_value(heuristic) - 1) / self.temperature)
+            for heuristic in range(self.number_of_heuristics)
+        ]
+        threshold: float = random.random() * sum(weights)
+
+        for heuristic, weight in enumerate(weights):
+            threshold -= weight
+            if threshold < 0:
+                return heuristic
+
+        return self.number_of_heuristics - 1
+
+
+class SlidingWindowSelector(UCB1Selector):
+    """
+    UCB1 on the rewards of the last window_size choices only, so that the choice follows heuristics whose rewards
+    change as the search goes on. The window's sums and counts are updated as rewards enter and leave it.
+    """
+
+    def __init__(
+            self,
+            number_of_heuristics: int,
+            window_size: int = SLIDING_WINDOW_SIZE,
+            exploration: float = UCB_EXPLORATION
+    ):
+        super().__init__(number_of_heuristics, exploration)
+        self.window_size: int = window_size
+        self._window: Deque[Tuple[int, float]] = deque()
+        self._sums: List[float] = [0.0] * number_of_heuristics
+
+    def _add(self, heuristic: int, reward: float, count: int) -> None:
+        """
+        Helper function adding a reward to, or with a count of -1 removing it from, the window's statistics.
+        :param heuristic: int
+        :param reward: float
+        :param count: int
+        :return: None
+        """
+        self.counts[heuristic] += count
+        self._sums[heuristic] += reward
+        self.values[heuristic] = self._sums[heuristic] / self.counts[heuristic] if self.counts[heuristic] > 0 else 0.0
+
+    def update(self, heuristic: int, reward: float) -> None:
+        self._window.append((heuristic, reward))
+        self._add(heuristic, reward, 1)
+
+        if len(self._window) > self.window_size:
+            oldest_heuristic, oldest_reward = self._window.popleft()
+            self._add(oldest_heuristic, -oldest_reward, -1)
+
+        self.number_of_updates = len(self._window)
+        self.max_reward = max(self.max_reward, reward)
+
+    def get_state(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = super().get_state()
+        state['window'] = list(self._window)
+        state['sums'] = list(self._sums)
+        return state
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        super().set_state(state)
+        self._window = deque(state['window'])
+        self._sums = list(state['sums'])
+
+
+def create_selector(
+        number_of_heuristics: int,
+        name: Optional[str] = HEURISTIC_SELECTION
+) -> Optional[HeuristicSelector]:
+    """
+    Creates a heuristic selector from its name, with the parameters of the config.
+    :param number_of_heuristics: int
+    :param name: Optional[str], one of 'epsilon-greedy', 'ucb1', 'softmax' and 'sliding-window', or None to keep the
+    score-based selection of the hyper-heuristics
+    :return: Optional[HeuristicSelector]
+    """
+    if name is None:
+        return None
+    if name == EPSILON_GREEDY:
+        return EpsilonGreedySelector(number_of_heuristics)
+    if name == UCB1:
+        return UCB1Selector(number_of_heuristics)
+    if name == SOFTMAX:
+        return SoftmaxSelector(number_of_heuristics)
+    if name == SLIDING_WINDOW:
+        return SlidingWindowSelector(number_of_heuristics)
+
+    raise ValueError(f"Unknown heuristic selection: {name}")
@@ -0,0 +1,275 @@
+import math
+import random
+import time
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from typing import List, Optional, Tuple, Union
+
+from src.common.budget import Budget
+from src.common.chromosome import Chromosome, EncodedChromosome, decode_chromosome, encode_chromosome
+from src.common.config import NUMBER_OF_ISLANDS, MIGRATION_INTERVAL, NUMBER_OF_MIGRANTS, MIGRATION_TOPOLOGY, \
+    MAX_GENERATIONS
+from src.common.grammatical_evolution import GrammaticalEvolution
+from src.common.problem import Problem
+from src.common.timetable import Timetable
+from src.common.worker_pool import get_derived_seed, get_worker_problem, get_worker_state, initialize_worker
+
+RING_TOPOLOGY: str = 'ring'
+RANDOM_TOPOLOGY: str = 'random'
+
+IslandReport = Tuple[int, int, List[EncodedChromosome], int]
+
+
+def _run_island(
+        connection: Connection,
+        grammatical_evolution: GrammaticalEvolution,
+        problem_instance_index: int,
+        initial_timetable: bytes,
+        seed: int,
+        number_of_generations: int,
+        migration_interval: int,
+        number_of_migrants: int,
+        number_of_perturbatives_to_select: int,
+        time_limit: Optional[float],
+        evaluation_limit: Optional[int]
+) -> None:
+    """
+    Helper function evolving one island in its own process. After every migration interval, or as soon as the island's
+    budget is exhausted, the island reports its best cost, emigrants and number of evaluations and waits for its
+    immigrants, or for None to stop and send back its best chromosomes. The island evaluates its chromosomes in its own
+    process, as daemonic processes cannot start worker processes.
+    :param connection: Connection
+    :param grammatical_evolution: GrammaticalEvolution
+    :param problem_instance_index: int
+    :param initial_timetable: bytes, the encoded initial timetable
+    :param seed: int
+    :param number_of_generations: int
+    :param migration_interval: int
+    :param number_of_migrants: int
+    :param number_of_perturbatives_to_select: int
+    :param time_limit: Optional[float], the seconds left to the run
+    :param evaluation_limit: Optional[int], the island's share of the evaluations left to the run
+    :return: None
+    """
+    random.seed(seed)
+    budget: Budget = Budget(time_limit, evaluation_limit)
+
+    initialize_worker(problem_instance_index, Timetable.decode, initial_timetable)
+    problem: Problem = get_worker_problem()
+    timetable: Timetable = get_worker_state()
+
+    with grammatical_evolution.evaluation(timetable, number_of_workers=0, budget=budget):
+        population: List[Chromosome] = grammatical_evolution.initialize_population()
+        best_solution: Chromosome = population[0]
+        generation: int = 0
+
+        while True:
+            population, best_solution = grammatical_evolution.evolve(
+                population,
+                best_solution,
+                timetable,
+                min(migration_interval, number_of_generations - generation)
+            )
+            generation += migration_interval
+
+            connection.send((
+                best_solution.hard_constraints_cost,
+                best_solution.soft_constraints_cost,
+                [encode_chromosome(chromosome) for chromosome in population[:number_of_migrants]],
+                budget.evaluations
+            ))
+
+            immigrants: Optional[List[EncodedChromosome]] = connection.recv()
+            if immigrants is None:
+                break
+
+            population = grammatical_evolution.add_immigrants(
+                population,
+                [decode_chromosome(problem, immigrant) for immigrant in immigrants]
+            )
+
+    connection.send(
+        [encode_chromosome(best_solution)] +
+        [encode_chromosome(chromosome) for chromosome in population[:number_of_perturbatives_to_select]]
+    )
+    connection.close()
+
+
+class IslandModel:
+    """
+    Grammatical evolution of several populations (islands) in separate processes, each with its own random stream and
+    copy of the problem. Every migration interval, each island sends copies of its best chromosomes, with their
+    encoded timetables, to one other island, where they replace the worst ones: the next island in a ring topology,
+    or a random other island, drawn from the coordinator's seeded stream, in a random topology.
+
+    Migration goes through the coordinating process, which records the best cost of every island and the global best
+    cost after every interval, so a run is reproducible for a given seed.
+
+    With a budget, every island stops at its time limit and at its share of the evaluation limit, and the coordinator
+    counts the evaluations of the islands against the budget and stops the run after the interval in which the budget
+    is exhausted or cancelled. Island runs are not checkpointed.
+    """
+
+    def __init__(
+            self,
+            grammatical_evolution: GrammaticalEvolution,
+            number_of_islands: int = NUMBER_OF_ISLANDS,
+            migration_interval: int = MIGRATION_INTERVAL,
+            number_of_migrants: int = NUMBER_OF_MIGRANTS,
+            topology: str = MIGRATION_TOPOLOGY,
+            number_of_generations: int = MAX_GENERATIONS
+    ):
+        if number_of_islands < 1:
+            raise ValueError("The island model needs at least one island")
+        if migration_interval < 1:
+            raise ValueError("The migration interval must be at least one generation")
+        if topology not in (RING_TOPOLOGY, RANDOM_TOPOLOGY):
+            raise ValueError(f"Unknown migration topology: {topology}")
+
+        self.grammatical_evolution: GrammaticalEvolution = grammatical_evolution
+        self.number_of_islands: int = number_of_islands
+        self.migration_interval: int = migration_interval
+        self.number_of_migrants: int = number_of_migrants
+        self.topology: str = topology
+        self.number_of_generations: int = number_of_generations
+
+        self.elapsed_times: List[float] = []
+        self.island_best_costs: List[List[Tuple[int, int]]] = []
+        self.global_best_costs: List[Tuple[int, int]] = []
+
+    def _get_destinations(self, topology_random: random.Random) -> List[int]:
+        """
+        Helper function to get the island the emigrants of each island go to.
+        :param topology_random: random.Random
+        :return: List[int]
+        """
+        if self.topology == RING_TOPOLOGY:
+            return [(island + 1) % self.number_of_islands for island in range(self.number_of_islands)]
+
+        return [
+            topology_random.choice([other for other in range(self.number_of_islands) if other != island])
+            for island in range(self.number_of_islands)
+        ]
+
+    def _get_evaluation_limits(self, budget: Optional[Budget]) -> List[Optional[int]]:
+        """
+        Helper function to share the evaluations left to a budget between the islands.
+        :param budget: Optional[Budget]
+        :return: List[Optional[int]]
+        """
+        if budget is None or budget.evaluation_limit is None:
+            return [None] * self.number_of_islands
+
+        evaluations: int = max(0, budget.evaluation_limit - budget.evaluations)
+        return [
+            evaluations // self.number_of_islands + (1 if island < evaluations % self.number_of_islands else 0)
+            for island in range(self.number_of_islands)
+        ]
+
+    def run(
+            self,
+            initial_timetable: Timetable,
+            number_of_perturbatives_to_select: int = 1,
+            budget: Optional[Budget] = None
+    ) -> Union[List[Chromosome], Chromosome]:
+        """
+        Evolves the islands and returns the best chromosome found on any of them, or the best chromosomes of the final
+        populations if more than one is selected. The initial populations are always evaluated in full.
+        :param initial_timetable: Timetable
+        :param number_of_perturbatives_to_select: int
+        :param budget: Optional[Budget], the time and evaluation budget of the run
+        :return: Union[List[Chromosome], Chromosome]
+        """
+        base_seed: int = random.getrandbits(64)
+        topology_random: random.Random = random.Random(base_seed)
+        number_of_epochs: int = max(1, math.ceil(self.number_of_generations / self.migration_interval))
+        time_limit: Optional[float] = None if budget is None else budget.get_remaining_time()
+        evaluation_limits: List[Optional[int]] = self._get_evaluation_limits(budget)
+        evaluations: List[int] = [0] * self.number_of_islands
+        start_time: float = time.time()
+
+        self.elapsed_times = []
+        self.island_best_costs = []
+        self.global_best_costs = []
+
+        connections: List[Connection] = []
+        processes: List[Process] = []
+        for island in range(self.number_of_islands):
+            connection, island_connection = Pipe()
+            process: Process = Process(
+                target=_run_island,
+                args=(
+                    island_connection,
+                    self.grammatical_evolution,
+                    initial_timetable.problem.problem_instance_index,
+                    initial_timetable.encode(),
+                    get_derived_seed(base_seed, island),
+                    self.number_of_generations,
+                    self.migration_interval,
+                    self.number_of_migrants,
+                    number_of_perturbatives_to_select,
+                    time_limit,
+                    evaluation_limits[island]
+                ),
+                daemon=True
+            )
+            process.start()
+            island_connection.close()
+            connections.append(connection)
+            processes.append(process)
+
+        completed: bool = False
+        try:
+            for epoch in range(number_of_epochs):
+                reports: List[IslandReport] = [connection.recv() for connection in connections]
+
+                self.elapsed_times.append(time.time() - start_time)
+                self.island_best_costs.append([(hard, soft) for hard, soft, _, _ in reports])
+                self.global_best_costs.append(min(self.island_best_costs[-1]))
+
+                if budget is not None:
+                    budget.record_evaluations(sum(report[3] for report in reports) - sum(evaluations))
+                evaluations = [report[3] for report in reports]
+
+                if (
+                        epoch == number_of_epochs - 1 or
+                        self.global_best_costs[-1] == (0, 0) or
+                        (budget is not None and budget.is_exhausted())
+                ):
+                    for connection in connections:
+                        connection.send(None)
+                    break
+
+                immigrants: List[List[EncodedChromosome]] = [[] for _ in range(self.number_of_islands)]
+                if self.number_of_islands > 1:
+                    for island, destination in enumerate(self._get_destinations(topology_random)):
+                        immigrants[destination].extend(reports[island][2])
+
+                for connection, island_immigrants in zip(connections, immigrants):
+                    connection.send(island_immigrants)
+
+            results: List[List[EncodedChromosome]] = [connection.recv() for connection in connections]
+            completed = True
+        finally:
+            # If an island failed, the others may be waiting for immigrants that never come: stop them all.
+            for connection in connections:
+                connection.close()
+            for process in processes:
+                if not completed:
+                    process.terminate()
+                process.join()
+
+        problem: Problem = initial_timetable.problem
+        best_solution: Chromosome = min(
+            (decode_chromosome(problem, result[0]) for result in results),
+            key=lambda chromosome: (chromosome.hard_constraints_cost, chromosome.soft_constraints_cost)
+        )
+
+        if number_of_perturbatives_to_select == 1:
+            return best_solution
+
+        population: List[Chromosome] = [
+            decode_chromosome(problem, encoded_chromosome) for result in results for encoded_chromosome in result[1:]
+        ]
+        population.sort(key=lambda individual: (individual.hard_constraints_cost, individual.soft_constraints_cost))
+        return population[:number_of_perturbatives_to_select]
@@ -0,0 +1,315 @@
+import random
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from src.common.config import MOVE_SAMPLE_SIZE, MOVE_SCAN_LIMIT
+from src.common.constraints_validator import DeltaEvaluator, SlotChanges
+from src.common.course import Course
+from src.common.room import Room
+from src.common.timetable import Timetable
+
+
+class Move:
+    """
+    A proposed change to a timetable that has not been applied: the slots it touches mapped to the course room pairs
+    they hold afterwards, and the name of the neighbourhood it was drawn from.
+    """
+
+    __slots__ = ('name', 'changes')
+
+    def __init__(self, name: str, changes: SlotChanges):
+        self.name: str = name
+        self.changes: SlotChanges = changes
+
+
+MoveProposer = Callable[[Timetable, DeltaEvaluator], Optional[Move]]
+Neighbourhood = Callable[[Timetable, DeltaEvaluator], Iterator[Move]]
+
+def apply_move(timetable: Timetable, move: Move, evaluator: Optional[DeltaEvaluator] = None) -> None:
+    """
+    Applies a move to a timetable, applying it to the evaluator's copy of the schedule as well when one is given.
+    :param timetable: Timetable
+    :param move: Move
+    :param evaluator: Optional[DeltaEvaluator], the evaluator returned by the timetable's get_delta_evaluator
+    :return: None
+    """
+    if evaluator is not None:
+        evaluator.apply(move.changes)
+
+    for (day, period), course_room_pairs in move.changes.items():
+        timetable.set_course_room_pairs(day, period, course_room_pairs)
+
+
+def _get_lectures(timetable: Timetable) -> List[Tuple[int, int, int]]:
+    """
+    Helper function to list the (day, period, index) position of every scheduled lecture.
+    :param timetable: Timetable
+    :return: List[Tuple[int, int, int]]
+    """
+    return [
+        (day, period, index)
+        for day in range(len(timetable.schedule))
+        for period in range(len(timetable.schedule[day]))
+        for index in range(len(timetable.schedule[day][period].course_room_pairs))
+    ]
+
+
+def _get_single_move(
+        timetable: Timetable,
+        evaluator: DeltaEvaluator,
+        day: int,
+        period: int,
+        index: int,
+        new_day: int,
+        new_period: int
+) -> Move:
+    """
+    Helper function to describe moving a lecture to another slot. The lecture keeps its room if it is free and large
+    enough there, otherwise the room allocator picks one.
+    :param timetable: Timetable
+    :param evaluator: DeltaEvaluator
+    :param day: int
+    :param period: int
+    :param index: int
+    :param new_day: int
+    :param new_period: int
+    :return: Move
+    """
+    course, room = timetable.schedule[day][period].course_room_pairs[index]
+    new_room: Room = timetable.model.rooms[
+        timetable.problem.room_allocator.get_room(
+            course.index,
+            room.index,
+            timetable.get_room_occupancy(new_day, new_period)
+        )
+    ]
+
+    changes: SlotChanges = evaluator.get_removal_changes(day, period, index)
+    evaluator.get_insertion_changes(new_day, new_period, (course, new_room), changes)
+    return Move('single_move', changes)
+
+
+def _get_swap_lectures(
+        evaluator: DeltaEvaluator,
+        first_lecture: Tuple[int, int, int],
+        second_lecture: Tuple[int, int, int]
+) -> Move:
+    """
+    Helper function to describe exchanging two lectures, with their rooms, between their slots.
+    :param evaluator: DeltaEvaluator
+    :param first_lecture: Tuple[int, int, int]
+    :param second_lecture: Tuple[int, int, int]
+    :return: Move
+    """
+    first_day, first_period, first_index = first_lecture
+    second_day, second_period, second_index = second_lecture
+
+    first_course_room_pairs: List[Tuple[Course, Room]] = list(
+        evaluator.schedule[first_day][first_period].course_room_pairs
+    )
+    second_course_room_pairs: List[Tuple[Course, Room]] = list(
+        evaluator.schedule[second_day][second_period].course_room_pairs
+    )
+    first_course_room_pairs[first_index], second_course_room_pairs[second_index] = (
+        second_course_room_pairs[second_index],
+        first_course_room_pairs[first_index]
+    )
+
+    return Move(
+        'swap_lectures',
+        {(first_day, first_period): first_course_room_pairs, (second_day, second_period): second_course_room_pairs}
+    )
+
+
+def propose_single_move(timetable: Timetable, evaluator: DeltaEvaluator) -> Optional[Move]:
+    """
+    Proposes moving a random lecture to a random slot where it violates no hard constraint.
+    :param timetable: Timetable
+    :param evaluator: DeltaEvaluator
+    :return: Optional[Move], None if there is no such move
+    """
+    lectures: List[Tuple[int, int, int]] = _get_lectures(timetable)
+    if len(lectures) == 0:
+        return None
+
+    day, period, index = random.choice(lectures)
+    course: Course = timetable.schedule[day][period].course_room_pairs[index][0]
+    feasible_slots: List[Tuple[int, int]] = timetable.get_feasible_slots(course.course_id)
+    if len(feasible_slots) == 0:
+        return None
+
+    new_day, new_period = random.choice(feasible_slots)
+    return _get_single_move(timetable, evaluator, day, period, index, new_day, new_period)
+
+
+def propose_swap_slots(timetable: Timetable, evaluator: DeltaEvaluator) -> Optional[Move]:
+    """
+    Proposes exchanging the contents of two random slots.
+    :param timetable: Timetable
+    :param evaluator: DeltaEvaluator
+    :return: Optional[Move], None if both slots are the same
+    """
+    first_day: int = random.randint(0, len(timetable.schedule) - 1)
+    first_period: int = random.randint(0, len(timetable.schedule[first_day]) - 1)
+    second_day: int = random.randint(0, len(timetable.schedule) - 1)
+    second_period: int = random.randint(0, len(timetable.schedule[second_day]) - 1)
+
+    if (first_day, first_period) == (second_day, second_period):
+        return None
+
+    return Move('swap_slots', evaluator.get_swap_slots_changes(first_day, first_period, second_day, second_period))
+
+
+def propose_swap_lectures(timetable: Timetable, evaluator: DeltaEvaluator) -> Optional[Move]:
+    """
+    Proposes exchanging two random lectures of different slots.
+    :param timetable: Timetable
+    :param evaluator: DeltaEvaluator
+    :return: Optional[Move], None if both lectures are in the same slot
+    """
+    lectures: List[Tuple[int, int, int]] = _get_lectures(timetable)
+    if len(lectures) < 2:
+        return None
+
+    first_lecture, second_lecture = random.sample(lectures, 2)
+    if first_lecture[:2] == second_lecture[:2]:
+        return None
+
+    return _get_swap_lectures(evaluator, first_lecture, second_lecture)
+
+
+def get_single_move_neighbourhood(timetable: Timetable, evaluator: DeltaEvaluator) -> Iterator[Move]:
+    """
+    Yields every move of a lecture to a slot where it violates no hard constraint, lectures in random order.
+    :param timetable: Timetable
+    :param evaluator: DeltaEvaluator
+    :return: Iterator[Move]
+    """
+    lectures: List[Tuple[int, int, int]] = _get_lectures(timetable)
+    random.shuffle(lectures)
+
+    for day, period, index in lectures:
+        course: Course = timetable.schedule[day][period].course_room_pairs[index][0]
+        for new_day, new_period in timetable.get_feasible_slots(course.course_id):
+            yield _get_single_move(timetable, evaluator, day, period, index, new_day, new_period)
+
+
+def get_swap_slots_neighbourhood(timetable: Timetable, evaluator: DeltaEvaluator) -> Iterator[Move]:
+    """
+    Yields every exchange of two slots that are not both empty, in random order of the first slot.
+    :param timetable: Timetable
+    :param evaluator: DeltaEvaluator
+    :return: Iterator[Move]
+    """
+    slots: List[Tuple[int, int]] = [
+        (day, period) for day in range(len(timetable.schedule)) for period in range(len(timetable.schedule[day]))
+    ]
+    random.shuffle(slots)
+
+    for first_position, (first_day, first_period) in enumerate(slots):
+        for second_day, second_period in slots[first_position + 1:]:
+            if (
+                    len(timetable.schedule[first_day][first_period].course_room_pairs) > 0 or
+                    len(timetable.schedule[second_day][second_period].course_room_pairs) > 0
+            ):
+                yield Move(
+                    'swap_slots',
+                    evaluator.get_swap_slots_changes(first_day, first_period, second_day, second_period)
+                )
+
+
+def get_swap_lectures_neighbourhood(timetable: Timetable, evaluator: DeltaEvaluator) -> Iterator[Move]:
+    """
+    Yields every exchange of two lectures of different slots, in random order of the first lecture.
+    :param timetable: Timetable
+    :param evaluator: DeltaEvaluator
+    :return: Iterator[Move]
+    """
+    lectures: List[Tuple[int, int, int]] = _get_lectures(timetable)
+    random.shuffle(lectures)
+
+    for first_position, first_lecture in enumerate(lectures):
+        for second_lecture in lectures[first_position + 1:]:
+            if first_lecture[:2] != second_lecture[:2]:
+                yield _get_swap_lectures(evaluator, first_lecture, second_lecture)
+
+
+MOVE_PROPOSERS: Tuple[MoveProposer, ...] = (propose_single_move, propose_swap_slots, propose_swap_lectures)
+NEIGHBOURHOODS: Tuple[Neighbourhood, ...] = (
+    get_single_move_neighbourhood,
+    get_swap_lectures_neighbourhood,
+    get_swap_slots_neighbourhood
+)
+
+
+def sample_best_move(
+        timetable: Timetable,
+        evaluator: DeltaEvaluator,
+        k: int = MOVE_SAMPLE_SIZE,
+        proposers: Sequence[MoveProposer] = MOVE_PROPOSERS
+) -> Tuple[Optional[Move], Tuple[int, int]]:
+    """
+    Draws k moves from randomly chosen proposers, delta-scores them without applying any, and returns the one with the
+    smallest (hard, soft) cost change; the first drawn wins ties.
+    :param timetable: Timetable
+    :param evaluator: DeltaEvaluator
+    :param k: int
+    :param proposers: Sequence[MoveProposer]
+    :return: the best move, or None if no proposer produced one, and its (hard, soft) cost change
+    """
+    best_move: Optional[Move] = None
+    best_delta: Tuple[int, int] = (0, 0)
+
+    for _ in range(k):
+        move: Optional[Move] = random.choice(proposers)(timetable, evaluator)
+        if move is None:
+            continue
+
+        delta: Tuple[int, int] = evaluator.get_cost_delta(move.changes)
+        if best_move is None or delta < best_delta:
+            best_move = move
+            best_delta = delta
+
+    return best_move, best_delta
+
+
+def best_of_k_moves(timetable: Timetable) -> Timetable:
+    """
+    Low-level heuristic applying the best of MOVE_SAMPLE_SIZE sampled single moves, slot swaps and lecture swaps.
+    :param timetable: Timetable
+    :return: Timetable
+    """
+    evaluator: DeltaEvaluator = timetable.get_delta_evaluator()
+    move, _ = sample_best_move(timetable, evaluator)
+
+    if move is not None:
+        apply_move(timetable, move, evaluator)
+
+    return timetable
+
+
+def first_improvement_move(
+        timetable: Timetable,
+        neighbourhoods: Sequence[Neighbourhood] = NEIGHBOURHOODS,
+        scan_limit: Optional[int] = MOVE_SCAN_LIMIT
+) -> Timetable:
+    """
+    Low-level heuristic scanning the neighbourhoods in turn and applying the first move that lowers the (hard, soft)
+    cost, in the random order the neighbourhoods yield their moves. Without a scan limit every move is scored, so the
+    timetable is only left unchanged at a local optimum of all the neighbourhoods. With one, the scan becomes a sampled
+    scan of at most scan_limit moves per neighbourhood, which costs the same on instances of any size but may stop
+    short of an improving move.
+    :param timetable: Timetable
+    :param neighbourhoods: Sequence[Neighbourhood]
+    :param scan_limit: Optional[int], the number of moves scored per neighbourhood, or None to score them all
+    :return: Timetable
+    """
+    evaluator: DeltaEvaluator = timetable.get_delta_evaluator()
+
+    for neighbourhood in neighbourhoods:
+        for move in islice(neighbourhood(timetable, evaluator), scan_limit):
+            if evaluator.get_cost_delta(move.changes) < (0, 0):
+                apply_move(timetable, move, evaluator)
+                return timetable
+
+    return timetable
@@ -0,0 +1,167 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from src.common.chromosome import Chromosome
+from src.common.eval import calculate_fitness
+from src.common.fitness_cache import Fitness, FitnessCache, FitnessKey
+from src.common.timetable import Timetable
+from src.common.worker_pool import create_worker_pool, get_derived_seed, get_worker_problem, get_worker_state
+
+EvaluationTask = Tuple[str, Optional[bytes], int]
+EvaluationResult = Tuple[int, int, bytes]
+
+
+def _run_evaluation(phenotype: str, timetable: Optional[Timetable], initial_timetable: Timetable, seed: int) -> Fitness:
+    """
+    Helper function evaluating the fitness of a phenotype with the random generator seeded for the evaluation.
+    :param phenotype: str
+    :param timetable: Optional[Timetable], the timetable of the chromosome
+    :param initial_timetable: Timetable
+    :param seed: int
+    :return: the hard and soft constraints cost, and the perturbed timetable
+    """
+    chromosome: Chromosome = Chromosome([], phenotype=phenotype, timetable=timetable)
+
+    random.seed(seed)
+    calculate_fitness(chromosome, initial_timetable)
+
+    return chromosome.hard_constraints_cost, chromosome.soft_constraints_cost, chromosome.timetable
+
+
+def _evaluate(task: EvaluationTask) -> EvaluationResult:
+    """
+    Helper function evaluating the fitness of a phenotype in a worker process.
+    :param task: the phenotype, the encoded timetable of the chromosome or None, and the seed of the evaluation
+    :return: the hard and soft constraints cost, and the encoded timetable of the chromosome
+    """
+    phenotype, timetable, seed = task
+    hard_constraints_cost, soft_constraints_cost, perturbed_timetable = _run_evaluation(
+        phenotype,
+        None if timetable is None else Timetable.decode(get_worker_problem(), timetable),
+        get_worker_state(),
+        seed
+    )
+
+    return hard_constraints_cost, soft_constraints_cost, perturbed_timetable.encode()
+
+
+class ParallelEvaluator:
+    """
+    Evaluates the fitness of mapped chromosomes with a derived seed per evaluation, in a pool of worker processes if
+    there are any workers and in this process otherwise.
+
+    Every evaluation reseeds the random generator with the seed get_derived_seed derives from the base seed, the
+    phenotype and the hash of the timetable it starts from, so the results of a run are the same for any number of
+    workers, none included; evaluations in this process restore the random state afterwards. Workers only receive
+    phenotypes and encoded timetables and only send back the costs and the encoded perturbed timetable.
+
+    Since an evaluation is determined by its phenotype, starting timetable and seed, equal evaluations of a batch are
+    run once, and with a fitness cache, evaluations of earlier batches are reused.
+    """
+
+    def __init__(
+            self,
+            initial_timetable: Timetable,
+            number_of_workers: int,
+            base_seed: int,
+            fitness_cache: Optional[FitnessCache] = None
+    ):
+        self.initial_timetable: Timetable = initial_timetable
+        self.number_of_workers: int = number_of_workers
+        self.base_seed: int = base_seed
+        self.fitness_cache: Optional[FitnessCache] = fitness_cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        if number_of_workers > 0:
+            self._executor = create_worker_pool(
+                number_of_workers,
+                initial_timetable.problem.problem_instance_index,
+                Timetable.decode,
+                initial_timetable.encode()
+            )
+
+    def __enter__(self) -> 'ParallelEvaluator':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
+
+    def _run(self, chromosomes: List[Chromosome], seeds: List[int]) -> List[Fitness]:
+        """
+        Helper function evaluating chromosomes with the given seeds.
+        :param chromosomes: List[Chromosome]
+        :param seeds: List[int]
+        :return: List[Fitness]
+        """
+        if self._executor is None:
+            state: object = random.getstate()
+            fitnesses: List[Fitness] = [
+                _run_evaluation(chromosome.phenotype, chromosome.timetable, self.initial_timetable, seed)
+                for chromosome, seed in zip(chromosomes, seeds)
+            ]
+            random.setstate(state)
+            return fitnesses
+
+        tasks: List[EvaluationTask] = [
+            (chromosome.phenotype, chromosome.timetable.encode() if chromosome.timetable else None, seed)
+            for chromosome, seed in zip(chromosomes, seeds)
+        ]
+        chunk_size: int = max(1, len(tasks) // (4 * self.number_of_workers))
+
+        return [
+            (hard_constraints_cost, soft_constraints_cost, Timetable.decode(self.initial_timetable.problem, timetable))
+            for hard_constraints_cost, soft_constraints_cost, timetable in self._executor.map(
+                _evaluate,
+                tasks,
+                chunksize=chunk_size
+            )
+        ]
+
+    def evaluate(self, chromosomes: List[Chromosome]) -> None:
+        """
+        Calculates the fitness of mapped chromosomes, like calculate_fitness does for each of them. A chromosome that
+        appears more than once is evaluated from the same timetable every time.
+        :param chromosomes: List[Chromosome]
+        :return: None
+        """
+        keys: List[FitnessKey] = []
+        fitnesses: Dict[FitnessKey, Fitness] = {}
+        missing: Dict[FitnessKey, Tuple[Chromosome, int]] = {}
+
+        for chromosome in chromosomes:
+            timetable: Timetable = chromosome.timetable if chromosome.timetable else self.initial_timetable
+            seed: int = get_derived_seed(self.base_seed, chromosome.phenotype, timetable.hash)
+            key: FitnessKey = (chromosome.phenotype, timetable.hash, seed)
+            keys.append(key)
+
+            if key in fitnesses or key in missing:
+                continue
+
+            fitness: Optional[Fitness] = self.fitness_cache.get(key) if self.fitness_cache is not None else None
+            if fitness is None:
+                missing[key] = (chromosome, seed)
+            else:
+                fitnesses[key] = fitness
+
+        for key, fitness in zip(
+                missing.keys(),
+                self._run([chromosome for chromosome, _ in missing.values()], [seed for _, seed in missing.values()])
+        ):
+            fitnesses[key] = fitness
+            if self.fitness_cache is not None:
+                self.fitness_cache.put(key, fitness)
+
+        for chromosome, key in zip(chromosomes, keys):
+            hard_constraints_cost, soft_constraints_cost, timetable = fitnesses[key]
+            chromosome.timetable = timetable.clone()
+            chromosome.hard_constraints_cost = hard_constraints_cost
+            chromosome.soft_constraints_cost = soft_constraints_cost
+
+    def shutdown(self) -> None:
+        """
+        Shuts the worker processes down.
+        :return: None
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
@@ -0,0 +1,103 @@
+import heapq
+import random
+from typing import Iterable, List, Optional, Tuple
+
+from src.common.chromosome import Chromosome
+
+PopulationEntry = Tuple[int, int, int, Chromosome]
+
+
+class Population:
+    """
+    A bounded population of evaluated chromosomes ordered by (hard, soft) constraints cost.
+
+    The chromosomes sit in a max-heap keyed by cost and then insertion order, so inserting one and evicting the worst
+    take O(log n); among chromosomes of equal cost the most recently inserted is evicted first, as when appending to a
+    sorted list and truncating it. The best chromosome (the earliest inserted of the smallest cost) is kept in an O(1)
+    pointer, and tournaments sample the heap directly.
+
+    A chromosome's cost must not change once it is inserted, so offspring have to be bred from copies.
+    """
+
+    def __init__(self, max_size: int, chromosomes: Iterable[Chromosome] = ()):
+        self.max_size: int = max_size
+        self.best: Optional[Chromosome] = None
+        self._heap: List[PopulationEntry] = []
+        self._number_of_insertions: int = 0
+
+        for chromosome in chromosomes:
+            self.push(chromosome)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, chromosome: Chromosome) -> None:
+        """
+        Inserts a chromosome, evicting the worst one if the population is over its size.
+        :param chromosome: Chromosome
+        :return: None
+        """
+        heapq.heappush(
+            self._heap,
+            (
+                -chromosome.hard_constraints_cost,
+                -chromosome.soft_constraints_cost,
+                -self._number_of_insertions,
+                chromosome
+            )
+        )
+        self._number_of_insertions += 1
+
+        if self.best is None or (chromosome.hard_constraints_cost, chromosome.soft_constraints_cost) < (
+                self.best.hard_constraints_cost,
+                self.best.soft_constraints_cost
+        ):
+            self.best = chromosome
+
+        if len(self._heap) > self.max_size:
+            heapq.heappop(self._heap)
+
+    def select(self, tournament_size: int) -> Chromosome:
+        """
+        Returns the chromosome of smallest cost among tournament_size distinct random ones.
+        :param tournament_size: int
+        :return: Chromosome
+        """
+        tournament: List[PopulationEntry] = random.sample(self._heap, tournament_size)
+        return min(tournament, key=lambda entry: (-entry[0], -entry[1]))[3]
+
+    def get_sorted(self) -> List[Chromosome]:
+        """
+        Returns the chromosomes from the best to the worst, the earliest inserted first among equal costs.
+        :return: List[Chromosome]
+        """
+        return [entry[3] for entry in sorted(self._heap, reverse=True)]
+
+    def get_entries(self) -> Tuple[List[Tuple[int, Chromosome]], int]:
+        """
+        Returns the chromosomes in heap order with their insertion numbers, and the number of insertions so far, from
+        which restore rebuilds the population exactly.
+        :return: the entries and the number of insertions
+        """
+        return [(-entry[2], entry[3]) for entry in self._heap], self._number_of_insertions
+
+    @staticmethod
+    def restore(max_size: int, entries: List[Tuple[int, Chromosome]], number_of_insertions: int) -> 'Population':
+        """
+        Rebuilds a population from the entries and number of insertions returned by get_entries.
+        :param max_size: int
+        :param entries: List[Tuple[int, Chromosome]]
+        :param number_of_insertions: int
+        :return: Population
+        """
+        population: Population = Population(max_size)
+        population._heap = [
+            (-chromosome.hard_constraints_cost, -chromosome.soft_constraints_cost, -insertion, chromosome)
+            for insertion, chromosome in entries
+        ]
+        population._number_of_insertions = number_of_insertions
+        population.best = min(
+            entries,
+            key=lambda entry: (entry[1].hard_constraints_cost, entry[1].soft_constraints_cost, entry[0])
+        )[1]
+        return population
@@ -0,0 +1,136 @@
+from typing import Any, Dict, Hashable, List
+
+
+class IndexedPriorityQueue:
+    """
+    Binary min-heap of distinct items whose keys can be changed or removed in O(log n).
+
+    The heap position of every item is kept in a dictionary, so an item whose key changes is sifted from where it is
+    instead of being pushed again.
+    """
+
+    def __init__(self):
+        self._heap: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._keys: Dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._positions
+
+    def push(self, item: Hashable, key: Any) -> None:
+        """
+        Adds an item, or changes its key if it is already in the queue.
+        :param item: Hashable
+        :param key: Any
+        :return: None
+        """
+        if item in self._positions:
+            self.update(item, key)
+            return
+
+        self._keys[item] = key
+        self._positions[item] = len(self._heap)
+        self._heap.append(item)
+        self._sift_up(len(self._heap) - 1)
+
+    def update(self, item: Hashable, key: Any) -> None:
+        """
+        Changes the key of an item in the queue.
+        :param item: Hashable
+        :param key: Any
+        :return: None
+        """
+        old_key: Any = self._keys[item]
+        self._keys[item] = key
+
+        if key < old_key:
+            self._sift_up(self._positions[item])
+        elif old_key < key:
+            self._sift_down(self._positions[item])
+
+    def remove(self, item: Hashable) -> None:
+        """
+        Removes an item from the queue.
+        :param item: Hashable
+        :return: None
+        """
+        position: int = self._positions.pop(item)
+        del self._keys[item]
+        last_item: Hashable = self._heap.pop()
+
+        if position < len(self._heap):
+            self._heap[position] = last_item
+            self._positions[last_item] = position
+            self._sift_up(position)
+            self._sift_down(self._positions[last_item])
+
+    def peek(self) -> Hashable:
+        """
+        Returns the item with the smallest key without removing it.
+        :return: Hashable
+        """
+        return self._heap[0]
+
+    def pop(self) -> Hashable:
+        """
+        Removes and returns the item with the smallest key.
+        :return: Hashable
+        """
+        item: Hashable = self._heap[0]
+        self.remove(item)
+        return item
+
+    def _sift_up(self, position: int) -> None:
+        """
+        Helper function to move an item towards the root while its key is smaller than its parent's.
+        :param position: int
+        :return: None
+        """
+        item: Hashable = self._heap[position]
+        key: Any = self._keys[item]
+
+        while position > 0:
+            parent_position: int = (position - 1) // 2
+            parent: Hashable = self._heap[parent_position]
+            if not key < self._keys[parent]:
+                break
+            self._heap[position] = parent
+            self._positions[parent] = position
+            position = parent_position
+
+        self._heap[position] = item
+        self._positions[item] = position
+
+    def _sift_down(self, position: int) -> None:
+        """
+        Helper function to move an item towards the leaves while a child has a smaller key.
+        :param position: int
+        :return: None
+        """
+        item: Hashable = self._heap[position]
+        key: Any = self._keys[item]
+        size: int = len(self._heap)
+
+        while True:
+            child_position: int = 2 * position + 1
+            if child_position >= size:
+                break
+            right_position: int = child_position + 1
+            if (
+                    right_position < size and
+                    self._keys[self._heap[right_position]] < self._keys[self._heap[child_position]]
+            ):
+                child_position = right_position
+
+            child: Hashable = self._heap[child_position]
+            if not self._keys[child] < key:
+                break
+            self._heap[position] = child
+            self._positions[child] = position
+            position = child_position
+
+        self._heap[position] = item
+        self._positions[item] = position
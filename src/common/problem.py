@@ -7,13 +7,18 @@ from typing import List, Optional
 
 from src.common.config import DATA_PATH
 from src.common.constraint import Constraint
+from src.common.constraints_validator import DeltaEvaluator
+from src.common.cost_cache import CostCache
 from src.common.course import Course
 from src.common.curriculum import Curriculum
+from src.common.problem_model import ProblemModel
 from src.common.room import Room
+from src.common.room_allocator import RoomAllocator
 
 
 class Problem:
     def __init__(self, problem_instance_index: int):
+        self.problem_instance_index: int = problem_instance_index
         problem_instance_filenames_list: List[str] = os.listdir(DATA_PATH)
         self.selected_problem_instance_filename: str = problem_instance_filenames_list[
             problem_instance_index
@@ -33,6 +38,11 @@ class Problem:
         self.curricula: Optional[List[Curriculum]] = None
         self.constraints: Optional[List[Constraint]] = None
 
+        self.model: Optional[ProblemModel] = None
+        self.room_allocator: Optional[RoomAllocator] = None
+        self.cost_cache: CostCache = CostCache()
+        self.delta_evaluator: Optional[DeltaEvaluator] = None
+
     def _extract_basic_information(self) -> None:
         """
             Extracts the basic information from the file content.
@@ -60,7 +70,10 @@ class Problem:
                 courses_string_index + 1,
                 courses_string_index + 1 + self.number_of_courses
         ):
-            course: Course = Course(course_content=self.file_content[course_index])
+            course: Course = Course(
+                course_content=self.file_content[course_index],
+                index=len(self.courses)
+            )
             self.courses.append(course)
 
     def _extract_rooms(self) -> None:
@@ -76,7 +89,7 @@ class Problem:
                 rooms_string_index + 1,
                 rooms_string_index + 1 + self.number_of_rooms
         ):
-            room: Room = Room(room_content=self.file_content[room_index])
+            room: Room = Room(room_content=self.file_content[room_index], index=len(self.rooms))
             self.rooms.append(room)
 
     def _extract_curricula(self) -> None:
@@ -92,13 +105,14 @@ class Problem:
                 curricula_string_index + 1,
                 curricula_string_index + 1 + self.number_of_curricula
         ):
+            curricula_content_list: List[str] = self.file_content[curricula_index].split()
             curriculum: Curriculum = Curriculum(
-                curricula_content=self.file_content[curricula_index]
+                curricula_content=self.file_content[curricula_index],
+                index=len(self.curricula),
+                course_ids=tuple(
+                    course.course_id for course in self.courses if course.course_id in curricula_content_list
+                )
             )
-
-            for course in self.courses:
-                if course.course_id in self.file_content[curricula_index].split():
-                    curriculum.course_ids.append(course.course_id)
             self.curricula.append(curriculum)
 
     def _extract_constraints(self) -> None:
@@ -114,12 +128,32 @@ class Problem:
                 constraints_string_index + 1,
                 constraints_string_index + 1 + self.number_of_constraints
         ):
-            constraint = Constraint(constraint_content=self.file_content[constraint_index])
+            constraint = Constraint(
+                constraint_content=self.file_content[constraint_index],
+                index=len(self.constraints)
+            )
             self.constraints.append(constraint)
 
+    def _compile_model(self) -> None:
+        """
+            Compiles the extracted information into the integer-indexed model used by the evaluators and heuristics,
+            and the room allocator built on it.
+            :return: None
+        """
+
+        self.model = ProblemModel(
+            courses=self.courses,
+            rooms=self.rooms,
+            curricula=self.curricula,
+            constraints=self.constraints,
+            number_of_days=self.number_of_days,
+            number_of_periods_per_day=self.number_of_periods_per_day
+        )
+        self.room_allocator = RoomAllocator(self.model)
+
     def initialize(self) -> None:
         """
-            Initializes the problem instance. Reads the file and extracts the information.
+            Initializes the problem instance. Reads the file, extracts the information and compiles the model.
             :return: None
         """
         with open(
@@ -132,3 +166,5 @@ class Problem:
             self._extract_rooms()
             self._extract_curricula()
             self._extract_constraints()
+
+        self._compile_model()
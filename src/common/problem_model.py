@@ -0,0 +1,157 @@
+from typing import Dict, List, Tuple
+
+from src.common.constraint import Constraint
+from src.common.course import Course
+from src.common.curriculum import Curriculum
+from src.common.room import Room
+
+
+_HASH_MASK: int = (1 << 64) - 1
+
+
+class ProblemModel:
+    """
+    Compiled, integer-indexed view of a problem instance.
+
+    Courses, rooms, teachers and curricula get dense ids in the order they appear in the instance file, and everything
+    the evaluators and heuristics look up repeatedly is precomputed into lists indexed by those ids. Periods are
+    numbered day * number_of_periods_per_day + period.
+    """
+
+    def __init__(
+            self,
+            courses: List[Course],
+            rooms: List[Room],
+            curricula: List[Curriculum],
+            constraints: List[Constraint],
+            number_of_days: int,
+            number_of_periods_per_day: int
+    ):
+        self.number_of_days: int = number_of_days
+        self.number_of_periods_per_day: int = number_of_periods_per_day
+        self.number_of_periods: int = number_of_days * number_of_periods_per_day
+
+        self.courses: List[Course] = list(courses)
+        self.rooms: List[Room] = list(rooms)
+
+        self.course_ids: List[str] = [course.course_id for course in courses]
+        self.room_ids: List[str] = [room.room_id for room in rooms]
+        self.curriculum_ids: List[str] = [curriculum.curricula_id for curriculum in curricula]
+        self.teacher_ids: List[str] = []
+
+        self.course_index: Dict[str, int] = {course_id: index for index, course_id in enumerate(self.course_ids)}
+        self.room_index: Dict[str, int] = {room_id: index for index, room_id in enumerate(self.room_ids)}
+        self.curriculum_index: Dict[str, int] = {
+            curriculum_id: index for index, curriculum_id in enumerate(self.curriculum_ids)
+        }
+        self.teacher_index: Dict[str, int] = {}
+
+        self.course_teacher: List[int] = []
+        for course in courses:
+            if course.teacher_id not in self.teacher_index:
+                self.teacher_index[course.teacher_id] = len(self.teacher_ids)
+                self.teacher_ids.append(course.teacher_id)
+            self.course_teacher.append(self.teacher_index[course.teacher_id])
+
+        self.lectures: List[int] = [course.number_of_lectures for course in courses]
+        self.min_working_days: List[int] = [course.min_working_days for course in courses]
+        self.students: List[int] = [course.number_of_students for course in courses]
+        self.capacities: List[int] = [room.room_capacity for room in rooms]
+
+        self.curriculum_courses: List[List[int]] = [
+            [self.course_index[course_id] for course_id in curriculum.course_ids] for curriculum in curricula
+        ]
+        self.course_curricula: List[List[int]] = [[] for _ in courses]
+        for curriculum, curriculum_courses in enumerate(self.curriculum_courses):
+            for course in curriculum_courses:
+                self.course_curricula[course].append(curriculum)
+
+        self.shared_curricula: List[List[int]] = self._compile_shared_curricula()
+        self.conflicts: List[List[bool]] = self._compile_conflicts()
+        self.conflicting_courses: List[List[int]] = [
+            [other for other, conflict in enumerate(row) if conflict] for row in self.conflicts
+        ]
+
+        self.unavailability_constraints: List[Tuple[int, int, int]] = [
+            (self.course_index[constraint.course_id], constraint.day, constraint.period) for constraint in constraints
+        ]
+        self.unavailable: List[List[bool]] = [[False] * self.number_of_periods for _ in courses]
+        for course, day, period in self.unavailability_constraints:
+            self.unavailable[course][self.get_period(day, period)] = True
+
+        self.capacity_penalty: List[List[int]] = [
+            [int(students > capacity) for capacity in self.capacities] for students in self.students
+        ]
+
+    def _compile_shared_curricula(self) -> List[List[int]]:
+        """
+        Builds the course x course table of the number of curricula both courses belong to.
+        :return: List[List[int]]
+        """
+        shared_curricula: List[List[int]] = [[0] * len(self.courses) for _ in self.courses]
+
+        for curriculum_courses in self.curriculum_courses:
+            for first_course in curriculum_courses:
+                for second_course in curriculum_courses:
+                    shared_curricula[first_course][second_course] += 1
+
+        return shared_curricula
+
+    def _compile_conflicts(self) -> List[List[bool]]:
+        """
+        Builds the course x course conflict matrix. Two courses conflict when they belong to the same curriculum or
+        are taught by the same teacher, so every course conflicts with itself.
+        :return: List[List[bool]]
+        """
+        return [
+            [
+                self.shared_curricula[first_course][second_course] > 0 or
+                self.course_teacher[first_course] == self.course_teacher[second_course]
+                for second_course in range(len(self.courses))
+            ]
+            for first_course in range(len(self.courses))
+        ]
+
+    def get_period(self, day: int, period: int) -> int:
+        """
+        Returns the index of a (day, period) slot.
+        :param day: int
+        :param period: int
+        :return: int
+        """
+        return day * self.number_of_periods_per_day + period
+
+    def get_course(self, course_id: str) -> Course:
+        """
+        Returns the course with the given id.
+        :param course_id: str
+        :return: Course
+        """
+        return self.courses[self.course_index[course_id]]
+
+    def get_room(self, room_id: str) -> Room:
+        """
+        Returns the room with the given id.
+        :param room_id: str
+        :return: Room
+        """
+        return self.rooms[self.room_index[room_id]]
+
+    def get_zobrist_key(self, course: int, room: int, day: int, period: int) -> int:
+        """
+        Returns the 64-bit key of a course room pair placed at a (day, period) slot. The keys are derived with the
+        splitmix64 finalizer, so they are reproducible across processes and need no table.
+        :param course: int
+        :param room: int
+        :param day: int
+        :param period: int
+        :return: int
+        """
+        key: int = (
+            ((course * len(self.rooms) + room) * self.number_of_days + day % self.number_of_days) *
+            self.number_of_periods_per_day + period % self.number_of_periods_per_day
+        )
+        key = (key + 0x9E3779B97F4A7C15) & _HASH_MASK
+        key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & _HASH_MASK
+        key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & _HASH_MASK
+        return key ^ (key >> 31)
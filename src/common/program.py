@@ -0,0 +1,130 @@
+from enum import Enum, IntEnum
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+from src.common.acceptance import MoveAcceptance
+from src.common.generation_perturbative import single_move, swap_slots, swap_lectures
+from src.common.timetable import Timetable
+
+
+class Acceptance(Enum):
+    """
+    Move acceptance criteria of the grammar's <accept> rule.
+    """
+    ILTA = 'ILTA'
+    AEI = 'AEI'
+    AI = 'AI'
+
+
+class Opcode(IntEnum):
+    """
+    Actions of the grammar's <action> rule.
+    """
+    SINGLE_MOVE = 0
+    SWAP_SLOTS = 1
+    SWAP_LECTURES = 2
+    SWAP = 3
+    MOVE = 4
+
+
+_SIMPLE_OPCODES: Dict[str, Opcode] = {
+    'single_move()': Opcode.SINGLE_MOVE,
+    'swap_slots()': Opcode.SWAP_SLOTS,
+    'swap_lectures()': Opcode.SWAP_LECTURES
+}
+
+_PARAMETERISED_OPCODES: Dict[str, Opcode] = {
+    'swap(': Opcode.SWAP,
+    'move(': Opcode.MOVE
+}
+
+_HEURISTICS: Dict[Opcode, Callable[[Timetable], Timetable]] = {
+    Opcode.SINGLE_MOVE: single_move,
+    Opcode.SWAP_SLOTS: swap_slots,
+    Opcode.SWAP_LECTURES: swap_lectures
+}
+
+Instruction = Tuple[Opcode, Tuple[str, ...]]
+
+
+class Program:
+    """
+    A phenotype compiled once into its acceptance criterion and instructions.
+
+    Every instruction is an opcode with its arguments; the parameterised swap( n comp comp ) and move( n comp comp )
+    forms keep theirs but, like in the phenotype strings they are compiled from, have no heuristic behind them, so the
+    interpreter only runs the heuristics tuple.
+    """
+
+    __slots__ = ('phenotype', 'acceptance', 'instructions', 'heuristics')
+
+    def __init__(self, phenotype: str, acceptance: Acceptance, instructions: Tuple[Instruction, ...]):
+        self.phenotype: str = phenotype
+        self.acceptance: Acceptance = acceptance
+        self.instructions: Tuple[Instruction, ...] = instructions
+        self.heuristics: Tuple[Callable[[Timetable], Timetable], ...] = tuple(
+            _HEURISTICS[opcode] for opcode, _ in instructions if opcode in _HEURISTICS
+        )
+
+    def run(self, timetable: Timetable) -> Timetable:
+        """
+        Applies the program's heuristics to a timetable in order.
+        :param timetable: Timetable
+        :return: Timetable
+        """
+        for heuristic in self.heuristics:
+            timetable = heuristic(timetable)
+
+        return timetable
+
+    def accept(
+            self,
+            move_acceptance: MoveAcceptance,
+            previous_timetable: Timetable,
+            current_timetable: Timetable
+    ) -> bool:
+        """
+        Decides with the program's acceptance criterion whether the perturbed timetable replaces the previous one.
+        :param move_acceptance: MoveAcceptance
+        :param previous_timetable: Timetable
+        :param current_timetable: Timetable
+        :return: bool
+        """
+        if self.acceptance is Acceptance.ILTA:
+            return move_acceptance.iterated_limited_threshold_acceptance(previous_timetable, current_timetable)
+        elif self.acceptance is Acceptance.AEI:
+            return move_acceptance.accept_equal_and_improving(previous_timetable, current_timetable)
+        else:
+            return move_acceptance.accept_improving(previous_timetable, current_timetable)
+
+
+@lru_cache(maxsize=None)
+def compile_program(phenotype: str) -> Program:
+    """
+    Compiles a phenotype produced by the grammar. Programs are immutable, so equal phenotypes share one.
+    :param phenotype: str
+    :return: Program
+    """
+    tokens: List[str] = phenotype.split()
+    if len(tokens) == 0:
+        raise ValueError("Cannot compile an empty phenotype")
+
+    acceptance: Acceptance = Acceptance.ILTA if tokens[0] == 'ILTA' else (
+        Acceptance.AEI if tokens[0] == 'AEI' else Acceptance.AI
+    )
+
+    instructions: List[Instruction] = []
+    index: int = 1
+    while index < len(tokens):
+        token: str = tokens[index]
+
+        if token in _SIMPLE_OPCODES:
+            instructions.append((_SIMPLE_OPCODES[token], ()))
+        elif token in _PARAMETERISED_OPCODES and ')' in tokens[index:]:
+            end: int = tokens.index(')', index)
+            instructions.append((_PARAMETERISED_OPCODES[token], tuple(tokens[index + 1:end])))
+            index = end
+
+        index += 1
+
+    return Program(phenotype, acceptance, tuple(instructions))
@@ -1,11 +1,15 @@
-class Room:
+from src.common.flyweight import Flyweight
 
-    def __init__(self, room_content: str):
-        self.room_content = room_content
-        self.room_content_list = room_content.split()
 
-        self.room_id = self.room_content_list[0]
-        self.room_capacity = int(self.room_content_list[1])
+class Room(Flyweight):
+    __slots__ = ('room_id', 'room_capacity')
 
-    def clone(self):
-        return Room(self.room_content)
+    room_id: str
+    room_capacity: int
+
+    def __init__(self, room_content: str, index: int):
+        super().__init__(index)
+        room_content_list = room_content.split()
+
+        self._set('room_id', room_content_list[0])
+        self._set('room_capacity', int(room_content_list[1]))
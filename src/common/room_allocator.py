@@ -0,0 +1,165 @@
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from src.common.problem_model import ProblemModel
+
+
+class RoomAllocator:
+    """
+    Room selection and per-period room assignment.
+
+    Rooms are indexed by capacity (ties keep the order of the instance file) and the rooms occupied in a period are a
+    bitmask of room ids, kept up to date by the feasibility index of the timetable, so the smallest free room large
+    enough for a course is found with a bisect. A whole period can also be re-assigned as a minimum-cost bipartite
+    matching of its lectures to distinct rooms, where a lecture costs its room capacity penalty plus the room stability
+    violations it adds given the course's lectures in other periods.
+    """
+
+    def __init__(self, model: ProblemModel):
+        self.model: ProblemModel = model
+        self._rooms_by_capacity: List[int] = sorted(
+            range(len(model.rooms)),
+            key=lambda room: model.capacities[room]
+        )
+        self._sorted_capacities: List[int] = [model.capacities[room] for room in self._rooms_by_capacity]
+
+    def get_room(self, course: int, first_room: Optional[int], occupancy: int) -> int:
+        """
+        Returns a room for a course in a period. The course's first room is kept if it is free and large enough,
+        otherwise the smallest free room large enough is used; if there is none, the largest free room; if every room
+        is taken, the first room that is the course's first room or large enough.
+        :param course: int
+        :param first_room: Optional[int], the room the course was first scheduled in
+        :param occupancy: int, bitmask of the rooms already used in the period
+        :return: int
+        """
+        students: int = self.model.students[course]
+
+        if (
+                first_room is not None and
+                not occupancy >> first_room & 1 and
+                self.model.capacities[first_room] >= students
+        ):
+            return first_room
+
+        for position in range(bisect_left(self._sorted_capacities, students), len(self._rooms_by_capacity)):
+            room: int = self._rooms_by_capacity[position]
+            if not occupancy >> room & 1:
+                return room
+
+        for position in range(len(self._rooms_by_capacity) - 1, -1, -1):
+            if not occupancy >> self._rooms_by_capacity[position] & 1:
+                largest_capacity: int = self._sorted_capacities[position]
+                first_position: int = bisect_left(self._sorted_capacities, largest_capacity)
+                return min(
+                    room for room in self._rooms_by_capacity[first_position:position + 1] if not occupancy >> room & 1
+                )
+
+        for room in range(len(self.model.rooms)):
+            if room == first_room or self.model.capacities[room] >= students:
+                return room
+
+        return self._rooms_by_capacity[-1]
+
+    def _get_assignment_cost(self, course: int, room: int, room_counts: Dict[int, int]) -> int:
+        """
+        Helper function to get the capacity and room stability violations of a lecture of a course placed in a room.
+        :param course: int
+        :param room: int
+        :param room_counts: Dict[int, int], the number of lectures of the course per room in the other periods
+        :return: int
+        """
+        most_common_room_count: int = max(max(room_counts.values(), default=0), room_counts.get(room, 0) + 1)
+
+        return (
+                self.model.capacity_penalty[course][room] +
+                max(0, self.model.lectures[course] - most_common_room_count)
+        )
+
+    def assign_rooms(
+            self,
+            courses: List[int],
+            room_counts: List[Dict[int, int]],
+            current_rooms: Optional[List[int]] = None
+    ) -> List[int]:
+        """
+        Assigns distinct rooms to the lectures of a period minimising their capacity and room stability violations
+        (Hungarian algorithm, O(lectures^2 x rooms)). Among optimal assignments, the one keeping most current rooms is
+        returned.
+        :param courses: List[int], the course of each lecture
+        :param room_counts: List[Dict[int, int]], per lecture, the number of lectures of its course per room in the
+        other periods
+        :param current_rooms: Optional[List[int]], the room each lecture is in now
+        :return: the room of each lecture
+        """
+        number_of_lectures: int = len(courses)
+        number_of_rooms: int = len(self.model.rooms)
+
+        if number_of_lectures > number_of_rooms:
+            raise ValueError("A period with more lectures than rooms cannot be given distinct rooms")
+
+        scale: int = number_of_lectures + 1
+        costs: List[List[int]] = [
+            [
+                self._get_assignment_cost(course, room, counts) * scale +
+                int(current_rooms is not None and current_rooms[lecture] != room)
+                for room in range(number_of_rooms)
+            ]
+            for lecture, (course, counts) in enumerate(zip(courses, room_counts))
+        ]
+
+        lecture_potentials: List[float] = [0] * (number_of_lectures + 1)
+        room_potentials: List[float] = [0] * (number_of_rooms + 1)
+        room_lectures: List[int] = [0] * (number_of_rooms + 1)
+        previous_rooms: List[int] = [0] * (number_of_rooms + 1)
+
+        for lecture in range(1, number_of_lectures + 1):
+            room_lectures[0] = lecture
+            current_room: int = 0
+            minimum_slack: List[float] = [float('inf')] * (number_of_rooms + 1)
+            visited: List[bool] = [False] * (number_of_rooms + 1)
+
+            while True:
+                visited[current_room] = True
+                current_lecture: int = room_lectures[current_room]
+                delta: float = float('inf')
+                next_room: int = 0
+
+                for room in range(1, number_of_rooms + 1):
+                    if visited[room]:
+                        continue
+
+                    slack: float = (
+                            costs[current_lecture - 1][room - 1] -
+                            lecture_potentials[current_lecture] -
+                            room_potentials[room]
+                    )
+                    if slack < minimum_slack[room]:
+                        minimum_slack[room] = slack
+                        previous_rooms[room] = current_room
+                    if minimum_slack[room] < delta:
+                        delta = minimum_slack[room]
+                        next_room = room
+
+                for room in range(number_of_rooms + 1):
+                    if visited[room]:
+                        lecture_potentials[room_lectures[room]] += delta
+                        room_potentials[room] -= delta
+                    else:
+                        minimum_slack[room] -= delta
+
+                current_room = next_room
+                if room_lectures[current_room] == 0:
+                    break
+
+            while current_room != 0:
+                previous_room: int = previous_rooms[current_room]
+                room_lectures[current_room] = room_lectures[previous_room]
+                current_room = previous_room
+
+        rooms: List[int] = [0] * number_of_lectures
+        for room in range(1, number_of_rooms + 1):
+            if room_lectures[room] != 0:
+                rooms[room_lectures[room] - 1] = room - 1
+
+        return rooms
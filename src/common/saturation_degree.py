@@ -0,0 +1,166 @@
+from bisect import bisect_right
+from typing import List, Set
+
+from src.common.priority_queue import IndexedPriorityQueue
+from src.common.problem_model import ProblemModel
+from src.common.slot import Slot
+
+
+class SaturationDegreeQueue:
+    """
+    Incrementally maintained saturation degrees of the courses during the DSatur-style construction of a timetable.
+
+    The saturation degree of a course is the number of periods minus one for each period where the course is already
+    scheduled, is unavailable, meets a course of a shared curriculum, meets a course of the same teacher, or finds no
+    free room large enough, each predicate being counted separately, so a period can lower the degree more than once.
+    Courses with lectures left to schedule sit in an indexed priority queue keyed by (saturation degree, -number of
+    students, course index). Placing a lecture only updates the keys of the course itself, the courses of its
+    curricula and teacher, and the courses whose number of students lies between the old and new largest free room
+    capacity of the period.
+    """
+
+    def __init__(self, model: ProblemModel, schedule: List[List[Slot]]):
+        self.model: ProblemModel = model
+        number_of_courses: int = len(model.courses)
+
+        self._curriculum_courses: List[List[int]] = [
+            [other for other, shared in enumerate(row) if shared > 0] for row in model.shared_curricula
+        ]
+        self._teacher_courses: List[List[int]] = [[] for _ in model.teacher_ids]
+        for course, teacher in enumerate(model.course_teacher):
+            self._teacher_courses[teacher].append(course)
+
+        self._courses_by_students: List[int] = sorted(
+            range(number_of_courses),
+            key=lambda course: model.students[course]
+        )
+        self._sorted_students: List[int] = [model.students[course] for course in self._courses_by_students]
+
+        self._course_counts: List[List[int]] = [[0] * model.number_of_periods for _ in range(number_of_courses)]
+        self._curriculum_counts: List[List[int]] = [[0] * model.number_of_periods for _ in range(number_of_courses)]
+        self._teacher_counts: List[List[int]] = [[0] * model.number_of_periods for _ in model.teacher_ids]
+        self._slot_sizes: List[int] = [0] * model.number_of_periods
+        self._room_counts: List[List[int]] = [[0] * len(model.rooms) for _ in range(model.number_of_periods)]
+        self._largest_free_capacities: List[int] = [
+            self._get_largest_free_capacity(period) for period in range(model.number_of_periods)
+        ]
+
+        self.saturation_degrees: List[int] = [
+            model.number_of_periods - sum(model.unavailable[course]) - sum(
+                model.students[course] > largest_free_capacity
+                for largest_free_capacity in self._largest_free_capacities
+            )
+            for course in range(number_of_courses)
+        ]
+        self._lectures_left: List[int] = list(model.lectures)
+
+        for day in range(len(schedule)):
+            for period in range(len(schedule[day])):
+                for course, room in schedule[day][period].course_room_pairs:
+                    self._place(course.index, room.index, model.get_period(day, period))
+
+        self._queue: IndexedPriorityQueue = IndexedPriorityQueue()
+        for course in range(number_of_courses):
+            if self._lectures_left[course] > 0:
+                self._queue.push(course, self._get_key(course))
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def _get_key(self, course: int) -> tuple:
+        """
+        Helper function to get the priority of a course.
+        :param course: int
+        :return: tuple
+        """
+        return self.saturation_degrees[course], -self.model.students[course], course
+
+    def _get_largest_free_capacity(self, period: int) -> int:
+        """
+        Helper function to get the capacity of the largest free room of a period, or -1 if the period is full.
+        :param period: int
+        :return: int
+        """
+        if self._slot_sizes[period] == len(self.model.rooms):
+            return -1
+
+        return max(
+            (
+                capacity
+                for capacity, count in zip(self.model.capacities, self._room_counts[period])
+                if count == 0
+            ),
+            default=-1
+        )
+
+    def _place(self, course: int, room: int, period: int) -> Set[int]:
+        """
+        Helper function to record a lecture placed in a period and update the saturation degrees it affects.
+        :param course: int
+        :param room: int
+        :param period: int
+        :return: the courses whose saturation degree changed
+        """
+        changed_courses: Set[int] = set()
+
+        self._course_counts[course][period] += 1
+        if self._course_counts[course][period] == 1:
+            self.saturation_degrees[course] -= 1
+            changed_courses.add(course)
+
+        for other in self._curriculum_courses[course]:
+            self._curriculum_counts[other][period] += 1
+            if self._curriculum_counts[other][period] == 1:
+                self.saturation_degrees[other] -= 1
+                changed_courses.add(other)
+
+        teacher: int = self.model.course_teacher[course]
+        self._teacher_counts[teacher][period] += 1
+        if self._teacher_counts[teacher][period] == 1:
+            for other in self._teacher_courses[teacher]:
+                self.saturation_degrees[other] -= 1
+                changed_courses.add(other)
+
+        self._slot_sizes[period] += 1
+        self._room_counts[period][room] += 1
+
+        old_capacity: int = self._largest_free_capacities[period]
+        new_capacity: int = self._get_largest_free_capacity(period)
+        self._largest_free_capacities[period] = new_capacity
+
+        if new_capacity != old_capacity:
+            change: int = -1 if new_capacity < old_capacity else 1
+            for position in range(
+                    bisect_right(self._sorted_students, min(old_capacity, new_capacity)),
+                    bisect_right(self._sorted_students, max(old_capacity, new_capacity))
+            ):
+                other = self._courses_by_students[position]
+                self.saturation_degrees[other] += change
+                changed_courses.add(other)
+
+        return changed_courses
+
+    def peek(self) -> int:
+        """
+        Returns the index of the course to schedule next: the one with the smallest saturation degree, then the most
+        students, then the first in the instance file.
+        :return: int
+        """
+        return self._queue.peek()
+
+    def record_lecture(self, course: int, room: int, day: int, period: int) -> None:
+        """
+        Records a lecture of a course scheduled in a room at a (day, period) slot.
+        :param course: int
+        :param room: int
+        :param day: int
+        :param period: int
+        :return: None
+        """
+        for other in self._place(course, room, self.model.get_period(day, period)):
+            if other in self._queue:
+                self._queue.update(other, self._get_key(other))
+
+        self._lectures_left[course] -= 1
+        if self._lectures_left[course] == 0:
+            self._queue.remove(course)
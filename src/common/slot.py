@@ -5,13 +5,12 @@ from src.common.room import Room
 
 
 class Slot:
+    __slots__ = ('course_room_pairs',)
 
     def __init__(self):
         self.course_room_pairs: List[Tuple[Course, Room]] = []
 
     def clone(self):
         slot = Slot()
-
-        for course, room in self.course_room_pairs:
-            slot.course_room_pairs.append((course.clone(), room.clone()))
+        slot.course_room_pairs = list(self.course_room_pairs)
         return slot
@@ -1,235 +1,514 @@
 import random
-from typing import List, Tuple, Optional
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional
 
+from src.common.config import VECTORIZED_EVALUATION
 from src.common.constraint import Constraint
-from src.common.constraints_validator import get_num_of_violated_soft_constraints
+from src.common.constraints_validator import DeltaEvaluator, get_insertion_soft_cost_deltas
 from src.common.course import Course
 from src.common.curriculum import Curriculum
+from src.common.feasibility_index import FeasibilityIndex
 from src.common.problem import Problem
+from src.common.problem_model import ProblemModel
 from src.common.room import Room
+from src.common.saturation_degree import SaturationDegreeQueue
 from src.common.slot import Slot
 
+if TYPE_CHECKING:
+    from src.common.array_timetable import ArrayTimetable
+
+_HASH_MASK: int = (1 << 64) - 1
+
 
 class Timetable:
+    """
+    A schedule of course room pairs per (day, period) slot.
+
+    The schedule is copy-on-write: a clone shares its day lists and slots with the timetable it was cloned from, and
+    a day list or slot is only copied when one of the two timetables changes it. Because of this, the schedule must
+    only be changed through add_course_room_pair, remove_course_room_pair, set_course_room_pair,
+    set_course_room_pairs and exchange_slots. The same primitives keep the feasibility index used by
+    get_feasible_slot up to date once it has been built; a clone shares the index until either timetable changes.
 
-    def __init__(self, problem: Problem):
+    Between begin and commit or rollback, the primitives also record an undo log, so that a move can be tried in
+    place and reverted without cloning.
+    """
+
+    def __init__(self, problem: Problem, schedule: Optional[List[List[Slot]]] = None):
         self.problem: Problem = problem
+        self.model: ProblemModel = self.problem.model
         self.constraints: List[Constraint] = self.problem.constraints
         self.rooms: List[Room] = self.problem.rooms
         self.courses: List[Course] = self.problem.courses
         self.curricula: List[Curriculum] = self.problem.curricula
 
-        self.schedule: List[List[Slot]] = [
-            [Slot() for _ in range(problem.number_of_periods_per_day)]
-            for _ in range(problem.number_of_days)
-        ]
+        self._feasibility_index: Optional[FeasibilityIndex] = None
+        self._shared_feasibility_index: bool = False
+        self._undo_log: Optional[List[tuple]] = None
+
+        self.schedule: List[List[Slot]]
+        self._owned_slots: List[Optional[List[bool]]]
+        if schedule is None:
+            self._clear_slots()
+        else:
+            self.schedule = list(schedule)
+            self._owned_slots = [None] * len(schedule)
 
-        self.course_and_first_room = {}
-        for course in self.courses:
-            self.course_and_first_room[course.course_id] = ""
+        self.hash: int = 0
 
-    def _get_course(self, course_id: str) -> Course:
+        self.course_and_first_room = dict.fromkeys(self.model.course_ids, "")
+
+    def _make_day_writable(self, day: int) -> List[bool]:
         """
-            Helper function to get a course by its id.
-            :param course_id: str
-            :return: Course
+            Helper function to give the timetable its own copy of a day list shared with a clone.
+            :param day: int
+            :return: the ownership flags of the slots of the day
         """
 
-        return [course for course in self.courses if course.course_id == course_id][0]
+        owned_slots: Optional[List[bool]] = self._owned_slots[day]
+
+        if owned_slots is None:
+            self.schedule[day] = list(self.schedule[day])
+            owned_slots = [False] * len(self.schedule[day])
+            self._owned_slots[day] = owned_slots
+
+        return owned_slots
 
-    def _already_in_slot(self, day: int, period: int, course_id: str) -> bool:
+    def _get_writable_slot(self, day: int, period: int) -> Slot:
         """
-            Helper function to check if a course is already in a slot.
+            Helper function to get a slot that is not shared with any clone, copying it if needed.
             :param day: int
             :param period: int
-            :param course_id: str
-            :return: bool
+            :return: Slot
         """
 
-        course_ids_in_slot: List[str] = [
-            course.course_id for course, room in self.schedule[day][period].course_room_pairs
-        ]
+        owned_slots: List[bool] = self._make_day_writable(day)
+
+        if not owned_slots[period]:
+            self.schedule[day][period] = self.schedule[day][period].clone()
+            owned_slots[period] = True
+
+        return self.schedule[day][period]
+
+    def _get_writable_feasibility_index(self) -> Optional[FeasibilityIndex]:
+        """
+            Helper function to get the feasibility index for an update, copying it if it is shared with a clone.
+            :return: the index, or None if it has not been built
+        """
+
+        if self._feasibility_index is not None and self._shared_feasibility_index:
+            self._feasibility_index = self._feasibility_index.copy()
+            self._shared_feasibility_index = False
 
-        return course_id in course_ids_in_slot
+        return self._feasibility_index
 
-    def _violating_unavailability_constraint(self, day: int, period: int, course_id: str) -> bool:
+    def _get_feasibility_index(self) -> FeasibilityIndex:
         """
-            Helper function to check if a slot violates an unavailability constraint.
+            Helper function to get the feasibility index, building it from the schedule on first use.
+            :return: FeasibilityIndex
+        """
+
+        if self._feasibility_index is None:
+            feasibility_index: FeasibilityIndex = FeasibilityIndex(self.model)
+
+            for day in range(len(self.schedule)):
+                for period in range(len(self.schedule[day])):
+                    for course, room in self.schedule[day][period].course_room_pairs:
+                        feasibility_index.add(course.index, room.index, day, period)
+
+            self._feasibility_index = feasibility_index
+            self._shared_feasibility_index = False
+
+        return self._feasibility_index
+
+    def _get_pair_key(self, day: int, period: int, course_room_pair: Tuple[Course, Room]) -> int:
+        """
+            Helper function to get the hash key of a course room pair placed in a slot.
             :param day: int
             :param period: int
-            :param course_id: str
-            :return: bool
+            :param course_room_pair: Tuple[Course, Room]
+            :return: int
         """
 
-        course_constraints = [
-            constraint for constraint in self.constraints
-            if constraint.course_id == course_id
-        ]
+        course, room = course_room_pair
+        return self.model.get_zobrist_key(course.index, room.index, day, period)
+
+    def add_course_room_pair(self, day: int, period: int, course_room_pair: Tuple[Course, Room]) -> None:
+        """
+            Appends a course room pair to a slot.
+            :param day: int
+            :param period: int
+            :param course_room_pair: Tuple[Course, Room]
+            :return: None
+        """
 
-        return any(
-            constraint.day == day and constraint.period == period for constraint in
-            course_constraints
+        self._insert_course_room_pair(
+            day,
+            period,
+            len(self.schedule[day][period].course_room_pairs),
+            course_room_pair
         )
 
-    def _violating_curriculum_constraint(self, day: int, period: int, course_id: str) -> bool:
+    def _insert_course_room_pair(
+            self,
+            day: int,
+            period: int,
+            index: int,
+            course_room_pair: Tuple[Course, Room]
+    ) -> None:
         """
-            Helper function to check if a slot violates a curriculum constraint.
+            Helper function to insert a course room pair at the given index of a slot.
             :param day: int
             :param period: int
-            :param course_id: str
-            :return: bool
+            :param index: int
+            :param course_room_pair: Tuple[Course, Room]
+            :return: None
         """
 
-        course_ids_in_slot: List[str] = [
-            course.course_id for course, room in self.schedule[day][period].course_room_pairs
-        ]
+        self._get_writable_slot(day, period).course_room_pairs.insert(index, course_room_pair)
+        self.hash = (self.hash + self._get_pair_key(day, period, course_room_pair)) & _HASH_MASK
 
-        c_id: str
-        for c_id in course_ids_in_slot:
+        feasibility_index: Optional[FeasibilityIndex] = self._get_writable_feasibility_index()
+        if feasibility_index is not None:
+            feasibility_index.add(course_room_pair[0].index, course_room_pair[1].index, day, period)
 
-            curriculum: Curriculum
-            for curriculum in self.problem.curricula:
-                if c_id in curriculum.course_ids and course_id in curriculum.course_ids:
-                    return True
+        if self._undo_log is not None:
+            self._undo_log.append(('insert', day, period, index))
 
-        return False
+    def remove_course_room_pair(self, day: int, period: int, index: int = -1) -> Tuple[Course, Room]:
+        """
+            Removes the course room pair at the given index of a slot and returns it.
+            :param day: int
+            :param period: int
+            :param index: int
+            :return: Tuple[Course, Room]
+        """
+
+        course_room_pairs: List[Tuple[Course, Room]] = self._get_writable_slot(day, period).course_room_pairs
+        if index < 0:
+            index += len(course_room_pairs)
+        course_room_pair: Tuple[Course, Room] = course_room_pairs.pop(index)
+        self.hash = (self.hash - self._get_pair_key(day, period, course_room_pair)) & _HASH_MASK
+
+        feasibility_index: Optional[FeasibilityIndex] = self._get_writable_feasibility_index()
+        if feasibility_index is not None:
+            feasibility_index.remove(course_room_pair[0].index, course_room_pair[1].index, day, period)
+
+        if self._undo_log is not None:
+            self._undo_log.append(('remove', day, period, index, course_room_pair))
+
+        return course_room_pair
 
-    def _violating_teacher_constraint(self, day: int, period: int, teacher_id: str) -> bool:
+    def set_course_room_pair(self, day: int, period: int, index: int, course_room_pair: Tuple[Course, Room]) -> None:
         """
-            Helper function to check if a slot violates a teacher constraint.
+            Replaces the course room pair at the given index of a slot.
             :param day: int
             :param period: int
-            :param teacher_id: str
-            :return: bool
+            :param index: int
+            :param course_room_pair: Tuple[Course, Room]
+            :return: None
         """
 
-        teacher_ids_in_slot: List[str] = [
-            course.teacher_id for course, room in self.schedule[day][period].course_room_pairs
-        ]
+        course_room_pairs: List[Tuple[Course, Room]] = self._get_writable_slot(day, period).course_room_pairs
+        self.hash = (
+                self.hash
+                - self._get_pair_key(day, period, course_room_pairs[index])
+                + self._get_pair_key(day, period, course_room_pair)
+        ) & _HASH_MASK
+
+        feasibility_index: Optional[FeasibilityIndex] = self._get_writable_feasibility_index()
+        if feasibility_index is not None:
+            feasibility_index.remove(course_room_pairs[index][0].index, course_room_pairs[index][1].index, day, period)
+            feasibility_index.add(course_room_pair[0].index, course_room_pair[1].index, day, period)
 
-        return teacher_id in teacher_ids_in_slot
+        if self._undo_log is not None:
+            self._undo_log.append(('set', day, period, index, course_room_pairs[index]))
 
-    def _violating_room_occupancy_constraint(self, day: int, period: int, course_id: str) -> bool:
+        course_room_pairs[index] = course_room_pair
+
+    def set_course_room_pairs(self, day: int, period: int, course_room_pairs: List[Tuple[Course, Room]]) -> None:
         """
-            Helper function to check if a slot violates a room capacity constraint.
+            Replaces all the course room pairs of a slot.
             :param day: int
-            :param period:  int
-            :param course_id: str
-            :return: bool
+            :param period: int
+            :param course_room_pairs: List[Tuple[Course, Room]]
+            :return: None
+        """
+
+        slot: Slot = self._get_writable_slot(day, period)
+        feasibility_index: Optional[FeasibilityIndex] = self._get_writable_feasibility_index()
+
+        for course, room in slot.course_room_pairs:
+            self.hash = (self.hash - self._get_pair_key(day, period, (course, room))) & _HASH_MASK
+            if feasibility_index is not None:
+                feasibility_index.remove(course.index, room.index, day, period)
+        for course, room in course_room_pairs:
+            self.hash = (self.hash + self._get_pair_key(day, period, (course, room))) & _HASH_MASK
+            if feasibility_index is not None:
+                feasibility_index.add(course.index, room.index, day, period)
+
+        if self._undo_log is not None:
+            self._undo_log.append(('set_all', day, period, slot.course_room_pairs))
+
+        slot.course_room_pairs = list(course_room_pairs)
+
+    def exchange_slots(self, first_day: int, first_period: int, second_day: int, second_period: int) -> None:
+        """
+            Exchanges the contents of two slots.
+            :param first_day: int
+            :param first_period: int
+            :param second_day: int
+            :param second_period: int
+            :return: None
         """
 
-        course = [course for course in self.courses if course.course_id == course_id][0]
-        course_room_pairs = self.schedule[day][period].course_room_pairs
+        first_slot: Slot = self.schedule[first_day][first_period]
+        second_slot: Slot = self.schedule[second_day][second_period]
+
+        for course_room_pair in first_slot.course_room_pairs:
+            self.hash = (
+                    self.hash
+                    - self._get_pair_key(first_day, first_period, course_room_pair)
+                    + self._get_pair_key(second_day, second_period, course_room_pair)
+            ) & _HASH_MASK
+        for course_room_pair in second_slot.course_room_pairs:
+            self.hash = (
+                    self.hash
+                    - self._get_pair_key(second_day, second_period, course_room_pair)
+                    + self._get_pair_key(first_day, first_period, course_room_pair)
+            ) & _HASH_MASK
+
+        feasibility_index: Optional[FeasibilityIndex] = self._get_writable_feasibility_index()
+        if feasibility_index is not None:
+            for course, room in first_slot.course_room_pairs:
+                feasibility_index.remove(course.index, room.index, first_day, first_period)
+                feasibility_index.add(course.index, room.index, second_day, second_period)
+            for course, room in second_slot.course_room_pairs:
+                feasibility_index.remove(course.index, room.index, second_day, second_period)
+                feasibility_index.add(course.index, room.index, first_day, first_period)
+
+        first_owned_slots: List[bool] = self._make_day_writable(first_day)
+        second_owned_slots: List[bool] = self._make_day_writable(second_day)
+        first_owned_slots[first_period], second_owned_slots[second_period] = (
+            second_owned_slots[second_period],
+            first_owned_slots[first_period]
+        )
+
+        self.schedule[first_day][first_period] = second_slot
+        self.schedule[second_day][second_period] = first_slot
+
+        if self._undo_log is not None:
+            self._undo_log.append(('exchange', first_day, first_period, second_day, second_period))
+
+    def begin(self) -> None:
+        """
+            Starts recording the changes made through the primitives, so they can be reverted with rollback or kept
+            with commit.
+            :return: None
+        """
+
+        self._undo_log = []
+
+    def commit(self) -> None:
+        """
+            Keeps the changes made since begin and stops recording.
+            :return: None
+        """
+
+        self._undo_log = None
 
-        if len(course_room_pairs) == len(self.rooms):
-            return True
+    def rollback(self) -> None:
+        """
+            Reverts the changes made since begin, newest first, and stops recording.
+            :return: None
+        """
 
-        occupied_room_ids = [room.room_id for _, room in course_room_pairs]
-        available_rooms = [
-            room for room in self.rooms
-            if (
-                    room.room_capacity >= course.number_of_students
-                    and room.room_id not in occupied_room_ids
+        undo_log: List[tuple] = self._undo_log or []
+        self._undo_log = None
+
+        for change in reversed(undo_log):
+            operation: str = change[0]
+
+            if operation == 'insert':
+                self.remove_course_room_pair(change[1], change[2], change[3])
+            elif operation == 'remove':
+                self._insert_course_room_pair(change[1], change[2], change[3], change[4])
+            elif operation == 'set':
+                self.set_course_room_pair(change[1], change[2], change[3], change[4])
+            elif operation == 'set_all':
+                self.set_course_room_pairs(change[1], change[2], change[3])
+            elif operation == 'exchange':
+                self.exchange_slots(change[1], change[2], change[3], change[4])
+            elif operation == 'first_room':
+                self.course_and_first_room[change[1]] = change[2]
+
+    def get_delta_evaluator(self) -> DeltaEvaluator:
+        """
+            Returns the delta evaluator of the problem, brought up to date with the timetable's schedule. The problem
+            keeps one evaluator, with a copy of the schedule of its own: the first call evaluates the schedule in
+            full, and later calls, for this timetable or another one of the problem, only apply the slots that differ
+            from the schedule it saw last, which the heuristics applied in between keep to a few.
+            :return: DeltaEvaluator
+        """
+
+        delta_evaluator: Optional[DeltaEvaluator] = self.problem.delta_evaluator
+
+        if delta_evaluator is None or delta_evaluator.model is not self.model:
+            delta_evaluator = DeltaEvaluator(
+                [[slot.clone() for slot in slots] for slots in self.schedule],
+                self.constraints,
+                self.curricula,
+                self.courses,
+                self.model
             )
-        ]
+            self.problem.delta_evaluator = delta_evaluator
+        else:
+            delta_evaluator.synchronize(self.schedule)
 
-        return len(available_rooms) == 0
+        return delta_evaluator
 
-    def _calculate_saturation_degree(self, course_id: str, teacher_id: str) -> int:
+    def _get_array_timetable(self) -> 'ArrayTimetable':
         """
-            calculate the number of feasible periods in the timetable at the current point of
-             construction are given priority for the course
-            :param course_id: str
-            :param teacher_id: str
-            :return: int
+            Helper function to get the array representation of the timetable for the vectorized validator. It is
+            imported here, so that numpy is only needed when VECTORIZED_EVALUATION is enabled.
+            :return: ArrayTimetable
         """
 
-        saturation_degree = self.problem.number_of_days * self.problem.number_of_periods_per_day
+        from src.common.array_timetable import ArrayTimetable
 
-        for day in range(len(self.schedule)):
-            for period in range(len(self.schedule[day])):
-                if self._already_in_slot(day, period, course_id):
-                    saturation_degree -= 1
-                if self._violating_unavailability_constraint(day, period, course_id):
-                    saturation_degree -= 1
-                if self._violating_curriculum_constraint(day, period, course_id):
-                    saturation_degree -= 1
-                if self._violating_teacher_constraint(day, period, teacher_id):
-                    saturation_degree -= 1
-                if self._violating_room_occupancy_constraint(day, period, course_id):
-                    saturation_degree -= 1
+        return ArrayTimetable.from_timetable(self)
 
-        return saturation_degree
+    def get_hard_constraints_breakdown(self) -> Dict[str, int]:
+        """
+            Returns the number of violations of each hard constraint, answered from the problem's cost cache when
+            a timetable with the same hash was evaluated before, and otherwise by the delta evaluator, or by the
+            vectorized validator when VECTORIZED_EVALUATION is enabled.
+            :return: Dict[str, int]
+        """
 
-    def _get_saturation_degree_dict(self):
-        """"
-            Generates and returns a dictionary of the saturation degree of each course
-            :return: dict
-        """
-
-        saturation_degree_dict = {
-            course.course_id: self._calculate_saturation_degree(
-                course.course_id,
-                course.teacher_id
-            ) for course in self.courses
-        }
-
-        sorted_courses = sorted(
-            self.courses,
-            key=lambda course: (
-                saturation_degree_dict[course.course_id],
-                -course.number_of_students
+        if VECTORIZED_EVALUATION:
+            return self.problem.cost_cache.get_breakdown(
+                self.hash,
+                'hard',
+                lambda: self._get_array_timetable().get_hard_constraints_breakdown()
             )
+
+        return self.problem.cost_cache.get_breakdown(
+            self.hash,
+            'hard',
+            lambda: dict(self.get_delta_evaluator().hard_constraints_breakdown)
         )
 
-        return {
-            course.course_id: saturation_degree_dict[course.course_id] for course in sorted_courses
-        }
+    def get_soft_constraints_breakdown(self) -> Dict[str, int]:
+        """
+            Returns the number of violations of each soft constraint, answered from the problem's cost cache when
+            a timetable with the same hash was evaluated before, and otherwise by the delta evaluator, or by the
+            vectorized validator when VECTORIZED_EVALUATION is enabled.
+            :return: Dict[str, int]
+        """
 
-    def _get_room_for_course(
-            self,
-            course_id: str,
-            first_room: str,
-            course_room_pairs: List[Tuple[Course, Room]]
-    ) -> Room:
+        if VECTORIZED_EVALUATION:
+            return self.problem.cost_cache.get_breakdown(
+                self.hash,
+                'soft',
+                lambda: self._get_array_timetable().get_soft_constraints_breakdown()
+            )
+
+        return self.problem.cost_cache.get_breakdown(
+            self.hash,
+            'soft',
+            lambda: dict(self.get_delta_evaluator().soft_constraints_breakdown)
+        )
+
+    def get_constraints_cost(self) -> Tuple[int, int]:
+        """
+            Returns the number of violated hard and soft constraints.
+            :return: Tuple[int, int]
         """
-            Returns the room for a course based on the room occupancy constraint and feasibility
+
+        return (
+            sum(self.get_hard_constraints_breakdown().values()),
+            sum(self.get_soft_constraints_breakdown().values())
+        )
+
+    def _get_course(self, course_id: str) -> Course:
+        """
+            Helper function to get a course by its id.
             :param course_id: str
-            :param course_room_pairs: List[Tuple[Course, Room]]
-            :return: Room
+            :return: Course
         """
 
-        course = self._get_course(course_id)
-        number_of_students = course.number_of_students
+        return self.model.get_course(course_id)
 
-        occupied_rooms_ids = [room.room_id for _, room in course_room_pairs]
+    def _get_room_for_course(self, course_id: str, first_room: str, day: int, period: int) -> Room:
+        """
+            Returns the room for a course in a slot based on the room occupancy constraint and feasibility
+            :param course_id: str
+            :param first_room: str
+            :param day: int
+            :param period: int
+            :return: Room
+        """
+
+        course: Course = self._get_course(course_id)
 
-        available_rooms = [
-            room for room in self.rooms
-            if room.room_capacity >= number_of_students and room.room_id not in occupied_rooms_ids
+        return self.model.rooms[
+            self.problem.room_allocator.get_room(
+                course.index,
+                self.model.room_index.get(first_room),
+                self.get_room_occupancy(day, period)
+            )
         ]
 
-        available_rooms.sort(key=lambda room: room.room_capacity)
+    def get_room_occupancy(self, day: int, period: int) -> int:
+        """
+            Returns the bitmask of the rooms used in a slot, kept up to date by the feasibility index.
+            :param day: int
+            :param period: int
+            :return: int
+        """
 
-        if len(available_rooms) > 0:
-            for room in available_rooms:
-                if room.room_id == first_room:
-                    return room
-            return available_rooms[0]
-        else:
-            not_occupied_rooms = [
-                room for room in self.rooms if room.room_id not in occupied_rooms_ids
-            ]
+        return self._get_feasibility_index().get_occupancy(day, period)
 
-            if len(not_occupied_rooms) == 0:
-                for room in self.rooms:
-                    if room.room_id == first_room:
-                        return room.clone()
-                    elif room.room_capacity >= number_of_students:
-                        return room.clone()
+    def reassign_rooms(self, day: int, period: int) -> None:
+        """
+            Re-assigns the rooms of the lectures of a slot to distinct rooms minimising their room capacity and room
+            stability violations, given the rooms of the other lectures of each course. Slots with more lectures than
+            rooms are left unchanged.
+            :param day: int
+            :param period: int
+            :return: None
+        """
 
-            not_occupied_rooms.sort(key=lambda room: room.room_capacity, reverse=True)
-            return not_occupied_rooms[0]
+        course_room_pairs: List[Tuple[Course, Room]] = self.schedule[day][period].course_room_pairs
+        if len(course_room_pairs) == 0 or len(course_room_pairs) > len(self.rooms):
+            return
+
+        feasibility_index: FeasibilityIndex = self._get_feasibility_index()
+        course_room_counts: Dict[int, Dict[int, int]] = {}
+        for course, _ in course_room_pairs:
+            if course.index not in course_room_counts:
+                course_room_counts[course.index] = {
+                    room: count for room, count in enumerate(feasibility_index.get_room_counts(course.index)) if count
+                }
+        for course, room in course_room_pairs:
+            room_counts: Dict[int, int] = course_room_counts[course.index]
+            room_counts[room.index] -= 1
+            if room_counts[room.index] == 0:
+                del room_counts[room.index]
+
+        rooms: List[int] = self.problem.room_allocator.assign_rooms(
+            [course.index for course, _ in course_room_pairs],
+            [course_room_counts[course.index] for course, _ in course_room_pairs],
+            [room.index for _, room in course_room_pairs]
+        )
+
+        if any(room.index != new_room for (_, room), new_room in zip(course_room_pairs, rooms)):
+            self.set_course_room_pairs(
+                day,
+                period,
+                [(course, self.model.rooms[new_room]) for (course, _), new_room in zip(course_room_pairs, rooms)]
+            )
 
     def _calculate_soft_constraint(
             self,
@@ -237,33 +516,31 @@ class Timetable:
             feasible_slots: List[Tuple[int, int]]
     ) -> int:
         """"
-            Calculates the soft constraint cost for each feasible slot and returns the index of the slot with the
-            smallest cost
+            Calculates the marginal soft constraint cost of placing the course in each feasible slot and returns the
+            index of the slot with the smallest cost
             :param course_id: str
             :param feasible_slots: List[Tuple[int, int]]
             :return: int
         """
 
-        slots_costs = []
         course: Course = self._get_course(course_id)
 
-        for day, period in feasible_slots:
-            room: Room = self._get_room_for_course(
-                course_id,
-                self.course_and_first_room[course_id],
-                self.schedule[day][period].course_room_pairs
+        placements: List[Tuple[int, int, Room]] = [
+            (
+                day,
+                period,
+                self._get_room_for_course(course_id, self.course_and_first_room[course_id], day, period)
             )
+            for day, period in feasible_slots
+        ]
 
-            self.schedule[day][period].course_room_pairs.append((course, room))
-            slots_costs.append(
-                get_num_of_violated_soft_constraints(
-                    self.schedule,
-                    self.problem.curricula,
-                    self.courses
-                )
-            )
-            self.schedule[day][period].course_room_pairs.remove(
-                self.schedule[day][period].course_room_pairs[-1])
+        slots_costs: List[int] = get_insertion_soft_cost_deltas(
+            self.schedule,
+            self.curricula,
+            course,
+            placements,
+            self.model
+        )
 
         index_of_smallest_cost = 0
         smallest_cost = slots_costs[index_of_smallest_cost]
@@ -275,6 +552,24 @@ class Timetable:
 
         return index_of_smallest_cost
 
+    def get_feasible_slots(self, course_id: str) -> List[Tuple[int, int]]:
+        """
+            Returns the (day, period) slots, in day-major order, where a lecture of the course can be placed without
+            violating a hard constraint.
+            :param course_id: str
+            :return: List[Tuple[int, int]]
+        """
+
+        feasible_periods: int = self._get_feasibility_index().get_feasible_periods(self.model.course_index[course_id])
+        feasible_slots: List[Tuple[int, int]] = []
+
+        while feasible_periods:
+            lowest_bit: int = feasible_periods & -feasible_periods
+            feasible_slots.append(divmod(lowest_bit.bit_length() - 1, self.model.number_of_periods_per_day))
+            feasible_periods ^= lowest_bit
+
+        return feasible_slots
+
     def get_feasible_slot(self, course_id: str, retry: bool) -> Tuple[int, int, Optional[Room]]:
         """
             Returns a feasible slot for a course in the timetable in the form of a tuple (day, period, room)
@@ -282,22 +577,7 @@ class Timetable:
             :return: Tuple[int, int, Room]
         """
 
-        teacher_id = [
-            course.teacher_id for course in self.courses if course.course_id == course_id
-        ][0]
-
-        feasible_slots: List[Tuple[int, int]] = []
-
-        for day in range(len(self.schedule)):
-            for period in range(len(self.schedule[day])):
-                if (
-                        not self._already_in_slot(day, period, course_id) and
-                        not self._violating_unavailability_constraint(day, period, course_id) and
-                        not self._violating_curriculum_constraint(day, period, course_id) and
-                        not self._violating_teacher_constraint(day, period, teacher_id) and
-                        not self._violating_room_occupancy_constraint(day, period, course_id)
-                ):
-                    feasible_slots.append((day, period))
+        feasible_slots: List[Tuple[int, int]] = self.get_feasible_slots(course_id)
 
         if len(feasible_slots) > 0:
             feasible_slot_index = (
@@ -308,13 +588,11 @@ class Timetable:
 
             first_room_id = self.course_and_first_room[course_id]
 
-            room = self._get_room_for_course(
-                course_id,
-                first_room_id,
-                self.schedule[day][period].course_room_pairs
-            )
+            room = self._get_room_for_course(course_id, first_room_id, day, period)
 
             if first_room_id == "":
+                if self._undo_log is not None:
+                    self._undo_log.append(('first_room', course_id, first_room_id))
                 self.course_and_first_room[course_id] = room.room_id
             return day, period, room
 
@@ -322,53 +600,93 @@ class Timetable:
 
     def clone(self):
         """
-            Clones the timetable.
+            Clones the timetable. The clone shares the schedule with this timetable until either of them changes it.
             :return: Timetable
         """
 
-        timetable = Timetable(self.problem)
-        timetable.schedule = [
-            [slot.clone() for slot in day] for day in self.schedule
-        ]
+        timetable = Timetable(self.problem, self.schedule)
+        timetable.hash = self.hash
+        self._owned_slots = [None] * len(self.schedule)
+
+        if self._feasibility_index is not None:
+            timetable._feasibility_index = self._feasibility_index
+            timetable._shared_feasibility_index = True
+            self._shared_feasibility_index = True
+
+        return timetable
+
+    def encode(self) -> bytes:
+        """
+            Encodes the schedule compactly, to be shipped between processes: for every slot in day-major order, its
+            number of course room pairs followed by the course and room index of each pair.
+            :return: bytes
+        """
+
+        encoding: array = array('H')
+
+        for day in self.schedule:
+            for slot in day:
+                encoding.append(len(slot.course_room_pairs))
+                for course, room in slot.course_room_pairs:
+                    encoding.append(course.index)
+                    encoding.append(room.index)
+
+        return encoding.tobytes()
+
+    @staticmethod
+    def decode(problem: Problem, encoding: bytes) -> 'Timetable':
+        """
+            Rebuilds a timetable of a problem from its encoding, keeping the order of the course room pairs of every
+            slot.
+            :param problem: Problem
+            :param encoding: bytes
+            :return: Timetable
+        """
+
+        values: array = array('H')
+        values.frombytes(encoding)
+
+        timetable: Timetable = Timetable(problem)
+        position: int = 0
+
+        for day in range(len(timetable.schedule)):
+            for period in range(len(timetable.schedule[day])):
+                number_of_pairs: int = values[position]
+                position += 1
+
+                for _ in range(number_of_pairs):
+                    timetable.add_course_room_pair(
+                        day,
+                        period,
+                        (timetable.model.courses[values[position]], timetable.model.rooms[values[position + 1]])
+                    )
+                    position += 2
 
         return timetable
 
     def initialize_slots(self) -> None:
         """
-            Initializes the slots of the timetable.
+            Initializes the slots of the timetable, always scheduling next a lecture of the course with the smallest
+            saturation degree (DSatur).
             :return: None
         """
 
-        number_of_lectures_left_to_be_scheduled_dict: dict = {
-            course.course_id: course.number_of_lectures for course in self.courses
-        }
+        saturation_degree_queue: SaturationDegreeQueue = SaturationDegreeQueue(self.model, self.schedule)
 
         retry: bool = False
 
-        while any(
-                number_of_lectures_left_to_be_scheduled_dict[course.course_id] > 0
-                for course in self.courses
-        ):
-            saturation_degree_dict = self._get_saturation_degree_dict()
-
-            for course_id in list(saturation_degree_dict.keys()):
-                if number_of_lectures_left_to_be_scheduled_dict[course_id] == 0:
-                    del saturation_degree_dict[course_id]
-
-            course_id = list(saturation_degree_dict.keys())[0]
-            course = [course for course in self.courses if course.course_id == course_id][0]
-            day, period, room = self.get_feasible_slot(course_id, retry)
+        while len(saturation_degree_queue) > 0:
+            course: Course = self.model.courses[saturation_degree_queue.peek()]
+            day, period, room = self.get_feasible_slot(course.course_id, retry)
 
             if day == -1 and period == -1 and room is None:
                 self._clear_slots()
-                number_of_lectures_left_to_be_scheduled_dict = {
-                    course.course_id: course.number_of_lectures for course in self.courses
-                }
+                saturation_degree_queue = SaturationDegreeQueue(self.model, self.schedule)
                 retry = True
                 continue
 
-            self.schedule[day][period].course_room_pairs.append((course, room))
-            number_of_lectures_left_to_be_scheduled_dict[course_id] -= 1
+            self.add_course_room_pair(day, period, (course, room))
+            saturation_degree_queue.record_lecture(course.index, room.index, day, period)
 
     def print(self):
         """
@@ -401,3 +719,10 @@ class Timetable:
             [Slot() for _ in range(self.problem.number_of_periods_per_day)]
             for _ in range(self.problem.number_of_days)
         ]
+        self._owned_slots = [
+            [True] * self.problem.number_of_periods_per_day
+            for _ in range(self.problem.number_of_days)
+        ]
+        self.hash = 0
+        self._feasibility_index = None
+        self._shared_feasibility_index = False
@@ -0,0 +1,264 @@
+from functools import lru_cache
+from typing import Dict
+
+import numpy as np
+
+from src.common.constraints_validator import HARD_CONSTRAINT_COMPONENTS, SOFT_CONSTRAINT_COMPONENTS
+from src.common.problem_model import ProblemModel
+
+COURSE: int = 0
+ROOM: int = 1
+DAY: int = 2
+PERIOD: int = 3
+
+
+class ModelArrays:
+    """
+    NumPy arrays of the parts of a ProblemModel used by the vectorized cost kernels.
+    """
+
+    def __init__(self, model: ProblemModel):
+        self.number_of_days: int = model.number_of_days
+        self.number_of_periods_per_day: int = model.number_of_periods_per_day
+        self.number_of_periods: int = model.number_of_periods
+        self.number_of_courses: int = len(model.courses)
+        self.number_of_rooms: int = len(model.rooms)
+        self.number_of_teachers: int = len(model.teacher_ids)
+
+        self.course_teacher: np.ndarray = np.array(model.course_teacher, dtype=np.int64)
+        self.lectures: np.ndarray = np.array(model.lectures, dtype=np.int64)
+        self.min_working_days: np.ndarray = np.array(model.min_working_days, dtype=np.int64)
+        self.shared_curricula: np.ndarray = np.array(model.shared_curricula, dtype=np.int64).reshape(
+            self.number_of_courses,
+            self.number_of_courses
+        )
+        self.shares_curriculum: np.ndarray = (self.shared_curricula > 0).astype(np.int64)
+        self.capacity_penalty: np.ndarray = np.array(model.capacity_penalty, dtype=np.int64).reshape(
+            self.number_of_courses,
+            self.number_of_rooms
+        )
+        self.unavailability_constraints: np.ndarray = np.array(
+            model.unavailability_constraints,
+            dtype=np.int64
+        ).reshape(-1, 3)
+
+
+@lru_cache(maxsize=None)
+def get_model_arrays(model: ProblemModel) -> ModelArrays:
+    """
+    Returns the arrays of a model, building them on first use.
+    :param model: ProblemModel
+    :return: ModelArrays
+    """
+    return ModelArrays(model)
+
+
+def _get_slot_course_counts(lectures: np.ndarray, arrays: ModelArrays) -> np.ndarray:
+    """
+    Helper function to count the lectures of every course in every slot.
+    :param lectures: np.ndarray of (course, room, day, period) rows
+    :param arrays: ModelArrays
+    :return: np.ndarray of shape (number_of_periods, number_of_courses)
+    """
+    slots: np.ndarray = lectures[:, DAY] * arrays.number_of_periods_per_day + lectures[:, PERIOD]
+    return np.bincount(
+        slots * arrays.number_of_courses + lectures[:, COURSE],
+        minlength=arrays.number_of_periods * arrays.number_of_courses
+    ).reshape(arrays.number_of_periods, arrays.number_of_courses)
+
+
+def _get_number_of_excess_pairs(keys: np.ndarray, number_of_keys: int) -> int:
+    """
+    Helper function to get the number of entries that repeat a key already seen, i.e. len(keys) - len(set(keys)).
+    :param keys: np.ndarray
+    :param number_of_keys: int
+    :return: int
+    """
+    counts: np.ndarray = np.bincount(keys, minlength=number_of_keys)
+    return int(np.maximum(counts - 1, 0).sum())
+
+
+#   For Hard Constraints
+def _get_number_of_conflict_violations(slot_course_counts: np.ndarray, arrays: ModelArrays) -> int:
+    """
+        Two courses of the same curriculum must not be scheduled at the same time. Every pair of lectures in a slot
+        counts once per curriculum both courses belong to.
+        :param slot_course_counts: np.ndarray
+        :param arrays: ModelArrays
+        :return: number_of_violations
+    """
+    ordered_pairs: int = int(((slot_course_counts @ arrays.shared_curricula) * slot_course_counts).sum())
+    same_lecture_pairs: int = int((slot_course_counts * np.diag(arrays.shared_curricula)).sum())
+    return (ordered_pairs - same_lecture_pairs) // 2
+
+
+def _get_number_of_room_occupancy_violations(lectures: np.ndarray, arrays: ModelArrays) -> int:
+    """
+        Each room must only be scheduled once in a period.
+        :param lectures: np.ndarray
+        :param arrays: ModelArrays
+        :return: number_of_violations
+    """
+    slots: np.ndarray = lectures[:, DAY] * arrays.number_of_periods_per_day + lectures[:, PERIOD]
+    return _get_number_of_excess_pairs(
+        slots * arrays.number_of_rooms + lectures[:, ROOM],
+        arrays.number_of_periods * arrays.number_of_rooms
+    )
+
+
+def _get_number_of_teacher_violations(lectures: np.ndarray, arrays: ModelArrays) -> int:
+    """
+        Each teacher must not be scheduled more than once in a period
+        :param lectures: np.ndarray
+        :param arrays: ModelArrays
+        :return: number_of_violations
+    """
+    slots: np.ndarray = lectures[:, DAY] * arrays.number_of_periods_per_day + lectures[:, PERIOD]
+    return _get_number_of_excess_pairs(
+        slots * arrays.number_of_teachers + arrays.course_teacher[lectures[:, COURSE]],
+        arrays.number_of_periods * arrays.number_of_teachers
+    )
+
+
+def _get_number_of_unavailability_violations(slot_course_counts: np.ndarray, arrays: ModelArrays) -> int:
+    """
+        The unavailability constraints must not be violated.
+        :param slot_course_counts: np.ndarray
+        :param arrays: ModelArrays
+        :return: number_of_violations
+    """
+    constraints: np.ndarray = arrays.unavailability_constraints
+    slots: np.ndarray = constraints[:, 1] * arrays.number_of_periods_per_day + constraints[:, 2]
+    return int((slot_course_counts[slots, constraints[:, 0]] > 0).sum())
+
+
+def _get_number_of_lecture_allocations_violations(lectures: np.ndarray, arrays: ModelArrays) -> int:
+    """
+        Each course must be scheduled exactly the number of times specified in the problem.
+        :param lectures: np.ndarray
+        :param arrays: ModelArrays
+        :return: number_of_violations
+    """
+    counts: np.ndarray = np.bincount(lectures[:, COURSE], minlength=arrays.number_of_courses)
+    return int((counts != arrays.lectures).sum())
+
+
+#  For Soft Constraints
+def _get_number_of_room_capacity_violations(lectures: np.ndarray, arrays: ModelArrays) -> int:
+    """
+    The number of students in a scheduled course must not exceed the room capacity.
+    :param lectures: np.ndarray
+    :param arrays: ModelArrays
+    :return: number_of_violations
+    """
+    return int(arrays.capacity_penalty[lectures[:, COURSE], lectures[:, ROOM]].sum())
+
+
+def _get_number_of_room_stability_violations(lectures: np.ndarray, arrays: ModelArrays) -> int:
+    """
+    Courses should be scheduled in the same room as much as possible.
+    :param lectures: np.ndarray
+    :param arrays: ModelArrays
+    :return: number_of_violations
+    """
+    room_counts: np.ndarray = np.bincount(
+        lectures[:, COURSE] * arrays.number_of_rooms + lectures[:, ROOM],
+        minlength=arrays.number_of_courses * arrays.number_of_rooms
+    ).reshape(arrays.number_of_courses, arrays.number_of_rooms)
+    return int(np.maximum(arrays.lectures - room_counts.max(axis=1, initial=0), 0).sum())
+
+
+def _get_number_of_minimum_working_days_violations(lectures: np.ndarray, arrays: ModelArrays) -> int:
+    """
+    Every pair of lectures of a course on days closer than its minimum working days minus one counts once.
+    :param lectures: np.ndarray
+    :param arrays: ModelArrays
+    :return: number_of_violations
+    """
+    day_counts: np.ndarray = np.bincount(
+        lectures[:, COURSE] * arrays.number_of_days + lectures[:, DAY],
+        minlength=arrays.number_of_courses * arrays.number_of_days
+    ).reshape(arrays.number_of_courses, arrays.number_of_days)
+
+    number_of_violations: int = 0
+    for gap in range(1, arrays.number_of_days):
+        pairs: np.ndarray = (day_counts[:, :-gap] * day_counts[:, gap:]).sum(axis=1)
+        number_of_violations += int(pairs[gap < arrays.min_working_days - 1].sum())
+
+    return number_of_violations
+
+
+def _get_number_of_curriculum_compactness_violations(slot_course_counts: np.ndarray, arrays: ModelArrays) -> int:
+    """
+    Every lecture counts once for each later period of its day that holds no course sharing a curriculum with it.
+    :param slot_course_counts: np.ndarray
+    :param arrays: ModelArrays
+    :return: number_of_violations
+    """
+    shape = (arrays.number_of_days, arrays.number_of_periods_per_day, arrays.number_of_courses)
+    isolated: np.ndarray = ((slot_course_counts @ arrays.shares_curriculum) == 0).reshape(shape).astype(np.int64)
+
+    later_isolated_periods: np.ndarray = np.zeros(shape, dtype=np.int64)
+    later_isolated_periods[:, :-1, :] = np.cumsum(isolated[:, :0:-1, :], axis=1)[:, ::-1, :]
+
+    return int((slot_course_counts.reshape(shape) * later_isolated_periods).sum())
+
+
+def get_violated_hard_constraints_breakdown(lectures: np.ndarray, arrays: ModelArrays) -> Dict[str, int]:
+    """
+    Returns the number of violations of each hard constraint.
+    :param lectures: np.ndarray of (course, room, day, period) rows
+    :param arrays: ModelArrays
+    :return: dictionary of component name to number_of_violations
+    """
+    slot_course_counts: np.ndarray = _get_slot_course_counts(lectures, arrays)
+
+    breakdown: Dict[str, int] = {
+        'lecture_allocations': _get_number_of_lecture_allocations_violations(lectures, arrays),
+        'conflicts': _get_number_of_conflict_violations(slot_course_counts, arrays),
+        'room_occupancy': _get_number_of_room_occupancy_violations(lectures, arrays),
+        'teacher': _get_number_of_teacher_violations(lectures, arrays),
+        'unavailability': _get_number_of_unavailability_violations(slot_course_counts, arrays)
+    }
+
+    return {component: breakdown[component] for component in HARD_CONSTRAINT_COMPONENTS}
+
+
+def get_violated_soft_constraints_breakdown(lectures: np.ndarray, arrays: ModelArrays) -> Dict[str, int]:
+    """
+    Returns the number of violations of each soft constraint.
+    :param lectures: np.ndarray of (course, room, day, period) rows
+    :param arrays: ModelArrays
+    :return: dictionary of component name to number_of_violations
+    """
+    breakdown: Dict[str, int] = {
+        'room_capacity': _get_number_of_room_capacity_violations(lectures, arrays),
+        'room_stability': _get_number_of_room_stability_violations(lectures, arrays),
+        'minimum_working_days': _get_number_of_minimum_working_days_violations(lectures, arrays),
+        'curriculum_compactness': _get_number_of_curriculum_compactness_violations(
+            _get_slot_course_counts(lectures, arrays),
+            arrays
+        )
+    }
+
+    return {component: breakdown[component] for component in SOFT_CONSTRAINT_COMPONENTS}
+
+
+def get_num_of_violated_hard_constraints(lectures: np.ndarray, arrays: ModelArrays) -> int:
+    """
+    Returns the number of hard constraints violated.
+    :param lectures: np.ndarray of (course, room, day, period) rows
+    :param arrays: ModelArrays
+    :return: number_of_hard_constraints_violated
+    """
+    return sum(get_violated_hard_constraints_breakdown(lectures, arrays).values())
+
+
+def get_num_of_violated_soft_constraints(lectures: np.ndarray, arrays: ModelArrays) -> int:
+    """
+    Returns the number of soft constraints violated.
+    :param lectures: np.ndarray of (course, room, day, period) rows
+    :param arrays: ModelArrays
+    :return: number_of_soft_constraints_violated
+    """
+    return sum(get_violated_soft_constraints_breakdown(lectures, arrays).values())
@@ -0,0 +1,79 @@
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.common.problem import Problem
+
+_worker_problem: Optional[Problem] = None
+_worker_state: Any = None
+
+
+def get_derived_seed(base_seed: int, *keys: Any) -> int:
+    """
+    Derives the seed of one unit of work (an evaluation, a trajectory, an island) from the base seed of a run and the
+    keys identifying the unit. The seed does not depend on the process the unit runs in or on Python's salted string
+    hashing.
+    :param base_seed: int
+    :param keys: the keys of the unit, joined by their string representation
+    :return: int
+    """
+    digest: bytes = hashlib.sha256(':'.join(str(key) for key in (base_seed,) + keys).encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def initialize_worker(
+        problem_instance_index: int,
+        create_state: Optional[Callable[..., Any]],
+        *arguments: Any
+) -> None:
+    """
+    Helper function run once in every worker process to rebuild the problem instance and the state shared by the tasks
+    of the worker: create_state(problem, *arguments) if there is a create_state, the arguments themselves otherwise.
+    :param problem_instance_index: int
+    :param create_state: Optional[Callable[..., Any]], a module-level function, so that it can be pickled
+    :param arguments: the arguments the state is created from
+    :return: None
+    """
+    global _worker_problem, _worker_state
+
+    _worker_problem = Problem(problem_instance_index=problem_instance_index)
+    _worker_problem.initialize()
+    _worker_state = arguments if create_state is None else create_state(_worker_problem, *arguments)
+
+
+def get_worker_problem() -> Problem:
+    """
+    Returns the problem instance of the worker process.
+    :return: Problem
+    """
+    return _worker_problem
+
+
+def get_worker_state() -> Any:
+    """
+    Returns the state shared by the tasks of the worker process.
+    :return: Any
+    """
+    return _worker_state
+
+
+def create_worker_pool(
+        number_of_workers: Optional[int],
+        problem_instance_index: int,
+        create_state: Optional[Callable[..., Any]],
+        *arguments: Any
+) -> ProcessPoolExecutor:
+    """
+    Creates a pool of worker processes that each parse the problem instance and create their state once, with
+    initialize_worker.
+    :param number_of_workers: Optional[int], None for one per CPU
+    :param problem_instance_index: int
+    :param create_state: Optional[Callable[..., Any]]
+    :param arguments: the arguments the state of every worker is created from
+    :return: ProcessPoolExecutor
+    """
+    return ProcessPoolExecutor(
+        max_workers=number_of_workers,
+        initializer=initialize_worker,
+        initargs=(problem_instance_index, create_state) + arguments
+    )
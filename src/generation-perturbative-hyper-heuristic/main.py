@@ -1,18 +1,27 @@
 import random
 import sys
 import time
+from typing import Optional
 
 sys.path.append("../../")
 
+from src.common.budget import Budget
+from src.common.checkpoint import Checkpoint, open_checkpoint, pop_resume_flag
 from src.common.chromosome import Chromosome
 from src.common.chromosome_generator import ChromosomeGenerator
 from src.common.grammar import GrammarGenerator
 from src.common.grammatical_evolution import GrammaticalEvolution
-from src.common.config import SEED, PROBLEM_INSTANCE_INDEX
+from src.common.island_model import IslandModel
+from src.common.config import SEED, PROBLEM_INSTANCE_INDEX, NUMBER_OF_FITNESS_WORKERS, NUMBER_OF_ISLANDS, TIME_LIMIT, \
+    EVALUATION_LIMIT, CHECKPOINT_INTERVAL
 from src.common.problem import Problem
 from src.common.timetable import Timetable
 
 if __name__ == "__main__":
+    resume: bool = pop_resume_flag(sys.argv)
+    if NUMBER_OF_ISLANDS > 0 and (CHECKPOINT_INTERVAL is not None or resume):
+        raise ValueError("Island runs cannot be checkpointed or resumed: unset CHECKPOINT_INTERVAL and --resume")
+
     problem_instance_index: int = int(
         PROBLEM_INSTANCE_INDEX if (len(sys.argv) < 2 or sys.argv[1] == 'None') else sys.argv[1]
     )
@@ -20,6 +29,10 @@ if __name__ == "__main__":
     seed: int = SEED if (len(sys.argv) < 3 or sys.argv[2] == 'None') else sys.argv[2]
     random.seed(seed)
 
+    number_of_workers: int = int(
+        NUMBER_OF_FITNESS_WORKERS if (len(sys.argv) < 4 or sys.argv[3] == 'None') else sys.argv[3]
+    )
+
     print("------------------------------------------------------------")
     print(f"Seed: {seed}\n")
 
@@ -30,7 +43,8 @@ if __name__ == "__main__":
 
     grammatical_evolution = GrammaticalEvolution(
         chromosome_generator=chromosome_generator,
-        grammar_generator=grammar_generator
+        grammar_generator=grammar_generator,
+        number_of_workers=number_of_workers
     )
 
     problem_instance: Problem = Problem(problem_instance_index=problem_instance_index)
@@ -40,12 +54,30 @@ if __name__ == "__main__":
     timetable: Timetable = Timetable(problem_instance)
     timetable.initialize_slots()
 
-    best_solution: Chromosome = grammatical_evolution.run(timetable)
+    checkpoint: Optional[Checkpoint] = open_checkpoint(resume)
+
+    budget: Optional[Budget] = Budget() if TIME_LIMIT is not None or EVALUATION_LIMIT is not None else None
+
+    best_solution: Chromosome
+    if NUMBER_OF_ISLANDS > 0:
+        island_model = IslandModel(grammatical_evolution)
+        best_solution = island_model.run(timetable, budget=budget)
+
+        for elapsed_time, island_best_costs, global_best_cost in zip(
+                island_model.elapsed_times,
+                island_model.island_best_costs,
+                island_model.global_best_costs
+        ):
+            print(f"{elapsed_time:.1f}s: islands {island_best_costs}, global best {global_best_cost}")
+    else:
+        best_solution = grammatical_evolution.run(timetable, budget=budget, checkpoint=checkpoint)
     best_solution.timetable.print()
 
     print("\nBest solution: ", best_solution.phenotype)
     print("Hard constraints cost: ", best_solution.hard_constraints_cost)
     print("Soft constraints cost: ", best_solution.soft_constraints_cost)
+    if grammatical_evolution.fitness_cache is not None:
+        print("Fitness cache hit rate: ", grammatical_evolution.fitness_cache.get_hit_rate())
     end_time: float = time.time()
     time_elapsed: float = end_time - start_time
     print(
@@ -1,14 +1,18 @@
-from typing import Tuple, List
+import random
+import time
+from typing import Tuple, List, Optional
 
 from hyperdized_selection import select_low_level_heuristic
 from src.common.acceptance import MoveAcceptance
-from src.common.chromosome import Chromosome
+from src.common.budget import Budget
+from src.common.checkpoint import Checkpoint, CheckpointState, decode_timetable, encode_timetable
+from src.common.chromosome import Chromosome, decode_chromosome, encode_chromosome
 from src.common.config import NUMBER_OF_GENERATIONS
-from src.common.constraints_validator import get_num_of_violated_soft_constraints, \
-    get_num_of_violated_hard_constraints
-from src.common.generation_perturbative import single_move, swap_slots, swap_lectures
+from src.common.heuristic_selection import HeuristicSelector, get_reward
 from src.common.timetable import Timetable
 
+CHECKPOINT_STAGE: str = 'hyperdized_perturbation'
+
 
 def get_constraints_violation_cost(timetable: Timetable) -> Tuple[int, int]:
     """
@@ -17,75 +21,129 @@ def get_constraints_violation_cost(timetable: Timetable) -> Tuple[int, int]:
         :return: Tuple[int, int]
     """
 
-    number_of_violated_hard_constraints: int = get_num_of_violated_hard_constraints(
-        timetable.schedule,
-        timetable.constraints,
-        timetable.curricula,
-        timetable.courses
-    )
-
-    number_of_violated_soft_constraints: int = get_num_of_violated_soft_constraints(
-        timetable.schedule,
-        timetable.curricula,
-        timetable.courses
-    )
-
-    return number_of_violated_hard_constraints, number_of_violated_soft_constraints
+    return timetable.get_constraints_cost()
 
 
 def perform_perturbation(chromosome: Chromosome, timetable: Timetable) -> Timetable:
     """
     Performs a perturbation on the timetable.
+    The heuristics of the chromosome's compiled program are applied in place and rolled back, so the timetable the
+    perturbation started from (the chromosome's timetable if it has one) is returned unchanged.
     :param timetable: The timetable to perturb.
     :return: The perturbed timetable.
     """
-    move_acceptance: MoveAcceptance = MoveAcceptance()
-    previous_timetable: Timetable = chromosome.timetable.clone() if chromosome.timetable else timetable.clone()
-    current_timetable: Timetable = previous_timetable.clone()
-    best_timetable: Timetable = previous_timetable.clone()
-
-    expression: str = chromosome.phenotype
-    expression_tokens: List[str] = expression.split()
-
-    for index in range(1, len(expression_tokens)):
-        if expression_tokens[index] == "single_move()":
-            current_timetable = single_move(current_timetable)
-        elif expression_tokens[index] == 'swap_slots()':
-            current_timetable = swap_slots(current_timetable)
-        elif expression_tokens[index] == 'swap_lectures()':
-            current_timetable = swap_lectures(current_timetable)
-        else:
-            continue
+    current_timetable: Timetable = chromosome.timetable if chromosome.timetable else timetable
+
+    current_timetable.begin()
+    current_timetable = chromosome.get_program().run(current_timetable)
+    current_timetable.rollback()
 
-    return best_timetable
+    return current_timetable
 
 
 def selection_perturbation_hyper_heuristic(
         timetable: Timetable,
         low_level_heuristics: List[Chromosome],
-        move_acceptance: MoveAcceptance
+        move_acceptance: MoveAcceptance,
+        budget: Optional[Budget] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        selector: Optional[HeuristicSelector] = None
 ) -> Timetable:
-    overall_best_timetable: Timetable = timetable.clone()
+    """
+    Perturbs the timetable with the evolved heuristics for a number of generations, or until the budget, if any, is
+    exhausted, every generation counting as one evaluation. With a checkpoint, the run resumes from the snapshot it
+    read, if any, heuristics included, and saves snapshots between generations. With a selector, the heuristics are
+    chosen by the selector, in the order of the list, instead of by their scores, and credited with their cost
+    improvement per millisecond of CPU time; what the selector learned is saved in the snapshots as well.
+    :param timetable: Timetable
+    :param low_level_heuristics: List[Chromosome]
+    :param move_acceptance: MoveAcceptance
+    :param budget: Optional[Budget]
+    :param checkpoint: Optional[Checkpoint]
+    :param selector: Optional[HeuristicSelector]
+    :return: the best timetable found
+    """
+    state: Optional[CheckpointState] = checkpoint.pop_state(CHECKPOINT_STAGE) if checkpoint is not None else None
+    overall_best_timetable: Timetable
+    overall_best_cost: Tuple[int, int]
+    current_cost: Tuple[int, int]
+    first_generation: int = 0
+
+    if state is None:
+        overall_best_timetable = timetable.clone()
+        overall_best_cost = get_constraints_violation_cost(overall_best_timetable)
+        current_cost = overall_best_cost
+    else:
+        if state['problem_instance_index'] != timetable.problem.problem_instance_index:
+            raise ValueError(f"The checkpoint is of problem instance {state['problem_instance_index']}")
+
+        low_level_heuristics = [
+            decode_chromosome(timetable.problem, heuristic) for heuristic in state['low_level_heuristics']
+        ]
+        for heuristic, score in zip(low_level_heuristics, state['scores']):
+            heuristic.reinforcement_learning_score = score
+
+        timetable = decode_timetable(timetable.problem, state['timetable'])
+        overall_best_timetable = decode_timetable(timetable.problem, state['overall_best_timetable'])
+        overall_best_cost = state['overall_best_cost']
+        current_cost = state['current_cost']
+        first_generation = state['generation']
+        move_acceptance.iterations = state['acceptance_iterations']
+        if selector is not None and state['selector'] is not None:
+            selector.set_state(state['selector'])
+        random.setstate(state['random_state'])
+
+    heuristic_index: int = 0
 
     generation: int
-    for count in range(NUMBER_OF_GENERATIONS):
-        selected_heuristic: Chromosome = select_low_level_heuristic(low_level_heuristics)
-
-        clone_timetable: Timetable = timetable.clone()
-        clone_timetable: Timetable = perform_perturbation(selected_heuristic, clone_timetable)
-
-        if move_acceptance.iterated_limited_threshold_acceptance(timetable, clone_timetable):
-            timetable: Timetable = clone_timetable
+    for count in range(first_generation, NUMBER_OF_GENERATIONS):
+        if checkpoint is not None and checkpoint.is_due():
+            checkpoint.save(CHECKPOINT_STAGE, {
+                'problem_instance_index': timetable.problem.problem_instance_index,
+                'generation': count,
+                'low_level_heuristics': [encode_chromosome(heuristic) for heuristic in low_level_heuristics],
+                'scores': [heuristic.reinforcement_learning_score for heuristic in low_level_heuristics],
+                'timetable': encode_timetable(timetable),
+                'overall_best_timetable': encode_timetable(overall_best_timetable),
+                'overall_best_cost': overall_best_cost,
+                'current_cost': current_cost,
+                'acceptance_iterations': move_acceptance.iterations,
+                'selector': selector.get_state() if selector is not None else None,
+                'random_state': random.getstate()
+            })
+
+        if budget is not None and budget.is_exhausted():
+            break
+
+        selected_heuristic: Chromosome
+        if selector is None:
+            selected_heuristic = select_low_level_heuristic(low_level_heuristics)
+        else:
+            heuristic_index = selector.select()
+            selected_heuristic = low_level_heuristics[heuristic_index]
+
+        start_time: float = time.process_time()
+        perturbed_timetable: Timetable = perform_perturbation(selected_heuristic, timetable)
+        new_cost: Tuple[int, int] = get_constraints_violation_cost(perturbed_timetable)
+        if selector is not None:
+            selector.update(heuristic_index, get_reward(current_cost, new_cost, time.process_time() - start_time))
+        if budget is not None:
+            budget.record_evaluations()
+
+        if move_acceptance.iterated_limited_threshold_acceptance_of_costs(current_cost, new_cost):
+            timetable: Timetable = perturbed_timetable
+            current_cost = new_cost
             selected_heuristic.reinforcement_learning_score += 1
 
-            ns_num_of_vhc, ns_num_of_shc = get_constraints_violation_cost(timetable)
-            os_num_of_vhc, os_num_of_shc = get_constraints_violation_cost(overall_best_timetable)
+            ns_num_of_vhc, ns_num_of_shc = current_cost
+            os_num_of_vhc, os_num_of_shc = overall_best_cost
 
             if (
                     ns_num_of_vhc < os_num_of_vhc or
                     (ns_num_of_vhc == os_num_of_vhc and ns_num_of_shc < os_num_of_shc)
             ):
                 overall_best_timetable: Timetable = timetable.clone()
+                overall_best_cost = current_cost
 
             if ns_num_of_vhc == 0 and ns_num_of_shc == 0:
                 break
@@ -1,23 +1,27 @@
 import random
 import sys
 import time
-from typing import List
+from typing import List, Optional
 
 sys.path.append("../../")
 
 from src.common.acceptance import MoveAcceptance
+from src.common.budget import Budget
+from src.common.checkpoint import Checkpoint, open_checkpoint, pop_resume_flag
 from src.common.chromosome import Chromosome
 from src.common.chromosome_generator import ChromosomeGenerator
 from src.common.grammar import GrammarGenerator
 from src.common.grammatical_evolution import GrammaticalEvolution
+from src.common.heuristic_selection import create_selector
 
-from src.common.config import PROBLEM_INSTANCE_INDEX, SEED
-from src.common.constraints_validator import get_num_of_violated_soft_constraints, get_num_of_violated_hard_constraints
+from src.common.config import PROBLEM_INSTANCE_INDEX, SEED, TIME_LIMIT, EVALUATION_LIMIT
 from src.common.problem import Problem
 from src.common.timetable import Timetable
-from hyperdized_perturbation import selection_perturbation_hyper_heuristic
+from hyperdized_perturbation import CHECKPOINT_STAGE, selection_perturbation_hyper_heuristic
 
 if __name__ == '__main__':
+    resume: bool = pop_resume_flag(sys.argv)
+
     problem_instance_index: int = int(
         PROBLEM_INSTANCE_INDEX
         if (len(sys.argv) < 2 or sys.argv[1] == 'None')
@@ -49,29 +53,33 @@ if __name__ == '__main__':
         grammar_generator=grammar_generator
     )
 
+    checkpoint: Optional[Checkpoint] = open_checkpoint(resume)
+    resuming_perturbation: bool = checkpoint is not None and checkpoint.stage == CHECKPOINT_STAGE
+
     timetable: Timetable = Timetable(problem_instance)
-    timetable.initialize_slots()
+    if not resuming_perturbation:
+        timetable.initialize_slots()
 
-    print(f"Starting grammatical evolution.")
+    budget: Optional[Budget] = Budget() if TIME_LIMIT is not None or EVALUATION_LIMIT is not None else None
 
-    best_n_solutions: List[Chromosome] = grammatical_evolution.run(timetable, 5)
+    number_of_heuristics: int = 5
+    best_n_solutions: List[Chromosome] = []
+    if not resuming_perturbation:
+        print(f"Starting grammatical evolution.")
+        best_n_solutions = grammatical_evolution.run(timetable, number_of_heuristics, budget, checkpoint)
 
     print(f"Starting hyperdized perturbation hyper-heuristic.")
     moveAcceptance = MoveAcceptance()
-    best_timetable = selection_perturbation_hyper_heuristic(timetable, best_n_solutions, moveAcceptance)
-
-    number_of_violated_hard_constraints: int = get_num_of_violated_hard_constraints(
-        best_timetable.schedule,
-        best_timetable.constraints,
-        best_timetable.curricula,
-        best_timetable.courses
+    best_timetable = selection_perturbation_hyper_heuristic(
+        timetable,
+        best_n_solutions,
+        moveAcceptance,
+        budget,
+        checkpoint,
+        create_selector(number_of_heuristics)
     )
 
-    number_of_violated_soft_constraints: int = get_num_of_violated_soft_constraints(
-        best_timetable.schedule,
-        best_timetable.curricula,
-        best_timetable.courses
-    )
+    number_of_violated_hard_constraints, number_of_violated_soft_constraints = best_timetable.get_constraints_cost()
 
     print("Hard constraints cost before solving: ", number_of_violated_hard_constraints)
     print("Soft constraints cost before solving: ", number_of_violated_soft_constraints, end="\n\n")
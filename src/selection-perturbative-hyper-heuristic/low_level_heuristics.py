@@ -1,6 +1,7 @@
 import random
 from typing import List, Tuple
 
+from src.common.config import REASSIGN_ROOMS
 from src.common.timetable import Timetable
 
 
@@ -24,12 +25,16 @@ def single_move(timetable: Timetable) -> Timetable:
     random_course_index = random.randint(0, len(slot.course_room_pairs) - 1)
     course_room_pair = slot.course_room_pairs[random_course_index]
 
-    timetable.schedule[day][period].course_room_pairs.pop(random_course_index)
+    timetable.remove_course_room_pair(day, period, random_course_index)
 
     course_id = course_room_pair[0].course_id
     new_day, new_period, room = timetable.get_feasible_slot(course_id, True)
 
-    timetable.schedule[new_day][new_period].course_room_pairs.append(course_room_pair)
+    timetable.add_course_room_pair(new_day, new_period, course_room_pair)
+
+    if REASSIGN_ROOMS:
+        timetable.reassign_rooms(day, period)
+        timetable.reassign_rooms(new_day, new_period)
 
     return timetable
 
@@ -46,11 +51,16 @@ def swap_slots(timetable: Timetable) -> Timetable:
     second_selected_day = random.randint(0, len(timetable.schedule) - 1)
     second_selected_period = random.randint(0, len(timetable.schedule[second_selected_day]) - 1)
 
-    first_slot = timetable.schedule[first_selected_day][first_selected_period].clone()
-    second_slot = timetable.schedule[second_selected_day][second_selected_period].clone()
+    timetable.exchange_slots(
+        first_selected_day,
+        first_selected_period,
+        second_selected_day,
+        second_selected_period
+    )
 
-    timetable.schedule[first_selected_day][first_selected_period] = second_slot
-    timetable.schedule[second_selected_day][second_selected_period] = first_slot
+    if REASSIGN_ROOMS:
+        timetable.reassign_rooms(first_selected_day, first_selected_period)
+        timetable.reassign_rooms(second_selected_day, second_selected_period)
 
     return timetable
 
@@ -82,8 +92,7 @@ def swap_lectures(timetable: Timetable) -> Timetable:
                     course_room_pair[0].course_id == first_course_room_pair[0].course_id and
                     course_room_pair[1].room_id == first_course_room_pair[1].room_id
             ):
-                timetable.schedule[first_day][first_period].course_room_pairs[
-                    index] = second_course_room_pair
+                timetable.set_course_room_pair(first_day, first_period, index, second_course_room_pair)
                 break
 
             index += 1
@@ -94,12 +103,15 @@ def swap_lectures(timetable: Timetable) -> Timetable:
                     course_room_pair[0].course_id == second_course_room_pair[0].course_id and
                     course_room_pair[1].room_id == second_course_room_pair[1].room_id
             ):
-                timetable.schedule[second_day][second_period].course_room_pairs[
-                    index] = first_course_room_pair
+                timetable.set_course_room_pair(second_day, second_period, index, first_course_room_pair)
                 break
 
             index += 1
 
+        if REASSIGN_ROOMS:
+            timetable.reassign_rooms(first_day, first_period)
+            timetable.reassign_rooms(second_day, second_period)
+
     elif len(first_slot.course_room_pairs) > 0 and len(second_slot.course_room_pairs) == 0:
         first_course_room_pair = first_slot.course_room_pairs[
             random.randint(0, len(first_slot.course_room_pairs) - 1)]
@@ -1,19 +1,28 @@
 import random
 import sys
 import time
+from typing import List, Optional
 
 sys.path.append("../../")
 
 from src.common.acceptance import MoveAcceptance
+from src.common.budget import Budget
+from src.common.checkpoint import Checkpoint, open_checkpoint, pop_resume_flag
+from src.common.heuristic_selection import create_selector
 from low_level_heuristics import single_move, swap_slots, swap_lectures
+from multi_start import RunStatistics, multi_start_hyper_heuristic
 from selection_perturbation import selection_perturbation_hyper_heuristic
-from src.common.config import PROBLEM_INSTANCE_INDEX, SEED
-from src.common.constraints_validator import get_num_of_violated_hard_constraints, \
-    get_num_of_violated_soft_constraints
+from src.common.config import MOVE_SAMPLING, PROBLEM_INSTANCE_INDEX, SEED, TIME_LIMIT, EVALUATION_LIMIT, \
+    CHECKPOINT_INTERVAL, MULTI_START_RUNS
+from src.common.moves import best_of_k_moves, first_improvement_move
 from src.common.problem import Problem
 from src.common.timetable import Timetable
 
 if __name__ == "__main__":
+    resume: bool = pop_resume_flag(sys.argv)
+    if MULTI_START_RUNS > 0 and (CHECKPOINT_INTERVAL is not None or resume):
+        raise ValueError("Multi-start runs cannot be checkpointed or resumed: unset CHECKPOINT_INTERVAL and --resume")
+
     problem_instance_index: int = int(
         PROBLEM_INSTANCE_INDEX if (len(sys.argv) < 2 or sys.argv[1] == 'None') else sys.argv[1]
     )
@@ -30,6 +39,8 @@ if __name__ == "__main__":
     problem_instance.initialize()
     print(f"Problem instance {problem_instance_index + 1} initialized.", end="\n\n")
 
+    checkpoint: Optional[Checkpoint] = open_checkpoint(resume)
+
     print(f"Starting selection perturbation hyper-heuristic.")
     move_acceptance: MoveAcceptance = MoveAcceptance()
     low_level_heuristic = {
@@ -38,24 +49,35 @@ if __name__ == "__main__":
         "swap_lectures": [0, swap_lectures]
     }
 
-    timetable: Timetable = selection_perturbation_hyper_heuristic(
-        problem=problem_instance,
-        move_acceptance=move_acceptance,
-        low_level_heuristics=low_level_heuristic
-    )
+    if MOVE_SAMPLING:
+        low_level_heuristic["best_of_k_moves"] = [0, best_of_k_moves]
+        low_level_heuristic["first_improvement_move"] = [0, first_improvement_move]
 
-    number_of_violated_hard_constraints: int = get_num_of_violated_hard_constraints(
-        timetable.schedule,
-        timetable.constraints,
-        timetable.curricula,
-        timetable.courses
-    )
+    timetable: Timetable
+    if MULTI_START_RUNS > 0:
+        run_statistics: List[RunStatistics]
+        timetable, run_statistics = multi_start_hyper_heuristic(problem_instance, low_level_heuristic)
 
-    number_of_violated_soft_constraints: int = get_num_of_violated_soft_constraints(
-        timetable.schedule,
-        timetable.curricula,
-        timetable.courses
-    )
+        for statistics in run_statistics:
+            print(
+                f"Run {statistics.run + 1} (seed {statistics.seed}): "
+                f"cost ({statistics.hard_constraints_cost}, {statistics.soft_constraints_cost}), "
+                f"{statistics.number_of_evaluations} evaluations in {statistics.elapsed_time:.2f} seconds, "
+                f"scores {statistics.scores}"
+            )
+        print()
+    else:
+        budget: Optional[Budget] = Budget() if TIME_LIMIT is not None or EVALUATION_LIMIT is not None else None
+        timetable = selection_perturbation_hyper_heuristic(
+            problem=problem_instance,
+            move_acceptance=move_acceptance,
+            low_level_heuristics=low_level_heuristic,
+            budget=budget,
+            checkpoint=checkpoint,
+            selector=create_selector(len(low_level_heuristic))
+        )
+
+    number_of_violated_hard_constraints, number_of_violated_soft_constraints = timetable.get_constraints_cost()
 
     print("Hard constraints cost before solving: ", number_of_violated_hard_constraints)
     print(
@@ -0,0 +1,165 @@
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selection_perturbation import selection_perturbation_hyper_heuristic
+from src.common.acceptance import MoveAcceptance
+from src.common.budget import Budget
+from src.common.checkpoint import EncodedTimetable, decode_timetable, encode_timetable
+from src.common.config import MULTI_START_RUNS, MULTI_START_WORKERS, TIME_LIMIT, EVALUATION_LIMIT
+from src.common.heuristic_selection import create_selector
+from src.common.problem import Problem
+from src.common.timetable import Timetable
+from src.common.worker_pool import create_worker_pool, get_derived_seed, get_worker_problem, get_worker_state
+
+LowLevelHeuristics = Dict[str, Callable[[Timetable], Timetable]]
+RunTask = Tuple[int, int]
+
+
+class RunStatistics:
+    """
+    The outcome of one trajectory of a multi-start run.
+    """
+
+    def __init__(
+            self,
+            run: int,
+            seed: int,
+            hard_constraints_cost: int,
+            soft_constraints_cost: int,
+            number_of_evaluations: int,
+            elapsed_time: float,
+            scores: Dict[str, int]
+    ):
+        self.run: int = run
+        self.seed: int = seed
+        self.hard_constraints_cost: int = hard_constraints_cost
+        self.soft_constraints_cost: int = soft_constraints_cost
+        self.number_of_evaluations: int = number_of_evaluations
+        self.elapsed_time: float = elapsed_time
+        self.scores: Dict[str, int] = scores
+
+
+def _run_trajectory(
+        problem: Problem,
+        initial_timetable: EncodedTimetable,
+        low_level_heuristics: LowLevelHeuristics,
+        limits: Tuple[Optional[float], Optional[int]],
+        task: RunTask
+) -> Tuple[RunStatistics, EncodedTimetable]:
+    """
+    Helper function running one trajectory of the selection perturbation hyper-heuristic from the constructed timetable,
+    with its own seed, heuristic scores, move acceptance and budget.
+    :param problem: Problem
+    :param initial_timetable: EncodedTimetable
+    :param low_level_heuristics: LowLevelHeuristics
+    :param limits: the time and evaluation limit of the trajectory
+    :param task: the index and seed of the trajectory
+    :return: the statistics of the trajectory and its best timetable, encoded
+    """
+    run, seed = task
+    random.seed(seed)
+
+    scored_low_level_heuristics: dict = {
+        heuristic_name: [0, heuristic] for heuristic_name, heuristic in low_level_heuristics.items()
+    }
+    budget: Budget = Budget(*limits)
+    start_time: float = time.time()
+
+    timetable: Timetable = selection_perturbation_hyper_heuristic(
+        problem=problem,
+        low_level_heuristics=scored_low_level_heuristics,
+        move_acceptance=MoveAcceptance(),
+        budget=budget,
+        selector=create_selector(len(scored_low_level_heuristics)),
+        initial_timetable=decode_timetable(problem, initial_timetable)
+    )
+
+    hard_constraints_cost, soft_constraints_cost = timetable.get_constraints_cost()
+    statistics: RunStatistics = RunStatistics(
+        run,
+        seed,
+        hard_constraints_cost,
+        soft_constraints_cost,
+        budget.evaluations,
+        time.time() - start_time,
+        {heuristic_name: entry[0] for heuristic_name, entry in scored_low_level_heuristics.items()}
+    )
+    return statistics, encode_timetable(timetable)
+
+
+def _run(task: RunTask) -> Tuple[RunStatistics, EncodedTimetable]:
+    """
+    Helper function running one trajectory in a worker process, whose state is the constructed timetable and the
+    settings shared by all trajectories.
+    :param task: the index and seed of the trajectory
+    :return: the statistics of the trajectory and its best timetable, encoded
+    """
+    initial_timetable, low_level_heuristics, limits = get_worker_state()
+    return _run_trajectory(get_worker_problem(), initial_timetable, low_level_heuristics, limits, task)
+
+
+def multi_start_hyper_heuristic(
+        problem: Problem,
+        low_level_heuristics: dict,
+        number_of_runs: int = MULTI_START_RUNS,
+        number_of_workers: Optional[int] = MULTI_START_WORKERS,
+        time_limit: Optional[float] = TIME_LIMIT,
+        evaluation_limit: Optional[int] = EVALUATION_LIMIT
+) -> Tuple[Timetable, List[RunStatistics]]:
+    """
+    Runs independent trajectories of the selection perturbation hyper-heuristic from one constructed timetable and
+    returns the best timetable any of them found, with the statistics of every trajectory in run order.
+
+    The timetable is constructed once, here, and shipped encoded to a pool of worker processes, which parse the
+    problem instance once each. Every trajectory starts from its own copy, with the seed get_derived_seed derives for
+    its index, fresh heuristic scores, move acceptance and selector, and the time and evaluation limits as its own
+    budget, so the results do not depend on the number of workers, unless the heuristic selection is credited by CPU
+    time.
+    The trajectories are not checkpointed, so a multi-start run cannot be resumed.
+    :param problem: Problem
+    :param low_level_heuristics: dict, as for selection_perturbation_hyper_heuristic
+    :param number_of_runs: int
+    :param number_of_workers: Optional[int], the number of worker processes, None for one per CPU, or 0 to run the
+    trajectories one after the other in this process
+    :param time_limit: Optional[float], the time limit of every trajectory in seconds
+    :param evaluation_limit: Optional[int], the evaluation limit of every trajectory
+    :return: the best timetable and the statistics of every trajectory
+    """
+    if number_of_runs < 1:
+        raise ValueError("A multi-start run needs at least one trajectory")
+
+    timetable: Timetable = Timetable(problem=problem)
+    timetable.initialize_slots()
+
+    initial_timetable: EncodedTimetable = encode_timetable(timetable)
+    heuristics: LowLevelHeuristics = {
+        heuristic_name: entry[1] for heuristic_name, entry in low_level_heuristics.items()
+    }
+    limits: Tuple[Optional[float], Optional[int]] = (time_limit, evaluation_limit)
+
+    base_seed: int = random.getrandbits(64)
+    tasks: List[RunTask] = [(run, get_derived_seed(base_seed, run)) for run in range(number_of_runs)]
+
+    results: List[Tuple[RunStatistics, EncodedTimetable]]
+    if number_of_workers == 0:
+        state: object = random.getstate()
+        results = [_run_trajectory(problem, initial_timetable, heuristics, limits, task) for task in tasks]
+        random.setstate(state)
+    else:
+        with create_worker_pool(
+                number_of_workers,
+                problem.problem_instance_index,
+                None,
+                initial_timetable,
+                heuristics,
+                limits
+        ) as executor:
+            results = list(executor.map(_run, tasks))
+
+    statistics: List[RunStatistics] = [run_statistics for run_statistics, _ in results]
+    _, best_timetable = min(
+        results,
+        key=lambda result: (result[0].hard_constraints_cost, result[0].soft_constraints_cost, result[0].run)
+    )
+    return decode_timetable(problem, best_timetable), statistics
@@ -1,13 +1,18 @@
-from typing import Tuple
+import random
+import time
+from typing import List, Optional, Tuple
 
 from selection import select_low_level_heuristic
 from src.common.acceptance import MoveAcceptance
+from src.common.budget import Budget
+from src.common.checkpoint import Checkpoint, CheckpointState, decode_timetable, encode_timetable
 from src.common.config import NUMBER_OF_GENERATIONS
-from src.common.constraints_validator import get_num_of_violated_soft_constraints, \
-    get_num_of_violated_hard_constraints
+from src.common.heuristic_selection import HeuristicSelector, get_reward
 from src.common.problem import Problem
 from src.common.timetable import Timetable
 
+CHECKPOINT_STAGE: str = 'selection_perturbation'
+
 
 def get_constraints_violation_cost(timetable: Timetable) -> Tuple[int, int]:
     """
@@ -16,56 +21,128 @@ def get_constraints_violation_cost(timetable: Timetable) -> Tuple[int, int]:
         :return: Tuple[int, int]
     """
 
-    number_of_violated_hard_constraints: int = get_num_of_violated_hard_constraints(
-        timetable.schedule,
-        timetable.constraints,
-        timetable.curricula,
-        timetable.courses
-    )
-
-    number_of_violated_soft_constraints: int = get_num_of_violated_soft_constraints(
-        timetable.schedule,
-        timetable.curricula,
-        timetable.courses
-    )
-
-    return number_of_violated_hard_constraints, number_of_violated_soft_constraints
+    return timetable.get_constraints_cost()
 
 
 def selection_perturbation_hyper_heuristic(
         problem: Problem,
         low_level_heuristics: dict,
-        move_acceptance: MoveAcceptance
+        move_acceptance: MoveAcceptance,
+        budget: Optional[Budget] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        selector: Optional[HeuristicSelector] = None,
+        initial_timetable: Optional[Timetable] = None
 ) -> Timetable:
-    timetable: Timetable = Timetable(problem=problem)
-    timetable.initialize_slots()
-
-    overall_best_timetable: Timetable = timetable.clone()
+    """
+    Perturbs the constructed timetable with the selected low-level heuristics for a number of generations, or until
+    the budget, if any, is exhausted, every generation counting as one evaluation, and returns the best timetable found.
+    With a checkpoint, the run resumes from the snapshot it read, if any, instead of constructing a timetable, and
+    saves snapshots between generations. With a selector, the heuristics are chosen by the selector, in the order of
+    the dictionary, instead of by their scores, and credited with their cost improvement per millisecond of CPU time;
+    what the selector learned is saved in the snapshots as well. A constructed initial timetable, if given, is
+    perturbed in place instead of constructing one.
+    :param problem: Problem
+    :param low_level_heuristics: dict
+    :param move_acceptance: MoveAcceptance
+    :param budget: Optional[Budget]
+    :param checkpoint: Optional[Checkpoint]
+    :param selector: Optional[HeuristicSelector]
+    :param initial_timetable: Optional[Timetable]
+    :return: the best timetable found
+    """
+    state: Optional[CheckpointState] = checkpoint.pop_state(CHECKPOINT_STAGE) if checkpoint is not None else None
+    timetable: Timetable
+    overall_best_timetable: Timetable
+    overall_best_cost: Tuple[int, int]
+    current_cost: Tuple[int, int]
+    first_generation: int = 0
+
+    if state is None:
+        if initial_timetable is None:
+            timetable = Timetable(problem=problem)
+            timetable.initialize_slots()
+        else:
+            timetable = initial_timetable
+
+        overall_best_timetable = timetable.clone()
+        overall_best_cost = get_constraints_violation_cost(overall_best_timetable)
+        current_cost = overall_best_cost
+    else:
+        if state['problem_instance_index'] != problem.problem_instance_index:
+            raise ValueError(f"The checkpoint is of problem instance {state['problem_instance_index']}")
+
+        timetable = decode_timetable(problem, state['timetable'])
+        overall_best_timetable = decode_timetable(problem, state['overall_best_timetable'])
+        overall_best_cost = state['overall_best_cost']
+        current_cost = state['current_cost']
+        first_generation = state['generation']
+
+        for heuristic_name, score in state['scores'].items():
+            if heuristic_name in low_level_heuristics:
+                low_level_heuristics[heuristic_name][0] = score
+        move_acceptance.iterations = state['acceptance_iterations']
+        if selector is not None and state['selector'] is not None:
+            selector.set_state(state['selector'])
+        random.setstate(state['random_state'])
+
+    heuristic_names: List[str] = list(low_level_heuristics.keys())
+    heuristic_index: int = 0
 
     generation: int
-    for count in range(NUMBER_OF_GENERATIONS):
-        heuristic_name: str = select_low_level_heuristic(low_level_heuristics)
+    for count in range(first_generation, NUMBER_OF_GENERATIONS):
+        if checkpoint is not None and checkpoint.is_due():
+            checkpoint.save(CHECKPOINT_STAGE, {
+                'problem_instance_index': problem.problem_instance_index,
+                'generation': count,
+                'timetable': encode_timetable(timetable),
+                'overall_best_timetable': encode_timetable(overall_best_timetable),
+                'overall_best_cost': overall_best_cost,
+                'current_cost': current_cost,
+                'scores': {heuristic_name: entry[0] for heuristic_name, entry in low_level_heuristics.items()},
+                'acceptance_iterations': move_acceptance.iterations,
+                'selector': selector.get_state() if selector is not None else None,
+                'random_state': random.getstate()
+            })
+
+        if budget is not None and budget.is_exhausted():
+            break
+
+        heuristic_name: str
+        if selector is None:
+            heuristic_name = select_low_level_heuristic(low_level_heuristics)
+        else:
+            heuristic_index = selector.select()
+            heuristic_name = heuristic_names[heuristic_index]
         heuristic = low_level_heuristics[heuristic_name][1]
 
-        clone_timetable: Timetable = timetable.clone()
-        clone_timetable: Timetable = heuristic(clone_timetable)
-
-        if move_acceptance.iterated_limited_threshold_acceptance(timetable, clone_timetable):
-            timetable: Timetable = clone_timetable
+        start_time: float = time.process_time()
+        timetable.begin()
+        timetable = heuristic(timetable)
+        new_cost: Tuple[int, int] = get_constraints_violation_cost(timetable)
+        if selector is not None:
+            selector.update(heuristic_index, get_reward(current_cost, new_cost, time.process_time() - start_time))
+        if budget is not None:
+            budget.record_evaluations()
+
+        if move_acceptance.iterated_limited_threshold_acceptance_of_costs(current_cost, new_cost):
+            timetable.commit()
+            current_cost = new_cost
             low_level_heuristics[heuristic_name][0] += 1
 
-            ns_num_of_vhc, ns_num_of_shc = get_constraints_violation_cost(timetable)
-            os_num_of_vhc, os_num_of_shc = get_constraints_violation_cost(overall_best_timetable)
+            ns_num_of_vhc, ns_num_of_shc = current_cost
+            os_num_of_vhc, os_num_of_shc = overall_best_cost
 
             if (
                     ns_num_of_vhc < os_num_of_vhc or
                     (ns_num_of_vhc == os_num_of_vhc and ns_num_of_shc < os_num_of_shc)
             ):
                 overall_best_timetable: Timetable = timetable.clone()
+                overall_best_cost = current_cost
 
             if ns_num_of_vhc == 0 and ns_num_of_shc == 0:
                 break
         else:
+            timetable.rollback()
             low_level_heuristics[heuristic_name][0] -= 1
 
-    return timetable
+    return overall_best_timetable
@@ -0,0 +1,22 @@
+from typing import Callable
+
+import pytest
+
+from src.common.problem import Problem
+from src.common.timetable import Timetable
+from tests.helpers import PROBLEM_INSTANCES, get_random_timetable, load_problem
+
+
+@pytest.fixture(scope='session', params=PROBLEM_INSTANCES)
+def problem(request) -> Problem:
+    return load_problem(request.param)
+
+
+@pytest.fixture(scope='session')
+def toy_problem() -> Problem:
+    return load_problem('ToyProblem.ctt.txt')
+
+
+@pytest.fixture
+def random_timetable(problem: Problem) -> Callable[..., Timetable]:
+    return lambda seed, fill=1.0: get_random_timetable(problem, seed, fill)
@@ -0,0 +1,124 @@
+import os
+import random
+from typing import Dict, List, Tuple
+
+from src.common.config import DATA_PATH
+from src.common.constraints_validator import get_violated_hard_constraints_breakdown, \
+    get_violated_soft_constraints_breakdown
+from src.common.problem import Problem
+from src.common.timetable import Timetable
+
+PROBLEM_INSTANCES: Tuple[str, ...] = ('ToyProblem.ctt.txt', 'comp01.ctt.txt')
+
+
+def load_problem(filename: str) -> Problem:
+    """
+    Loads a problem instance of the data directory by file name.
+    :param filename: str
+    :return: Problem
+    """
+    problem: Problem = Problem(problem_instance_index=os.listdir(DATA_PATH).index(filename))
+    problem.initialize()
+    return problem
+
+
+def get_random_timetable(problem: Problem, seed: int, fill: float = 1.0) -> Timetable:
+    """
+    Places every lecture, or each with probability fill, in a random slot and room, so that the timetable violates
+    every kind of constraint.
+    :param problem: Problem
+    :param seed: int
+    :param fill: float
+    :return: Timetable
+    """
+    rng: random.Random = random.Random(seed)
+    timetable: Timetable = Timetable(problem=problem)
+
+    for course in problem.courses:
+        for _ in range(course.number_of_lectures):
+            if rng.random() < fill:
+                timetable.add_course_room_pair(
+                    rng.randrange(problem.number_of_days),
+                    rng.randrange(problem.number_of_periods_per_day),
+                    (course, rng.choice(problem.rooms))
+                )
+
+    return timetable
+
+
+def perturb(timetable: Timetable, rng: random.Random) -> None:
+    """
+    Changes a timetable in place with one of its primitives, chosen at random.
+    :param timetable: Timetable
+    :param rng: random.Random
+    :return: None
+    """
+    problem: Problem = timetable.problem
+    day: int = rng.randrange(problem.number_of_days)
+    period: int = rng.randrange(problem.number_of_periods_per_day)
+    course_room_pairs = timetable.schedule[day][period].course_room_pairs
+    operation: int = rng.randrange(5)
+
+    if operation == 0 or len(course_room_pairs) == 0:
+        timetable.add_course_room_pair(day, period, (rng.choice(problem.courses), rng.choice(problem.rooms)))
+    elif operation == 1:
+        timetable.remove_course_room_pair(day, period, rng.randrange(len(course_room_pairs)))
+    elif operation == 2:
+        timetable.set_course_room_pair(
+            day,
+            period,
+            rng.randrange(len(course_room_pairs)),
+            (rng.choice(problem.courses), rng.choice(problem.rooms))
+        )
+    elif operation == 3:
+        timetable.set_course_room_pairs(
+            day,
+            period,
+            [(course, rng.choice(problem.rooms)) for course, _ in reversed(course_room_pairs)]
+        )
+    else:
+        timetable.exchange_slots(
+            day,
+            period,
+            rng.randrange(problem.number_of_days),
+            rng.randrange(problem.number_of_periods_per_day)
+        )
+
+
+def get_schedule(timetable: Timetable) -> List[List[List[Tuple[str, str]]]]:
+    """
+    Returns the course and room ids of the course room pairs of every slot, in order.
+    :param timetable: Timetable
+    :return: List[List[List[Tuple[str, str]]]]
+    """
+    return [
+        [[(course.course_id, room.room_id) for course, room in slot.course_room_pairs] for slot in slots]
+        for slots in timetable.schedule
+    ]
+
+
+def get_reference_breakdowns(timetable: Timetable) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Evaluates a timetable with the list validators, without the problem model, the cost cache or any index.
+    :param timetable: Timetable
+    :return: the hard and soft constraints breakdowns
+    """
+    return (
+        get_violated_hard_constraints_breakdown(
+            timetable.schedule,
+            timetable.constraints,
+            timetable.curricula,
+            timetable.courses
+        ),
+        get_violated_soft_constraints_breakdown(timetable.schedule, timetable.curricula, timetable.courses)
+    )
+
+
+def get_reference_cost(timetable: Timetable) -> Tuple[int, int]:
+    """
+    Returns the (hard, soft) constraints cost of a timetable according to the list validators.
+    :param timetable: Timetable
+    :return: Tuple[int, int]
+    """
+    hard_constraints_breakdown, soft_constraints_breakdown = get_reference_breakdowns(timetable)
+    return sum(hard_constraints_breakdown.values()), sum(soft_constraints_breakdown.values())
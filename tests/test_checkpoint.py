@@ -0,0 +1,140 @@
+import pickle
+import random
+import zlib
+from typing import List, Optional, Tuple
+
+import pytest
+
+from src.common.checkpoint import CHECKPOINT_VERSION, Checkpoint, CheckpointState, decode_timetable, \
+    encode_timetable, open_checkpoint, pop_resume_flag
+from src.common.chromosome import Chromosome
+from src.common.chromosome_generator import ChromosomeGenerator
+from src.common.grammar import GrammarGenerator
+from src.common.grammatical_evolution import CHECKPOINT_STAGE, PLUS_SELECTION, STEADY_STATE, GrammaticalEvolution
+from src.common.problem import Problem
+from src.common.timetable import Timetable
+from tests.helpers import get_random_timetable, get_schedule, load_problem
+
+Result = List[Tuple[str, int, int, bytes]]
+
+
+class _Interruption(Exception):
+    pass
+
+
+class _InterruptedCheckpoint(Checkpoint):
+    """
+    A checkpoint that interrupts the run after a number of snapshots, as if the process died.
+    """
+
+    def __init__(self, path: str, number_of_snapshots: int):
+        super().__init__(path, 0.0)
+        self.number_of_snapshots: int = number_of_snapshots
+
+    def save(self, stage: str, state: CheckpointState) -> None:
+        super().save(stage, state)
+        self.number_of_snapshots -= 1
+        if self.number_of_snapshots == 0:
+            raise _Interruption()
+
+
+@pytest.fixture(scope='module')
+def comp01_problem() -> Problem:
+    return load_problem('comp01.ctt.txt')
+
+
+def _run(problem: Problem, survivor_selection: str, checkpoint: Optional[Checkpoint] = None) -> Tuple[Result, float]:
+    random.seed(4)
+    grammatical_evolution: GrammaticalEvolution = GrammaticalEvolution(
+        ChromosomeGenerator(),
+        GrammarGenerator(['room', 'course', 'day', 'period']),
+        number_of_workers=0,
+        survivor_selection=survivor_selection,
+        number_of_offspring=6
+    )
+    grammatical_evolution._population_size = 6
+    grammatical_evolution._max_num_of_generations = 6
+
+    best: List[Chromosome] = grammatical_evolution.run(get_random_timetable(problem, 4, 0.9), 3, checkpoint=checkpoint)
+    return [
+        (chromosome.phenotype, chromosome.hard_constraints_cost, chromosome.soft_constraints_cost,
+         chromosome.timetable.encode())
+        for chromosome in best
+    ], random.random()
+
+
+def test_saved_state_is_loaded_once_for_its_stage(tmp_path):
+    path: str = str(tmp_path / 'checkpoint.bin')
+    state: CheckpointState = {'generation': 3, 'population': [([1, 2, 3], b'\x00')], 'random_state': random.getstate()}
+    Checkpoint(path, 0.0).save('stage', state)
+
+    checkpoint: Checkpoint = Checkpoint(path)
+    assert checkpoint.load()
+    assert checkpoint.pop_state('other stage') is None
+    assert checkpoint.pop_state('stage') == state
+    assert checkpoint.pop_state('stage') is None
+
+
+def test_load_without_a_file_reads_nothing(tmp_path):
+    checkpoint: Checkpoint = Checkpoint(str(tmp_path / 'checkpoint.bin'))
+
+    assert not checkpoint.load()
+    assert checkpoint.pop_state('stage') is None
+
+
+def test_load_rejects_another_version(tmp_path):
+    path = tmp_path / 'checkpoint.bin'
+    path.write_bytes(zlib.compress(pickle.dumps((CHECKPOINT_VERSION + 1, 'stage', {}))))
+
+    with pytest.raises(ValueError):
+        Checkpoint(str(path)).load()
+
+
+def test_snapshots_are_only_due_with_an_interval(tmp_path):
+    assert not Checkpoint(str(tmp_path / 'checkpoint.bin'), None).is_due()
+    assert Checkpoint(str(tmp_path / 'checkpoint.bin'), 0.0).is_due()
+
+
+def test_resume_flag_is_removed_from_the_arguments():
+    arguments: List[str] = ['main.py', '--resume', '3', 'None']
+
+    assert pop_resume_flag(arguments)
+    assert arguments == ['main.py', '3', 'None']
+    assert not pop_resume_flag(arguments)
+
+
+def test_checkpoint_is_only_opened_for_checkpointed_or_resumed_runs(tmp_path):
+    path: str = str(tmp_path / 'checkpoint.bin')
+
+    assert open_checkpoint(False, path, None) is None
+    assert open_checkpoint(False, path, 10.0).stage is None
+    assert open_checkpoint(True, path, None).stage is None
+
+    Checkpoint(path, 0.0).save('stage', {})
+    assert open_checkpoint(True, path, None).stage == 'stage'
+
+
+def test_encoded_timetable_keeps_the_schedule_and_first_rooms(toy_problem):
+    random.seed(5)
+    timetable: Timetable = Timetable(problem=toy_problem)
+    timetable.initialize_slots()
+
+    decoded: Timetable = decode_timetable(toy_problem, encode_timetable(timetable))
+
+    assert get_schedule(decoded) == get_schedule(timetable)
+    assert decoded.course_and_first_room == timetable.course_and_first_room
+    assert decoded.hash == timetable.hash
+
+
+@pytest.mark.parametrize('survivor_selection', [STEADY_STATE, PLUS_SELECTION])
+@pytest.mark.parametrize('number_of_snapshots', [1, 4])
+def test_resumed_run_matches_an_uninterrupted_run(comp01_problem, tmp_path, survivor_selection, number_of_snapshots):
+    path: str = str(tmp_path / 'checkpoint.bin')
+
+    with pytest.raises(_Interruption):
+        _run(comp01_problem, survivor_selection, _InterruptedCheckpoint(path, number_of_snapshots))
+    checkpoint: Checkpoint = Checkpoint(path, 0.0)
+    assert checkpoint.load() and checkpoint.stage == CHECKPOINT_STAGE
+
+    assert _run(comp01_problem, survivor_selection, checkpoint) == _run(comp01_problem, survivor_selection)
+    assert checkpoint.stage is None
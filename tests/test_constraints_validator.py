@@ -0,0 +1,152 @@
+import random
+
+from src.common.constraints_validator import DeltaEvaluator, SlotChanges
+from src.common.problem import Problem
+from src.common.timetable import Timetable
+from tests.helpers import get_reference_breakdowns, load_problem, perturb
+
+
+def _create_evaluator(timetable: Timetable) -> DeltaEvaluator:
+    return DeltaEvaluator(
+        [[slot.clone() for slot in slots] for slots in timetable.schedule],
+        timetable.constraints,
+        timetable.curricula,
+        timetable.courses,
+        timetable.model
+    )
+
+
+def _get_random_changes(problem: Problem, evaluator: DeltaEvaluator, rng: random.Random) -> SlotChanges:
+    changes: SlotChanges = {}
+
+    for _ in range(rng.randint(1, 3)):
+        day: int = rng.randrange(problem.number_of_days)
+        period: int = rng.randrange(problem.number_of_periods_per_day)
+        operation: int = rng.randrange(3)
+        number_of_pairs: int = len(changes.get((day, period), evaluator.schedule[day][period].course_room_pairs))
+
+        if operation == 0 and number_of_pairs > 0:
+            evaluator.get_removal_changes(day, period, rng.randrange(number_of_pairs), changes)
+        elif operation == 1:
+            evaluator.get_insertion_changes(
+                day,
+                period,
+                (rng.choice(problem.courses), rng.choice(problem.rooms)),
+                changes
+            )
+        else:
+            evaluator.get_swap_slots_changes(
+                day,
+                period,
+                rng.randrange(problem.number_of_days),
+                rng.randrange(problem.number_of_periods_per_day),
+                changes
+            )
+
+    return changes
+
+
+def _get_schedule_timetable(problem: Problem, schedule) -> Timetable:
+    return Timetable(problem, [[slot.clone() for slot in slots] for slots in schedule])
+
+
+def test_initial_breakdowns_match_the_list_validators(problem, random_timetable):
+    timetable: Timetable = random_timetable(0)
+    evaluator: DeltaEvaluator = _create_evaluator(timetable)
+
+    assert (
+        evaluator.hard_constraints_breakdown,
+        evaluator.soft_constraints_breakdown
+    ) == get_reference_breakdowns(timetable)
+
+
+def test_deltas_match_the_list_validators(problem, random_timetable):
+    evaluator: DeltaEvaluator = _create_evaluator(random_timetable(1, 0.9))
+    rng: random.Random = random.Random(1)
+
+    for _ in range(100):
+        changes: SlotChanges = _get_random_changes(problem, evaluator, rng)
+        hard_constraints_breakdown = dict(evaluator.hard_constraints_breakdown)
+        soft_constraints_breakdown = dict(evaluator.soft_constraints_breakdown)
+
+        hard_delta, soft_delta = evaluator.get_delta(changes)
+        assert evaluator.hard_constraints_breakdown == hard_constraints_breakdown
+        assert evaluator.get_cost_delta(changes) == (sum(hard_delta.values()), sum(soft_delta.values()))
+
+        evaluator.apply(changes)
+        assert (
+            evaluator.hard_constraints_breakdown,
+            evaluator.soft_constraints_breakdown
+        ) == get_reference_breakdowns(_get_schedule_timetable(problem, evaluator.schedule))
+        assert evaluator.hard_constraints_breakdown == {
+            component: cost + hard_delta[component] for component, cost in hard_constraints_breakdown.items()
+        }
+        assert evaluator.soft_constraints_breakdown == {
+            component: cost + soft_delta[component] for component, cost in soft_constraints_breakdown.items()
+        }
+
+
+def test_synchronize_matches_a_new_evaluator(problem, random_timetable):
+    evaluator: DeltaEvaluator = _create_evaluator(random_timetable(2))
+    timetable: Timetable = random_timetable(3, 0.7)
+
+    evaluator.synchronize(timetable.schedule)
+
+    assert [
+        [slot.course_room_pairs for slot in slots] for slots in evaluator.schedule
+    ] == [
+        [slot.course_room_pairs for slot in slots] for slots in timetable.schedule
+    ]
+    assert (
+        evaluator.hard_constraints_breakdown,
+        evaluator.soft_constraints_breakdown
+    ) == get_reference_breakdowns(timetable)
+
+
+def test_timetable_evaluator_follows_every_timetable_of_the_problem(problem, random_timetable):
+    timetables = [random_timetable(4), random_timetable(5, 0.8)]
+    rng: random.Random = random.Random(4)
+
+    for _ in range(20):
+        timetable: Timetable = rng.choice(timetables)
+        perturb(timetable, rng)
+        if rng.random() < 0.3:
+            timetables.append(timetable.clone())
+
+        evaluator: DeltaEvaluator = timetable.get_delta_evaluator()
+        assert evaluator is problem.delta_evaluator
+        assert (
+            evaluator.hard_constraints_breakdown,
+            evaluator.soft_constraints_breakdown
+        ) == get_reference_breakdowns(timetable)
+
+
+def test_timetable_evaluator_follows_a_rollback(random_timetable):
+    timetable: Timetable = random_timetable(6)
+    timetable.get_delta_evaluator()
+    rng: random.Random = random.Random(6)
+
+    timetable.begin()
+    for _ in range(5):
+        perturb(timetable, rng)
+    timetable.get_delta_evaluator()
+    timetable.rollback()
+
+    evaluator: DeltaEvaluator = timetable.get_delta_evaluator()
+    assert (
+        evaluator.hard_constraints_breakdown,
+        evaluator.soft_constraints_breakdown
+    ) == get_reference_breakdowns(timetable)
+
+
+def test_every_problem_keeps_its_own_evaluator(toy_problem):
+    other_problem: Problem = load_problem('ToyProblem.ctt.txt')
+    timetable: Timetable = Timetable(toy_problem)
+    other_timetable: Timetable = Timetable(other_problem)
+
+    evaluator: DeltaEvaluator = timetable.get_delta_evaluator()
+    other_evaluator: DeltaEvaluator = other_timetable.get_delta_evaluator()
+
+    assert evaluator is not other_evaluator
+    assert timetable.get_delta_evaluator() is evaluator
+    assert other_problem.delta_evaluator is other_evaluator
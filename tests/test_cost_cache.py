@@ -0,0 +1,49 @@
+from src.common.cost_cache import CostCache
+
+
+def test_breakdowns_are_computed_once_per_key_and_kind():
+    cost_cache: CostCache = CostCache(max_size=4)
+    computed = []
+
+    def compute():
+        computed.append(1)
+        return {'conflicts': 1}
+
+    assert cost_cache.get_breakdown(1, 'hard', compute) == {'conflicts': 1}
+    assert cost_cache.get_breakdown(1, 'hard', compute) == {'conflicts': 1}
+    cost_cache.get_breakdown(1, 'soft', compute)
+
+    assert len(computed) == 2
+    assert (cost_cache.hits, cost_cache.misses) == (1, 2)
+    assert cost_cache.get_hit_rate() == 1 / 3
+
+
+def test_cached_breakdowns_cannot_be_changed_by_callers():
+    cost_cache: CostCache = CostCache()
+
+    cost_cache.get_breakdown(1, 'hard', lambda: {'conflicts': 1})['conflicts'] = 5
+    cost_cache.get_breakdown(1, 'hard', lambda: {'conflicts': 2})['conflicts'] = 5
+
+    assert cost_cache.get_breakdown(1, 'hard', lambda: {'conflicts': 2}) == {'conflicts': 1}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cost_cache: CostCache = CostCache(max_size=2)
+
+    cost_cache.get_breakdown(1, 'hard', lambda: {'conflicts': 1})
+    cost_cache.get_breakdown(2, 'hard', lambda: {'conflicts': 2})
+    cost_cache.get_breakdown(1, 'hard', lambda: {'conflicts': 0})
+    cost_cache.get_breakdown(3, 'hard', lambda: {'conflicts': 3})
+
+    assert cost_cache.get_breakdown(1, 'hard', lambda: {'conflicts': 0}) == {'conflicts': 1}
+    assert cost_cache.get_breakdown(2, 'hard', lambda: {'conflicts': 0}) == {'conflicts': 0}
+
+
+def test_clear_removes_the_entries_and_the_counters():
+    cost_cache: CostCache = CostCache()
+    cost_cache.get_breakdown(1, 'hard', lambda: {'conflicts': 1})
+
+    cost_cache.clear()
+
+    assert (cost_cache.hits, cost_cache.misses) == (0, 0)
+    assert cost_cache.get_breakdown(1, 'hard', lambda: {'conflicts': 0}) == {'conflicts': 0}
@@ -0,0 +1,56 @@
+import random
+from typing import List, Tuple
+
+import pytest
+
+from src.common.chromosome import Chromosome
+from src.common.chromosome_generator import ChromosomeGenerator
+from src.common.grammar import GrammarGenerator
+from src.common.grammatical_evolution import COMMA_SELECTION, PLUS_SELECTION, STEADY_STATE, GrammaticalEvolution
+from src.common.problem import Problem
+from tests.helpers import get_random_timetable, load_problem
+
+Result = List[Tuple[str, int, int, bytes]]
+
+
+@pytest.fixture(scope='module')
+def comp01_problem() -> Problem:
+    return load_problem('comp01.ctt.txt')
+
+
+def _run(
+        problem: Problem,
+        number_of_workers: int,
+        survivor_selection: str,
+        codon_matrix: bool = False
+) -> Tuple[Result, float]:
+    random.seed(1)
+    grammatical_evolution: GrammaticalEvolution = GrammaticalEvolution(
+        ChromosomeGenerator(),
+        GrammarGenerator(['room', 'course', 'day', 'period']),
+        number_of_workers=number_of_workers,
+        survivor_selection=survivor_selection,
+        number_of_offspring=6,
+        codon_matrix=codon_matrix
+    )
+    grammatical_evolution._population_size = 6
+    grammatical_evolution._max_num_of_generations = 4
+
+    best: List[Chromosome] = grammatical_evolution.run(get_random_timetable(problem, 1, 0.9), 3)
+    return [
+        (chromosome.phenotype, chromosome.hard_constraints_cost, chromosome.soft_constraints_cost,
+         chromosome.timetable.encode())
+        for chromosome in best
+    ], random.random()
+
+
+@pytest.mark.parametrize('survivor_selection', [STEADY_STATE, PLUS_SELECTION, COMMA_SELECTION])
+def test_results_do_not_depend_on_the_number_of_workers(comp01_problem, survivor_selection):
+    assert _run(comp01_problem, 0, survivor_selection) == _run(comp01_problem, 2, survivor_selection)
+
+
+@pytest.mark.parametrize('survivor_selection', [PLUS_SELECTION, COMMA_SELECTION])
+def test_codon_matrix_results_do_not_depend_on_the_number_of_workers(comp01_problem, survivor_selection):
+    pytest.importorskip('numpy')
+
+    assert _run(comp01_problem, 0, survivor_selection, True) == _run(comp01_problem, 2, survivor_selection, True)
@@ -0,0 +1,88 @@
+import random
+from typing import List, Optional, Tuple
+
+import pytest
+
+from src.common.budget import Budget
+from src.common.chromosome import Chromosome
+from src.common.chromosome_generator import ChromosomeGenerator
+from src.common.grammar import GrammarGenerator
+from src.common.grammatical_evolution import GrammaticalEvolution
+from src.common.island_model import RANDOM_TOPOLOGY, RING_TOPOLOGY, IslandModel
+from src.common.problem import Problem
+from src.common.timetable import Timetable
+from tests.helpers import get_random_timetable, load_problem
+
+Result = List[Tuple[str, int, int, bytes]]
+
+
+@pytest.fixture(scope='module')
+def comp01_problem() -> Problem:
+    return load_problem('comp01.ctt.txt')
+
+
+def _create_island_model(number_of_islands: int, topology: str) -> IslandModel:
+    grammatical_evolution: GrammaticalEvolution = GrammaticalEvolution(
+        ChromosomeGenerator(),
+        GrammarGenerator(['room', 'course', 'day', 'period'])
+    )
+    grammatical_evolution._population_size = 6
+
+    return IslandModel(grammatical_evolution, number_of_islands, 2, 2, topology, 6)
+
+
+def _run(island_model: IslandModel, timetable: Timetable, budget: Optional[Budget] = None) -> Tuple[Result, float]:
+    random.seed(2)
+    best: List[Chromosome] = island_model.run(timetable, 3, budget)
+
+    return [
+        (chromosome.phenotype, chromosome.hard_constraints_cost, chromosome.soft_constraints_cost,
+         chromosome.timetable.encode())
+        for chromosome in best
+    ], random.random()
+
+
+@pytest.mark.parametrize('topology', [RING_TOPOLOGY, RANDOM_TOPOLOGY])
+def test_emigrants_never_stay_on_their_island(topology):
+    island_model: IslandModel = _create_island_model(4, topology)
+    topology_random: random.Random = random.Random(3)
+
+    for _ in range(20):
+        destinations: List[int] = island_model._get_destinations(topology_random)
+        assert all(destination != island for island, destination in enumerate(destinations))
+
+
+@pytest.mark.parametrize('topology', [RING_TOPOLOGY, RANDOM_TOPOLOGY])
+def test_runs_are_reproducible(comp01_problem, topology):
+    island_model: IslandModel = _create_island_model(3, topology)
+    timetable: Timetable = get_random_timetable(comp01_problem, 2, 0.9)
+
+    result: Tuple[Result, float] = _run(island_model, timetable)
+    island_best_costs: List[List[Tuple[int, int]]] = island_model.island_best_costs
+
+    assert _run(island_model, timetable) == result
+    assert island_model.island_best_costs == island_best_costs
+    assert all(
+        global_best_cost == min(costs)
+        for global_best_cost, costs in zip(island_model.global_best_costs, island_best_costs)
+    )
+
+
+def test_run_stops_when_the_evaluations_are_used_up(comp01_problem):
+    island_model: IslandModel = _create_island_model(2, RING_TOPOLOGY)
+    budget: Budget = Budget(None, 12)
+
+    _run(island_model, get_random_timetable(comp01_problem, 2, 0.9), budget)
+
+    assert len(island_model.global_best_costs) == 1
+    assert budget.evaluations == 12
+
+
+def test_run_stops_when_cancelled(comp01_problem):
+    island_model: IslandModel = _create_island_model(2, RING_TOPOLOGY)
+    budget: Budget = Budget(None, None)
+    budget.cancel()
+
+    _run(island_model, get_random_timetable(comp01_problem, 2, 0.9), budget)
+
+    assert len(island_model.global_best_costs) == 1
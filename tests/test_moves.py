@@ -0,0 +1,45 @@
+import random
+
+from src.common.constraints_validator import DeltaEvaluator
+from src.common.moves import NEIGHBOURHOODS, best_of_k_moves, first_improvement_move
+from src.common.timetable import Timetable
+from tests.helpers import get_reference_breakdowns, get_reference_cost, get_schedule
+
+
+def test_best_of_k_moves_keeps_the_costs_consistent(random_timetable):
+    timetable: Timetable = random_timetable(0)
+    random.seed(0)
+
+    for _ in range(20):
+        best_of_k_moves(timetable)
+
+        evaluator: DeltaEvaluator = timetable.get_delta_evaluator()
+        assert (
+            evaluator.hard_constraints_breakdown,
+            evaluator.soft_constraints_breakdown
+        ) == get_reference_breakdowns(timetable)
+        assert timetable.get_constraints_cost() == get_reference_cost(timetable)
+
+
+def test_first_improvement_move_stops_at_a_local_optimum(toy_problem):
+    timetable: Timetable = Timetable(problem=toy_problem)
+    random.seed(1)
+    timetable.initialize_slots()
+
+    for _ in range(200):
+        cost = get_reference_cost(timetable)
+        schedule = get_schedule(timetable)
+
+        first_improvement_move(timetable)
+
+        if get_schedule(timetable) == schedule:
+            break
+        assert get_reference_cost(timetable) < cost
+        assert timetable.get_constraints_cost() == get_reference_cost(timetable)
+
+    evaluator: DeltaEvaluator = timetable.get_delta_evaluator()
+    assert all(
+        evaluator.get_cost_delta(move.changes) >= (0, 0)
+        for neighbourhood in NEIGHBOURHOODS
+        for move in neighbourhood(timetable, evaluator)
+    )
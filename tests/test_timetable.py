@@ -0,0 +1,202 @@
+import random
+
+from src.common.timetable import Timetable
+from tests.helpers import get_reference_breakdowns, get_reference_cost, get_schedule, perturb
+
+
+def test_hash_matches_a_rebuilt_timetable(random_timetable):
+    timetable: Timetable = random_timetable(0)
+    rng: random.Random = random.Random(0)
+
+    for _ in range(50):
+        perturb(timetable, rng)
+        assert timetable.hash == Timetable.decode(timetable.problem, timetable.encode()).hash
+
+
+def test_hash_does_not_depend_on_the_order_of_the_changes(problem):
+    timetable: Timetable = Timetable(problem=problem)
+    reversed_timetable: Timetable = Timetable(problem=problem)
+    placements = [(day, 0, (course, problem.rooms[0])) for day, course in enumerate(problem.courses[:3])]
+
+    for day, period, course_room_pair in placements:
+        timetable.add_course_room_pair(day, period, course_room_pair)
+    for day, period, course_room_pair in reversed(placements):
+        reversed_timetable.add_course_room_pair(day, period, course_room_pair)
+    empty_hash: int = Timetable(problem=problem).hash
+
+    assert timetable.hash == reversed_timetable.hash != empty_hash
+    for day, period, _ in placements:
+        timetable.remove_course_room_pair(day, period)
+    assert timetable.hash == empty_hash
+
+
+def test_encode_decode_keeps_the_schedule(random_timetable):
+    timetable: Timetable = random_timetable(1, 0.8)
+    decoded: Timetable = Timetable.decode(timetable.problem, timetable.encode())
+
+    assert get_schedule(decoded) == get_schedule(timetable)
+    assert decoded.hash == timetable.hash
+
+
+def test_cached_breakdowns_match_the_list_validators(random_timetable):
+    timetable: Timetable = random_timetable(2)
+    rng: random.Random = random.Random(2)
+
+    for _ in range(30):
+        perturb(timetable, rng)
+        assert (
+            timetable.get_hard_constraints_breakdown(),
+            timetable.get_soft_constraints_breakdown()
+        ) == get_reference_breakdowns(timetable)
+
+
+def test_cost_cache_answers_a_revisited_timetable(random_timetable):
+    timetable: Timetable = random_timetable(3)
+    cost = timetable.get_constraints_cost()
+    hits: int = timetable.problem.cost_cache.hits
+
+    assert random_timetable(3).get_constraints_cost() == cost == get_reference_cost(timetable)
+    assert timetable.problem.cost_cache.hits == hits + 2
+
+
+
+def test_clone_and_original_do_not_see_each_others_changes(random_timetable):
+    timetable: Timetable = random_timetable(6)
+    timetable.get_room_occupancy(0, 0)
+    schedule = get_schedule(timetable)
+    rng: random.Random = random.Random(6)
+
+    clone: Timetable = timetable.clone()
+    for _ in range(20):
+        perturb(clone, rng)
+    clone_schedule = get_schedule(clone)
+
+    assert get_schedule(timetable) == schedule
+    assert timetable.hash == Timetable.decode(timetable.problem, timetable.encode()).hash
+
+    for _ in range(20):
+        perturb(timetable, rng)
+
+    assert get_schedule(clone) == clone_schedule
+    for copy in (timetable, clone):
+        rebuilt: Timetable = Timetable.decode(copy.problem, copy.encode())
+        assert copy.hash == rebuilt.hash
+        assert copy.get_constraints_cost() == get_reference_cost(copy)
+        assert copy.get_feasible_slots(copy.courses[0].course_id) == rebuilt.get_feasible_slots(
+            copy.courses[0].course_id
+        )
+
+
+def test_feasibility_index_matches_a_rebuilt_index(problem, random_timetable):
+    timetable: Timetable = random_timetable(7, 0.5)
+    timetable.get_feasible_slots(problem.courses[0].course_id)
+    rng: random.Random = random.Random(7)
+
+    for _ in range(30):
+        perturb(timetable, rng)
+    rebuilt: Timetable = Timetable.decode(problem, timetable.encode())
+
+    for course in problem.courses:
+        assert timetable.get_feasible_slots(course.course_id) == rebuilt.get_feasible_slots(course.course_id)
+    for day in range(problem.number_of_days):
+        for period in range(problem.number_of_periods_per_day):
+            assert timetable.get_room_occupancy(day, period) == rebuilt.get_room_occupancy(day, period)
+
+
+def test_feasible_slots_violate_no_hard_constraint(toy_problem):
+    random.seed(7)
+    timetable: Timetable = Timetable(problem=toy_problem)
+    timetable.initialize_slots()
+    hard_constraints_breakdown = get_reference_breakdowns(timetable)[0]
+
+    for course in toy_problem.courses:
+        for day, period in timetable.get_feasible_slots(course.course_id):
+            free_rooms: int = ~timetable.get_room_occupancy(day, period) & ((1 << len(toy_problem.rooms)) - 1)
+            room_index: int = (free_rooms & -free_rooms).bit_length() - 1
+
+            timetable.begin()
+            timetable.add_course_room_pair(day, period, (course, toy_problem.rooms[room_index]))
+            new_hard_constraints_breakdown = get_reference_breakdowns(timetable)[0]
+            timetable.rollback()
+
+            assert room_index >= 0
+            for component in ('conflicts', 'room_occupancy', 'teacher', 'unavailability'):
+                assert new_hard_constraints_breakdown[component] == hard_constraints_breakdown[component]
+
+
+def test_reassign_rooms_keeps_the_courses_and_lowers_the_room_costs(toy_problem):
+    random.seed(8)
+    timetable: Timetable = Timetable(problem=toy_problem)
+    timetable.initialize_slots()
+    hard_constraints_cost: int = get_reference_cost(timetable)[0]
+
+    for day in range(toy_problem.number_of_days):
+        for period in range(toy_problem.number_of_periods_per_day):
+            course_room_pairs = timetable.schedule[day][period].course_room_pairs
+            courses = [course.course_id for course, _ in course_room_pairs]
+            soft_constraints_breakdown = get_reference_breakdowns(timetable)[1]
+
+            timetable.reassign_rooms(day, period)
+            new_soft_constraints_breakdown = get_reference_breakdowns(timetable)[1]
+            course_room_pairs = timetable.schedule[day][period].course_room_pairs
+
+            assert [course.course_id for course, _ in course_room_pairs] == courses
+            assert len({room.room_id for _, room in course_room_pairs}) == len(course_room_pairs)
+            assert (
+                    new_soft_constraints_breakdown['room_capacity'] +
+                    new_soft_constraints_breakdown['room_stability'] <=
+                    soft_constraints_breakdown['room_capacity'] + soft_constraints_breakdown['room_stability']
+            )
+
+    assert get_reference_cost(timetable)[0] == hard_constraints_cost
+    assert timetable.get_constraints_cost() == get_reference_cost(timetable)
+    assert timetable.hash == Timetable.decode(toy_problem, timetable.encode()).hash
+
+
+def test_rollback_restores_the_timetable(problem, random_timetable):
+    timetable: Timetable = random_timetable(4)
+    timetable.get_room_occupancy(0, 0)
+    schedule = get_schedule(timetable)
+    hash_before: int = timetable.hash
+    cost = timetable.get_constraints_cost()
+    feasible_slots = [timetable.get_feasible_slots(course.course_id) for course in problem.courses]
+    rng: random.Random = random.Random(4)
+
+    for _ in range(10):
+        timetable.begin()
+        for _ in range(5):
+            perturb(timetable, rng)
+        timetable.get_constraints_cost()
+        timetable.rollback()
+
+        assert get_schedule(timetable) == schedule
+        assert timetable.hash == hash_before
+        assert timetable.get_constraints_cost() == cost
+        assert [timetable.get_feasible_slots(course.course_id) for course in problem.courses] == feasible_slots
+
+
+def test_rollback_restores_the_first_rooms(toy_problem):
+    timetable: Timetable = Timetable(problem=toy_problem)
+    course_id: str = toy_problem.courses[0].course_id
+
+    timetable.begin()
+    timetable.get_feasible_slot(course_id, False)
+    assert timetable.course_and_first_room[course_id] != ""
+    timetable.rollback()
+
+    assert timetable.course_and_first_room[course_id] == ""
+
+
+def test_commit_keeps_the_changes(random_timetable):
+    timetable: Timetable = random_timetable(5)
+    rng: random.Random = random.Random(5)
+
+    timetable.begin()
+    for _ in range(5):
+        perturb(timetable, rng)
+    schedule = get_schedule(timetable)
+    timetable.commit()
+    timetable.rollback()
+
+    assert get_schedule(timetable) == schedule
+    assert timetable.get_constraints_cost() == get_reference_cost(timetable)
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import src.common.timetable as timetable_module
+from src.common.array_timetable import ArrayTimetable
+from src.common.timetable import Timetable
+from src.common.vectorized_constraints_validator import DAY
+from tests.helpers import get_reference_breakdowns
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_breakdowns_match_the_list_validators(random_timetable, seed):
+    timetable: Timetable = random_timetable(seed, 0.8 if seed % 2 else 1.0)
+    array_timetable: ArrayTimetable = ArrayTimetable.from_timetable(timetable)
+
+    assert (
+        array_timetable.get_hard_constraints_breakdown(),
+        array_timetable.get_soft_constraints_breakdown()
+    ) == get_reference_breakdowns(timetable)
+
+
+def test_moves_match_the_list_validators(problem, random_timetable):
+    array_timetable: ArrayTimetable = ArrayTimetable.from_timetable(random_timetable(0))
+    rng: random.Random = random.Random(0)
+
+    for _ in range(10):
+        array_timetable.swap_slots(
+            rng.randrange(problem.number_of_days),
+            rng.randrange(problem.number_of_periods_per_day),
+            rng.randrange(problem.number_of_days),
+            rng.randrange(problem.number_of_periods_per_day)
+        )
+        array_timetable.swap_lectures(rng.randrange(len(array_timetable.lectures)),
+                                      rng.randrange(len(array_timetable.lectures)))
+        array_timetable.move_lecture(
+            rng.randrange(len(array_timetable.lectures)),
+            rng.randrange(problem.number_of_days),
+            rng.randrange(problem.number_of_periods_per_day),
+            rng.randrange(len(problem.rooms))
+        )
+
+        assert (
+            array_timetable.get_hard_constraints_breakdown(),
+            array_timetable.get_soft_constraints_breakdown()
+        ) == get_reference_breakdowns(array_timetable.to_timetable())
+
+
+def test_clone_is_independent(problem, random_timetable):
+    array_timetable: ArrayTimetable = ArrayTimetable.from_timetable(random_timetable(1))
+    lectures: np.ndarray = array_timetable.lectures.copy()
+
+    clone: ArrayTimetable = array_timetable.clone()
+    clone.move_lecture(0, (int(lectures[0, DAY]) + 1) % problem.number_of_days, 0)
+
+    assert (array_timetable.lectures == lectures).all()
+    assert not (clone.lectures == lectures).all()
+
+
+def test_timetable_evaluates_through_the_vectorized_validator(monkeypatch, toy_problem):
+    monkeypatch.setattr(timetable_module, 'VECTORIZED_EVALUATION', True)
+    toy_problem.cost_cache.clear()
+    timetable: Timetable = Timetable(problem=toy_problem)
+    timetable.initialize_slots()
+
+    for seed in range(5):
+        timetable.exchange_slots(seed % toy_problem.number_of_days, 0, 0, seed % toy_problem.number_of_periods_per_day)
+        assert (
+            timetable.get_hard_constraints_breakdown(),
+            timetable.get_soft_constraints_breakdown()
+        ) == get_reference_breakdowns(timetable)
@@ -0,0 +1,27 @@
+from typing import Tuple
+
+from src.common.problem import Problem
+from src.common.timetable import Timetable
+from src.common.worker_pool import create_worker_pool, get_derived_seed, get_worker_problem, get_worker_state
+from tests.helpers import get_random_timetable
+
+
+def _get_worker_timetable_hash(_: int) -> Tuple[int, int]:
+    return get_worker_problem().problem_instance_index, get_worker_state().hash
+
+
+def test_derived_seeds_are_stable_and_distinct():
+    seeds = {get_derived_seed(7, key, 3) for key in ('a', 'b', 'c')}
+
+    assert get_derived_seed(7, 'a', 3) == get_derived_seed(7, 'a', 3)
+    assert len(seeds | {get_derived_seed(8, 'a', 3), get_derived_seed(7, 'a')}) == 5
+    assert all(0 <= seed < 2 ** 64 for seed in seeds)
+
+
+def test_workers_rebuild_the_problem_and_their_state(toy_problem: Problem):
+    timetable: Timetable = get_random_timetable(toy_problem, 9, 0.5)
+
+    with create_worker_pool(2, toy_problem.problem_instance_index, Timetable.decode, timetable.encode()) as executor:
+        results = list(executor.map(_get_worker_timetable_hash, range(4)))
+
+    assert results == [(toy_problem.problem_instance_index, timetable.hash)] * 4